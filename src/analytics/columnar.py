@@ -0,0 +1,160 @@
+"""
+Columnar, time-indexed storage for analytics reports.
+
+Posts and conversions are mirrored into typed arrays kept in timestamp
+order, so a reporting window is located with two binary searches and its
+totals are read from cached prefix sums instead of re-parsing every record.
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from itertools import accumulate
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def engagement_of(metrics: Optional[Dict[str, Any]]) -> float:
+    """Weighted engagement score of a post's metrics."""
+    metrics = metrics or {}
+    return (
+        metrics.get('likes', 0) +
+        metrics.get('retweets', 0) * 2 +
+        metrics.get('replies', 0) * 3
+    )
+
+
+class TimeSeriesColumns:
+    """
+    Keyed rows of numeric columns ordered by epoch timestamp.
+
+    Rows are appended in O(1); an out-of-order timestamp only marks the
+    series for a re-sort, which happens lazily before the next query.
+    Prefix sums per column are rebuilt on demand after a change, so any
+    window sum is two array lookups.
+
+    Attributes:
+        fields: Names of the numeric columns
+        timestamps: Sorted epoch timestamps, one per row
+        columns: Column name -> array of values, aligned with timestamps
+    """
+
+    def __init__(self, *fields: str):
+        self.fields = fields
+        self.timestamps = array('d')
+        self.columns = {field: array('d') for field in fields}
+        self._keys = []
+        self._rows = {}
+        self._sorted = True
+        self._prefix = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def upsert(self, key: Hashable, timestamp: float, **values: float) -> None:
+        """Add a row, or replace the timestamp and given values of an existing one."""
+        row = self._rows.get(key)
+        if row is None:
+            if self.timestamps and timestamp < self.timestamps[-1]:
+                self._sorted = False
+            self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            self.timestamps.append(timestamp)
+            for field in self.fields:
+                self.columns[field].append(values.get(field, 0))
+        else:
+            if timestamp != self.timestamps[row]:
+                self.timestamps[row] = timestamp
+                self._sorted = False
+            for field, value in values.items():
+                self.columns[field][row] = value
+        self._prefix.clear()
+
+    def update(self, key: Hashable, **values: float) -> bool:
+        """Change column values of an existing row; returns False for unknown keys."""
+        row = self._rows.get(key)
+        if row is None:
+            return False
+        for field, value in values.items():
+            self.columns[field][row] = value
+        self._prefix.clear()
+        return True
+
+    def window(self, start: float, end: float = float('inf')) -> Tuple[int, int]:
+        """Row range [lo, hi) with start < timestamp <= end."""
+        self._ensure_sorted()
+        return bisect_right(self.timestamps, start), bisect_right(self.timestamps, end)
+
+    def sum(self, field: str, lo: int, hi: int) -> float:
+        """Sum of a column over a row range."""
+        if hi <= lo:
+            return 0
+        prefix = self._prefix.get(field)
+        if prefix is None:
+            self._ensure_sorted()
+            prefix = self._prefix[field] = array('d', accumulate(self.columns[field], initial=0))
+        return prefix[hi] - prefix[lo]
+
+    def mean(self, field: str, lo: int, hi: int) -> float:
+        """Mean of a column over a row range (0 when empty)."""
+        return self.sum(field, lo, hi) / (hi - lo) if hi > lo else 0
+
+    def _ensure_sorted(self) -> None:
+        """Reorder all columns by timestamp after out-of-order writes."""
+        if self._sorted:
+            return
+        order = sorted(range(len(self.timestamps)), key=self.timestamps.__getitem__)
+        self.timestamps = array('d', (self.timestamps[i] for i in order))
+        for field in self.fields:
+            column = self.columns[field]
+            self.columns[field] = array('d', (column[i] for i in order))
+        self._keys = [self._keys[i] for i in order]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._prefix.clear()
+        self._sorted = True
+
+
+class AnalyticsColumns:
+    """
+    Columnar mirror of the tracker's posts and conversions.
+
+    Posts keep likes/retweets/replies/engagement/quality columns;
+    conversions keep their amounts.
+    """
+
+    POST_FIELDS = ('likes', 'retweets', 'replies', 'engagement', 'quality')
+
+    def __init__(self):
+        self.posts = TimeSeriesColumns(*self.POST_FIELDS)
+        self.conversions = TimeSeriesColumns('amount')
+
+    def add_post(self, tweet_id: str, post: Dict[str, Any]) -> None:
+        """Mirror a tracked post."""
+        timestamp = datetime.fromisoformat(post['posted_at']).timestamp()
+        metrics = post.get('metrics') or {}
+        engagement = engagement_of(metrics)
+        self.posts.upsert(
+            tweet_id, timestamp,
+            likes=metrics.get('likes', 0),
+            retweets=metrics.get('retweets', 0),
+            replies=metrics.get('replies', 0),
+            engagement=engagement,
+            quality=post.get('quality_score', 0)
+        )
+
+    def update_metrics(self, tweet_id: str, metrics: Dict[str, Any]) -> None:
+        """Replace the engagement metrics of a mirrored post."""
+        self.posts.update(
+            tweet_id,
+            likes=metrics.get('likes', 0),
+            retweets=metrics.get('retweets', 0),
+            replies=metrics.get('replies', 0),
+            engagement=engagement_of(metrics)
+        )
+
+    def add_conversion(self, key: str, conversion: Dict[str, Any]) -> None:
+        """Mirror a tracked conversion."""
+        timestamp = datetime.fromisoformat(conversion['converted_at']).timestamp()
+        self.conversions.upsert(key, timestamp, amount=conversion['amount'])
@@ -0,0 +1,87 @@
+"""
+Write-ahead event log for analytics data.
+
+Mutations are appended as JSON lines and flushed in batches; the current
+state is rebuilt by replaying the log on top of the last snapshot, and the
+log is truncated whenever a new snapshot is written.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+
+class EventLog:
+    """
+    Append-only, line-delimited event log with batched flushes.
+
+    Attributes:
+        log_file: Path of the log file
+        flush_every: Buffered events that trigger a flush
+        flush_interval: Seconds after which buffered events are flushed
+        events_since_snapshot: Events logged since the log was last truncated
+    """
+
+    def __init__(self, log_file: Path, flush_every: int = 100, flush_interval: float = 5.0):
+        self.log_file = Path(log_file)
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.events_since_snapshot = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Yield the logged events in order, skipping a torn last line."""
+        if not self.log_file.exists():
+            return
+        with open(self.log_file) as handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Skipping corrupt event in {self.log_file}")
+                    continue
+                self.events_since_snapshot += 1
+                yield event
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Buffer an event, flushing when the batch is full or old enough."""
+        self._buffer.append(event)
+        self.events_since_snapshot += 1
+        if (len(self._buffer) >= self.flush_every or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Buffer many events and flush them together."""
+        for event in events:
+            self._buffer.append(event)
+            self.events_since_snapshot += 1
+        self.flush()
+
+    def flush(self) -> None:
+        """Write buffered events to the log and sync them to disk."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        try:
+            with open(self.log_file, 'a') as handle:
+                handle.writelines(json.dumps(event) + '\n' for event in self._buffer)
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._buffer = []
+        except Exception as e:
+            logging.error(f"Error writing to {self.log_file}: {e}")
+
+    def truncate(self) -> None:
+        """Drop all logged events once they are covered by a snapshot."""
+        self._buffer = []
+        self.events_since_snapshot = 0
+        try:
+            self.log_file.unlink(missing_ok=True)
+        except Exception as e:
+            logging.error(f"Error truncating {self.log_file}: {e}")
@@ -0,0 +1,170 @@
+"""
+Incrementally maintained analytics rollups.
+
+Every tracked post, metrics update and conversion adjusts a handful of
+counters: per clock hour (split by affiliate program), per day and per
+hour of day. Reports then read a bounded number of buckets instead of
+walking every event.
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from analytics.columnar import engagement_of
+
+BUCKET_SECONDS = 3600
+
+
+class RollupBucket:
+    """Running totals for one bucket."""
+
+    __slots__ = ('posts', 'engagement', 'quality', 'conversions', 'revenue')
+
+    def __init__(self):
+        self.posts = 0
+        self.engagement = 0
+        self.quality = 0.0
+        self.conversions = 0
+        self.revenue = 0.0
+
+    def merge(self, other: 'RollupBucket') -> None:
+        """Add another bucket's totals to this one."""
+        self.posts += other.posts
+        self.engagement += other.engagement
+        self.quality += other.quality
+        self.conversions += other.conversions
+        self.revenue += other.revenue
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'posts': self.posts,
+            'engagement': self.engagement,
+            'average_engagement': self.engagement / self.posts if self.posts else 0,
+            'conversions': self.conversions,
+            'revenue': self.revenue
+        }
+
+
+class AnalyticsRollups:
+    """
+    Hourly, daily, hour-of-day and per-program rollups of posts and conversions.
+
+    Posts are bucketed by the hour they were posted and keep their engagement
+    there as metrics change; conversions are bucketed by conversion time.
+    Windows are resolved to whole clock hours.
+
+    Attributes:
+        hourly: Epoch hour -> program -> bucket
+        daily: ISO date -> bucket
+        hour_of_day: 24 all-time buckets by local posting hour
+        programs: Program -> all-time bucket
+    """
+
+    def __init__(self):
+        self.hourly: Dict[int, Dict[str, RollupBucket]] = {}
+        self.daily: Dict[str, RollupBucket] = {}
+        self.hour_of_day = [RollupBucket() for _ in range(24)]
+        self.programs: Dict[str, RollupBucket] = {}
+        self._hours: List[int] = []
+        self._hour_of_day: Dict[int, int] = {}
+
+    def add_post(self, post: Dict[str, Any], sign: int = 1) -> None:
+        """Count a post (or, with sign=-1, take it back out)."""
+        for bucket in self._post_buckets(post):
+            bucket.posts += sign
+            bucket.engagement += sign * engagement_of(post.get('metrics'))
+            bucket.quality += sign * post.get('quality_score', 0)
+
+    def remove_post(self, post: Dict[str, Any]) -> None:
+        """Take a previously counted post out of the rollups."""
+        self.add_post(post, sign=-1)
+
+    def update_metrics(self, post: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+        """Apply the engagement change of a post whose metrics are replaced."""
+        delta = engagement_of(metrics) - engagement_of(post.get('metrics'))
+        if delta:
+            for bucket in self._post_buckets(post):
+                bucket.engagement += delta
+
+    def add_conversion(self, conversion: Dict[str, Any], sign: int = 1) -> None:
+        """Count a conversion (or, with sign=-1, take it back out)."""
+        converted_at = datetime.fromisoformat(conversion['converted_at'])
+        for bucket in self._buckets(converted_at, conversion.get('program')):
+            bucket.conversions += sign
+            bucket.revenue += sign * conversion['amount']
+
+    def remove_conversion(self, conversion: Dict[str, Any]) -> None:
+        """Take a previously counted conversion out of the rollups."""
+        self.add_conversion(conversion, sign=-1)
+
+    @staticmethod
+    def window_start(start: float) -> float:
+        """Start of the clock hour containing start, where window(start) begins."""
+        return start // BUCKET_SECONDS * BUCKET_SECONDS
+
+    def window(self, start: float) -> Dict[str, Any]:
+        """
+        Totals for the clock hours from the one containing start onwards.
+
+        Returns:
+            Dictionary with the overall bucket, 24 hour-of-day buckets and
+            a bucket per program
+        """
+        total = RollupBucket()
+        by_hour = [RollupBucket() for _ in range(24)]
+        by_program: Dict[str, RollupBucket] = {}
+        first = bisect_left(self._hours, int(start // BUCKET_SECONDS))
+        for hour in self._hours[first:]:
+            hour_bucket = by_hour[self._hour_of_day[hour]]
+            for program, bucket in self.hourly[hour].items():
+                total.merge(bucket)
+                hour_bucket.merge(bucket)
+                by_program.setdefault(program, RollupBucket()).merge(bucket)
+        return {'total': total, 'hour_of_day': by_hour, 'programs': by_program}
+
+    def daily_series(self, start: datetime) -> List[Dict[str, Any]]:
+        """Per-day totals from the date of start onwards, oldest first."""
+        first = start.date().isoformat()
+        return [
+            {'date': day, **self.daily[day].to_dict()}
+            for day in sorted(self.daily) if day >= first
+        ]
+
+    @staticmethod
+    def best_hour(buckets: List[RollupBucket]) -> Optional[int]:
+        """Hour of day with the highest mean engagement per post."""
+        best, best_mean = None, None
+        for hour, bucket in enumerate(buckets):
+            if bucket.posts > 0:
+                mean = bucket.engagement / bucket.posts
+                if best_mean is None or mean > best_mean:
+                    best, best_mean = hour, mean
+        return best
+
+    def _post_buckets(self, post: Dict[str, Any]):
+        """Buckets a post contributes to."""
+        posted_at = datetime.fromisoformat(post['posted_at'])
+        buckets = self._buckets(posted_at, post.get('affiliate_program'))
+        buckets.append(self.hour_of_day[posted_at.hour])
+        return buckets
+
+    def _buckets(self, when: datetime, program: Optional[str]) -> List[RollupBucket]:
+        """Hourly, daily and program buckets for an event, created on first use."""
+        hour = int(when.timestamp() // BUCKET_SECONDS)
+        if hour not in self.hourly:
+            self.hourly[hour] = {}
+            self._hour_of_day[hour] = when.hour
+            insort(self._hours, hour)
+        program = program or 'unknown'
+        hourly = self.hourly[hour].get(program)
+        if hourly is None:
+            hourly = self.hourly[hour][program] = RollupBucket()
+        day = when.date().isoformat()
+        daily = self.daily.get(day)
+        if daily is None:
+            daily = self.daily[day] = RollupBucket()
+        program_total = self.programs.get(program)
+        if program_total is None:
+            program_total = self.programs[program] = RollupBucket()
+        return [hourly, daily, program_total]
@@ -9,12 +9,18 @@ Metrics:
 - Quality scores
 """
 
+import atexit
 import json
+import math
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
-from typing import Dict, List, Any
-import statistics
+from typing import Dict, Iterable, List, Any
+
+from analytics.columnar import AnalyticsColumns
+from analytics.event_log import EventLog
+from analytics.rollups import AnalyticsRollups, RollupBucket
 
 class AnalyticsTracker:
     """
@@ -23,16 +29,34 @@ class AnalyticsTracker:
     Attributes:
         config: Configuration settings
         metrics_history: Historical performance data
+        columns: Time-ordered columnar mirror of posts and conversions
+        rollups: Incrementally maintained hourly/daily/program totals
         engagement_metrics: Post engagement data
         conversion_data: Affiliate conversion tracking
     
     Methods:
         track_post: Records post performance
         track_conversion: Tracks affiliate conversions
+        track_events: Applies a batch of post/conversion/metrics events
         get_performance_report: Generates analytics report
+        compact: Writes snapshots and truncates the event log
+        close: Compacts pending events; runs at exit
         _calculate_metrics: Processes raw metrics
+    
+    Storage:
+        In 'wal' mode (the default) every mutation is appended to
+        events.wal and flushed in batches; posts.json and conversions.json
+        are snapshots that the log is replayed on top of at startup. The
+        log is compacted into them after COMPACT_EVERY events, when it holds
+        events older than COMPACT_INTERVAL, and on close().
+        In 'json' mode each mutation rewrites the affected file.
     """
     
+    # Events logged before the log is folded into new snapshots
+    COMPACT_EVERY = 10000
+    # Seconds after which logged events are folded in regardless of their number
+    COMPACT_INTERVAL = 3600.0
+    
     def __init__(self, config):
         self.config = config
         self.data_dir = Path('data/analytics')
@@ -48,6 +72,26 @@ class AnalyticsTracker:
         self.conversions = self._load_json(self.conversions_file)
         self.metrics = self._load_json(self.metrics_file)
         
+        # Columnar mirror and rollups used for windowed reports
+        self.columns = AnalyticsColumns()
+        self.rollups = AnalyticsRollups()
+        for tweet_id, post in self.posts.items():
+            self.columns.add_post(tweet_id, post)
+            self.rollups.add_post(post)
+        for key, conversion in self.conversions.items():
+            self.columns.add_conversion(key, conversion)
+            self.rollups.add_conversion(conversion)
+        
+        # Event log storage
+        self.storage_mode = config.get('analytics_storage', 'wal')
+        self.event_log = None
+        if self.storage_mode == 'wal':
+            self.event_log = EventLog(self.data_dir / 'events.wal')
+            for event in self.event_log.replay():
+                self._apply_event(event)
+            self._last_compact = time.monotonic()
+            atexit.register(self.close)
+        
         # Performance tracking
         self.start_time = datetime.now()
     
@@ -74,8 +118,7 @@ class AnalyticsTracker:
             }
         }
         
-        self.posts[tweet_id] = post_data
-        self._save_json(self.posts_file, self.posts)
+        self._record({'type': 'post', 'tweet_id': tweet_id, 'post': post_data})
         logging.info(f"Tracked new post for {tool['name']}")
     
     def track_conversion(self, tweet_id: str, amount: float) -> None:
@@ -98,8 +141,11 @@ class AnalyticsTracker:
             'converted_at': datetime.now().isoformat()
         }
         
-        self.conversions[f"conv_{datetime.now().isoformat()}"] = conversion_data
-        self._save_json(self.conversions_file, self.conversions)
+        self._record({
+            'type': 'conversion',
+            'key': f"conv_{conversion_data['converted_at']}",
+            'conversion': conversion_data
+        })
         logging.info(f"Tracked conversion for {conversion_data['tool_name']}")
     
     def update_metrics(self, tweet_id: str, metrics: Dict[str, int]) -> None:
@@ -111,14 +157,139 @@ class AnalyticsTracker:
             metrics: Updated metrics dictionary
         """
         if tweet_id in self.posts:
-            self.posts[tweet_id]['metrics'] = metrics
-            self.posts[tweet_id]['last_updated'] = datetime.now().isoformat()
+            self._record({
+                'type': 'metrics',
+                'tweet_id': tweet_id,
+                'metrics': metrics,
+                'updated_at': datetime.now().isoformat()
+            })
+    
+    def track_events(self, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply many events in one pass and persist them with a single flush.
+        
+        Args:
+            events: Dictionaries shaped like the arguments of the tracking
+                methods, with a 'type' of 'post' (tool, tweet_id, program),
+                'conversion' (tweet_id, amount) or 'metrics' (tweet_id, metrics)
+            
+        Returns:
+            Number of events applied
+        """
+        now = datetime.now().isoformat()
+        batch = []
+        for event in events:
+            event_type = event.get('type')
+            if event_type == 'post':
+                batch.append({'type': 'post', 'tweet_id': event['tweet_id'], 'post': {
+                    'tool_name': event['tool']['name'],
+                    'tweet_id': event['tweet_id'],
+                    'affiliate_program': event['program'],
+                    'quality_score': event['tool'].get('quality_score', 0),
+                    'posted_at': event.get('posted_at', now),
+                    'initial_metrics': {'likes': 0, 'retweets': 0, 'replies': 0, 'clicks': 0}
+                }})
+            elif event_type == 'conversion':
+                post = self.posts.get(event['tweet_id'])
+                if post is None:
+                    logging.error(f"Unknown tweet_id for conversion: {event['tweet_id']}")
+                    continue
+                converted_at = event.get('converted_at', now)
+                batch.append({'type': 'conversion', 'key': f"conv_{converted_at}_{len(batch)}", 'conversion': {
+                    'tweet_id': event['tweet_id'],
+                    'tool_name': post['tool_name'],
+                    'program': post['affiliate_program'],
+                    'amount': event['amount'],
+                    'converted_at': converted_at
+                }})
+            elif event_type == 'metrics':
+                if event['tweet_id'] not in self.posts:
+                    continue
+                batch.append({'type': 'metrics', 'tweet_id': event['tweet_id'],
+                              'metrics': event['metrics'], 'updated_at': event.get('updated_at', now)})
+            else:
+                logging.warning(f"Ignoring unknown analytics event type: {event_type}")
+                continue
+            # Apply as we go so later events can see posts created earlier in the batch
+            self._apply_event(batch[-1])
+        
+        if self.event_log:
+            self.event_log.extend(batch)
+            self._maybe_compact()
+        else:
             self._save_json(self.posts_file, self.posts)
+            self._save_json(self.conversions_file, self.conversions)
+        
+        logging.info(f"Tracked {len(batch)} analytics events")
+        return len(batch)
+    
+    def compact(self) -> None:
+        """Write posts/conversions snapshots and truncate the event log."""
+        if self.event_log:
+            self.event_log.flush()
+        self._save_json(self.posts_file, self.posts)
+        self._save_json(self.conversions_file, self.conversions)
+        if self.event_log:
+            self.event_log.truncate()
+            self._last_compact = time.monotonic()
+    
+    def close(self) -> None:
+        """Fold any logged events into the snapshots so the next start has nothing to replay."""
+        atexit.unregister(self.close)
+        if self.event_log and self.event_log.events_since_snapshot:
+            self.compact()
+    
+    def _record(self, event: Dict[str, Any]) -> None:
+        """Apply a mutation and persist it according to the storage mode."""
+        self._apply_event(event)
+        if self.event_log:
+            self.event_log.append(event)
+            self._maybe_compact()
+        elif event['type'] == 'conversion':
+            self._save_json(self.conversions_file, self.conversions)
+        else:
+            self._save_json(self.posts_file, self.posts)
+    
+    def _apply_event(self, event: Dict[str, Any]) -> None:
+        """Apply a logged mutation to the in-memory state; replaying an event twice is harmless."""
+        event_type = event.get('type')
+        if event_type == 'post':
+            previous = self.posts.get(event['tweet_id'])
+            if previous is not None:
+                self.rollups.remove_post(previous)
+            self.posts[event['tweet_id']] = event['post']
+            self.columns.add_post(event['tweet_id'], event['post'])
+            self.rollups.add_post(event['post'])
+        elif event_type == 'conversion':
+            previous = self.conversions.get(event['key'])
+            if previous is not None:
+                self.rollups.remove_conversion(previous)
+            self.conversions[event['key']] = event['conversion']
+            self.columns.add_conversion(event['key'], event['conversion'])
+            self.rollups.add_conversion(event['conversion'])
+        elif event_type == 'metrics' and event['tweet_id'] in self.posts:
+            self.rollups.update_metrics(self.posts[event['tweet_id']], event['metrics'])
+            self.posts[event['tweet_id']]['metrics'] = event['metrics']
+            self.posts[event['tweet_id']]['last_updated'] = event['updated_at']
+            self.columns.update_metrics(event['tweet_id'], event['metrics'])
+    
+    def _maybe_compact(self) -> None:
+        """Fold the event log into snapshots once it grows past COMPACT_EVERY events or COMPACT_INTERVAL seconds."""
+        if (self.event_log.events_since_snapshot >= self.COMPACT_EVERY or
+                time.monotonic() - self._last_compact >= self.COMPACT_INTERVAL):
+            self.compact()
     
     def get_performance_report(self, days: int = 30) -> Dict[str, Any]:
         """
         Generate comprehensive performance report.
         
+        Counts, revenue and quality come from the columnar mirror (binary
+        search plus prefix sums); engagement, best posting time and the
+        per-program and per-day breakdowns are read from the rollups. Neither
+        walks individual events. Rollups resolve windows to whole hours, so
+        the window starts at the clock hour containing the cutoff for both,
+        and every summary field covers the same posts.
+        
         Args:
             days: Number of days to analyze
             
@@ -126,27 +297,23 @@ class AnalyticsTracker:
             Dictionary containing performance metrics
         """
         cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff = self.rollups.window_start(cutoff_date.timestamp())
         
-        # Filter recent data
-        recent_posts = {
-            k: v for k, v in self.posts.items()
-            if datetime.fromisoformat(v['posted_at']) > cutoff_date
-        }
-        
-        recent_conversions = {
-            k: v for k, v in self.conversions.items()
-            if datetime.fromisoformat(v['converted_at']) > cutoff_date
-        }
+        # Select recent data; columnar windows exclude their start, rollups include it
+        columnar_start = math.nextafter(cutoff, -math.inf)
+        posts = self.columns.posts.window(columnar_start)
+        conversions = self.columns.conversions.window(columnar_start)
+        rollup = self.rollups.window(cutoff)
         
         # Calculate metrics
-        engagement_stats = self._calculate_engagement_stats(recent_posts)
-        conversion_stats = self._calculate_conversion_stats(recent_conversions)
-        quality_stats = self._calculate_quality_stats(recent_posts)
+        engagement_stats = self._calculate_engagement_stats(rollup)
+        conversion_stats = self._calculate_conversion_stats(*conversions)
+        quality_stats = self._calculate_quality_stats(*posts)
         
         return {
             'summary': {
-                'total_posts': len(recent_posts),
-                'total_conversions': len(recent_conversions),
+                'total_posts': posts[1] - posts[0],
+                'total_conversions': conversions[1] - conversions[0],
                 'conversion_rate': conversion_stats['conversion_rate'],
                 'average_engagement': engagement_stats['average_engagement'],
                 'revenue': conversion_stats['total_revenue']
@@ -154,92 +321,66 @@ class AnalyticsTracker:
             'engagement': engagement_stats,
             'conversions': conversion_stats,
             'quality': quality_stats,
+            'programs': {
+                program: bucket.to_dict()
+                for program, bucket in sorted(rollup['programs'].items())
+            },
+            'daily': self.rollups.daily_series(cutoff_date),
             'period': f"Last {days} days",
             'generated_at': datetime.now().isoformat()
         }
     
-    def _calculate_engagement_stats(self, posts: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_engagement_stats(self, rollup: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate engagement statistics"""
-        if not posts:
+        total = rollup['total']
+        if total.posts <= 0:
             return {'average_engagement': 0, 'engagement_rate': 0}
         
-        engagements = []
-        for post in posts.values():
-            metrics = post.get('metrics', {})
-            engagement = (
-                metrics.get('likes', 0) +
-                metrics.get('retweets', 0) * 2 +
-                metrics.get('replies', 0) * 3
-            )
-            engagements.append(engagement)
-        
+        average = total.engagement / total.posts
         return {
-            'average_engagement': statistics.mean(engagements),
-            'engagement_rate': statistics.mean(engagements) / len(posts),
-            'best_time': self._find_best_posting_time(posts)
+            'average_engagement': average,
+            'engagement_rate': average / total.posts,
+            'best_time': self._find_best_posting_time(rollup['hour_of_day'])
         }
     
-    def _calculate_conversion_stats(self, conversions: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_conversion_stats(self, lo: int, hi: int) -> Dict[str, Any]:
         """Calculate conversion statistics"""
-        if not conversions:
+        if hi <= lo:
             return {'conversion_rate': 0, 'total_revenue': 0}
         
-        total_revenue = sum(conv['amount'] for conv in conversions.values())
+        total_revenue = self.columns.conversions.sum('amount', lo, hi)
         
         return {
-            'conversion_rate': len(conversions) / len(self.posts) if self.posts else 0,
+            'conversion_rate': (hi - lo) / len(self.posts) if self.posts else 0,
             'total_revenue': total_revenue,
-            'average_conversion': total_revenue / len(conversions)
+            'average_conversion': total_revenue / (hi - lo)
         }
     
-    def _calculate_quality_stats(self, posts: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_quality_stats(self, lo: int, hi: int) -> Dict[str, Any]:
         """Calculate quality score statistics"""
-        if not posts:
+        if hi <= lo:
             return {'average_quality': 0}
         
-        quality_scores = [post.get('quality_score', 0) for post in posts.values()]
-        
         return {
-            'average_quality': statistics.mean(quality_scores),
-            'quality_trend': self._calculate_trend(quality_scores)
+            'average_quality': self.columns.posts.mean('quality', lo, hi),
+            'quality_trend': self._calculate_trend('quality', lo, hi)
         }
     
-    def _find_best_posting_time(self, posts: Dict[str, Any]) -> str:
+    def _find_best_posting_time(self, hour_of_day: List[RollupBucket]) -> str:
         """Find the most engaging posting time"""
-        time_engagements = {}
-        
-        for post in posts.values():
-            posted_at = datetime.fromisoformat(post['posted_at'])
-            hour = posted_at.hour
-            
-            metrics = post.get('metrics', {})
-            engagement = (
-                metrics.get('likes', 0) +
-                metrics.get('retweets', 0) * 2 +
-                metrics.get('replies', 0) * 3
-            )
-            
-            if hour not in time_engagements:
-                time_engagements[hour] = []
-            time_engagements[hour].append(engagement)
-        
-        if not time_engagements:
+        best_hour = AnalyticsRollups.best_hour(hour_of_day)
+        if best_hour is None:
             return "No data"
-        
-        best_hour = max(
-            time_engagements.items(),
-            key=lambda x: statistics.mean(x[1])
-        )[0]
-        
         return f"{best_hour:02d}:00"
     
-    def _calculate_trend(self, values: List[float]) -> str:
-        """Calculate trend direction"""
-        if len(values) < 2:
+    def _calculate_trend(self, field: str, lo: int, hi: int) -> str:
+        """Calculate trend direction of a post column over a window"""
+        if hi - lo < 2:
             return "neutral"
         
-        avg_first_half = statistics.mean(values[:len(values)//2])
-        avg_second_half = statistics.mean(values[len(values)//2:])
+        middle = lo + (hi - lo) // 2
+        avg_first_half = self.columns.posts.mean(field, lo, middle)
+        avg_second_half = self.columns.posts.mean(field, middle, hi)
         
         if avg_second_half > avg_first_half * 1.05:
             return "increasing"
@@ -259,6 +400,8 @@ class AnalyticsTracker:
     def _save_json(self, file_path: Path, data: Dict) -> None:
         """Save data to JSON file"""
         try:
-            file_path.write_text(json.dumps(data, indent=2))
+            tmp_file = file_path.with_name(file_path.name + '.tmp')
+            tmp_file.write_text(json.dumps(data, indent=2))
+            tmp_file.replace(file_path)
         except Exception as e:
             logging.error(f"Error saving to {file_path}: {e}")
\ No newline at end of file
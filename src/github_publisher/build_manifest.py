@@ -0,0 +1,70 @@
+"""
+Build manifest for incremental static site generation.
+
+Records a content hash of every generated page's inputs so that pages whose
+inputs did not change since the last build can be skipped.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+
+class BuildManifest:
+    """
+    Tracks input hashes of generated pages between builds.
+
+    Attributes:
+        manifest_file: JSON file holding the page -> hash mapping
+        entries: Hashes recorded by the previous build
+        current: Hashes recorded by the build in progress
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_file: Path):
+        self.manifest_file = Path(manifest_file)
+        self.entries = self._load()
+        self.current: Dict[str, str] = {}
+
+    @staticmethod
+    def hash_inputs(*parts: Any) -> str:
+        """Hash arbitrary JSON-serializable page inputs."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def is_fresh(self, page: str, digest: str, output_file: Path) -> bool:
+        """Check whether a page was built from identical inputs and still exists."""
+        return self.entries.get(page) == digest and Path(output_file).exists()
+
+    def record(self, page: str, digest: str) -> None:
+        """Record the input hash of a page for the current build."""
+        self.current[page] = digest
+
+    def save(self) -> None:
+        """Persist hashes of the current build, dropping pages no longer generated."""
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            self.manifest_file.write_text(json.dumps({
+                'version': self.VERSION,
+                'pages': dict(sorted(self.current.items()))
+            }, indent=2))
+            self.entries = dict(self.current)
+        except Exception as e:
+            logging.error(f"Error saving build manifest: {e}")
+
+    def _load(self) -> Dict[str, str]:
+        """Load hashes recorded by the previous build."""
+        try:
+            if self.manifest_file.exists():
+                data = json.loads(self.manifest_file.read_text())
+                if data.get('version') == self.VERSION:
+                    return data.get('pages', {})
+        except Exception as e:
+            logging.error(f"Error loading build manifest: {e}")
+        return {}
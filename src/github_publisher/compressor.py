@@ -0,0 +1,112 @@
+"""
+Precompressed sidecars for generated site files.
+
+Writes <file>.gz next to every compressible output (and <file>.br when the
+brotli package is installed) so a static host can serve them without
+compressing on every request.
+"""
+
+import gzip
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from github_publisher.output_writer import OutputWriter
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip sidecars are always written
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {'.html', '.css', '.js', '.json', '.xml', '.svg', '.txt'}
+SIDECAR_SUFFIXES = ('.gz', '.br')
+
+
+def sidecars_for(path: Path) -> List[Path]:
+    """List the sidecar paths that belong to a file."""
+    return [path.with_name(path.name + suffix) for suffix in SIDECAR_SUFFIXES]
+
+
+def is_sidecar(path: Path) -> bool:
+    """Check whether path is a sidecar of another file."""
+    return Path(path).suffix in SIDECAR_SUFFIXES
+
+
+def remove_with_sidecars(path: Path) -> None:
+    """Delete a file together with its compressed sidecars."""
+    for target in [Path(path)] + sidecars_for(Path(path)):
+        target.unlink(missing_ok=True)
+
+
+class Precompressor:
+    """
+    Compresses changed outputs in parallel.
+
+    Attributes:
+        workers: Number of compression threads (zlib and brotli release the GIL)
+        min_size: Files smaller than this are not worth compressing
+    """
+
+    def __init__(self, workers: int = None, min_size: int = 256):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_size = min_size
+
+    def compress(self, changed: Iterable[Path], output_dir: Path, rescan: bool = False) -> Dict[str, int]:
+        """
+        Write sidecars for the files changed in this build.
+
+        Only changed files are looked at, so the cost follows the build rather
+        than the size of the site. A changed file that no longer qualifies
+        (it shrank below min_size) loses the sidecars it had.
+
+        Args:
+            changed: Files written by this build
+            output_dir: Site root, walked in full only when rescan is set
+            rescan: Compress every file, for sites built while precompression was off
+
+        Returns:
+            Counts of compressed files, sidecars written and removed, and bytes before/after gzip
+        """
+        paths = Path(output_dir).rglob('*') if rescan else changed
+        stats = {'files': 0, 'sidecars_written': 0, 'sidecars_removed': 0, 'original_bytes': 0, 'gzip_bytes': 0}
+        candidates = set()
+        for path in map(Path, paths):
+            if is_sidecar(path):
+                continue
+            if self._wants_sidecars(path):
+                candidates.add(path)
+                continue
+            for sidecar in sidecars_for(path):
+                if sidecar.exists():
+                    sidecar.unlink()
+                    stats['sidecars_removed'] += 1
+
+        if candidates:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for original, gzipped, written in executor.map(self._compress_file, sorted(candidates)):
+                    stats['files'] += 1
+                    stats['sidecars_written'] += written
+                    stats['original_bytes'] += original
+                    stats['gzip_bytes'] += gzipped
+
+        logging.info(f"Precompressed outputs: {stats}")
+        return stats
+
+    def _wants_sidecars(self, path: Path) -> bool:
+        """Check whether a file should get compressed sidecars."""
+        return path.suffix in COMPRESSIBLE_SUFFIXES and path.is_file() and path.stat().st_size >= self.min_size
+
+    def _compress_file(self, path: Path) -> tuple:
+        """Write the sidecars of one file; identical sidecars are left untouched."""
+        data = path.read_bytes()
+        writer = OutputWriter()
+
+        # mtime=0 keeps gzip output byte-identical for identical input
+        gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+        writer.write_bytes(path.with_name(path.name + '.gz'), gzipped)
+        if brotli is not None:
+            writer.write_bytes(path.with_name(path.name + '.br'), brotli.compress(data))
+
+        return len(data), len(gzipped), len(writer.changed)
@@ -0,0 +1,170 @@
+"""
+Weekly digest storage.
+
+Each digest is written to its own data/digests/<id>.json file and summarized
+in data/digests/index.json, which is all the archive page needs. Building a
+digest reads only the tools added during the week (through the store's
+added_date index) and the store's category counters.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from github_publisher.tool_store import ToolStore
+from utils.dates import parse_datetime
+from utils.helpers import slugify
+
+
+class DigestStore:
+    """
+    Per-week digest files plus a small index.
+
+    Attributes:
+        digest_dir: Directory holding <id>.json files and index.json
+        index_file: Path of the index
+        featured_limit: Number of new tools featured in a digest
+    """
+
+    def __init__(self, data_dir: Path, featured_limit: int = 6):
+        self.digest_dir = Path(data_dir) / 'digests'
+        self.digest_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.digest_dir / 'index.json'
+        self.featured_limit = featured_limit
+        self._migrate_legacy(Path(data_dir) / 'digests.json')
+
+    def build(self, store: ToolStore, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Create (or refresh) the digest of the ISO week containing now.
+
+        Args:
+            store: Tool catalog
+            now: Reference time, defaults to the current time
+
+        Returns:
+            The digest that was written
+        """
+        # ISO weeks are taken in UTC, like the stored added_date values
+        now = parse_datetime(now) if now else datetime.now(timezone.utc)
+        year, week, weekday = now.isocalendar()
+        week_start = (now - timedelta(days=weekday - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        new_tools = store.added_between(week_start, week_start + timedelta(days=7))
+        category_counts = store.category_counts()
+        new_by_category = {}
+        for tool in new_tools:
+            category = tool.get('category')
+            new_by_category[category] = new_by_category.get(category, 0) + 1
+
+        featured = sorted(new_tools, key=lambda tool: tool.get('quality_score', 0), reverse=True)
+        digest = {
+            'id': f"{year}-w{week:02d}",
+            'week_number': week,
+            'year': year,
+            'published_date': now.isoformat(),
+            'highlights': [],
+            'featured_tools': [
+                {
+                    'id': slugify(tool['name']),
+                    'name': tool['name'],
+                    'description': tool.get('description', ''),
+                    'category': tool.get('category')
+                }
+                for tool in featured[:self.featured_limit]
+            ],
+            'trends': [],
+            'categories': sorted(category_counts),
+            'stats': {
+                'total_new_tools': len(new_tools),
+                'avg_quality_score': (
+                    sum(tool.get('quality_score', 0) for tool in new_tools) / len(new_tools)
+                    if new_tools else 0
+                ),
+                'top_category': next(iter(category_counts), None),
+                'new_by_category': new_by_category
+            }
+        }
+        self.save(digest)
+        return digest
+
+    def save(self, digest: Dict[str, Any]) -> None:
+        """Write a digest file and update its entry in the index."""
+        self._write_json(self.digest_dir / f"{digest['id']}.json", digest)
+        index = self.load_index()
+        entries = [entry for entry in index['digests'] if entry['id'] != digest['id']]
+        entries.append(self._summarize(digest))
+        self._write_json(self.index_file, self._build_index(entries, digest))
+
+    def load(self, digest_id: str) -> Optional[Dict[str, Any]]:
+        """Load a single digest by id."""
+        return self._read_json(self.digest_dir / f"{digest_id}.json")
+
+    def load_index(self) -> Dict[str, Any]:
+        """Load the digest index (empty when no digest exists yet)."""
+        return self._read_json(self.index_file) or self._build_index([], None)
+
+    def _build_index(self, entries: List[Dict[str, Any]], latest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assemble the index from digest summaries, newest first."""
+        entries.sort(key=lambda entry: entry['id'], reverse=True)
+        if latest is not None and entries and entries[0]['id'] != latest['id']:
+            latest = self.load(entries[0]['id'])
+        return {
+            'digests': entries,
+            'latest': {
+                'id': latest['id'],
+                'highlights': latest['highlights'],
+                'featured_tools': latest['featured_tools']
+            } if latest else None,
+            'stats': {
+                'total_digests': len(entries),
+                'total_tools': sum(entry['featured_count'] for entry in entries),
+                'total_categories': max((entry['categories_count'] for entry in entries), default=0),
+                'years': sorted({entry['year'] for entry in entries}, reverse=True)
+            }
+        }
+
+    def _summarize(self, digest: Dict[str, Any]) -> Dict[str, Any]:
+        """Index entry for a digest."""
+        return {
+            'id': digest['id'],
+            'week_number': digest['week_number'],
+            'year': digest['year'],
+            'published_date': digest['published_date'],
+            'highlights_count': len(digest.get('highlights', [])),
+            'featured_count': len(digest.get('featured_tools', [])),
+            'categories_count': len(digest.get('categories', [])),
+            'new_tools': digest.get('stats', {}).get('total_new_tools', 0)
+        }
+
+    def _migrate_legacy(self, legacy_file: Path) -> None:
+        """Split a legacy digests.json list into per-week files once."""
+        if self.index_file.exists() or not legacy_file.exists():
+            return
+        digests = self._read_json(legacy_file) or []
+        latest = {}
+        for digest in digests:
+            # Later entries for the same week replace earlier ones
+            latest[digest['id']] = digest
+        for digest in latest.values():
+            self._write_json(self.digest_dir / f"{digest['id']}.json", digest)
+        entries = [self._summarize(digest) for digest in latest.values()]
+        newest = max(latest.values(), key=lambda digest: digest['id'], default=None)
+        self._write_json(self.index_file, self._build_index(entries, newest))
+        logging.info(f"Migrated {len(latest)} digests from {legacy_file}")
+
+    def _read_json(self, path: Path) -> Any:
+        """Read a JSON file, returning None if it is missing or unreadable."""
+        try:
+            if path.exists():
+                return json.loads(path.read_text())
+        except Exception as e:
+            logging.error(f"Error loading {path}: {e}")
+        return None
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        """Write a JSON file atomically."""
+        tmp_file = path.with_name(path.name + '.tmp')
+        tmp_file.write_text(json.dumps(data, indent=4))
+        tmp_file.replace(path)
@@ -0,0 +1,163 @@
+"""
+Sitemap and Atom feed generation for the static site.
+
+Both are streamed to disk straight from the tool iteration: the sitemap is
+written URL by URL and split into numbered files behind a sitemap index once
+it passes the 50,000 URL limit, and the feed keeps only the latest N tools.
+"""
+
+import heapq
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+from xml.sax.saxutils import escape
+
+from github_publisher.compressor import remove_with_sidecars
+from github_publisher.output_writer import OutputWriter
+from utils.dates import parse_datetime
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+
+
+def to_rfc3339(date_str: Optional[str]) -> Optional[str]:
+    """Normalize an ISO date string to RFC 3339; naive times are taken as UTC."""
+    if not date_str:
+        return None
+    date = parse_datetime(date_str)
+    if date is None:
+        logging.warning(f"Invalid date for sitemap/feed: {date_str}")
+        return None
+    return date.replace(microsecond=0).isoformat()
+
+
+class SitemapWriter:
+    """
+    Streams <url> entries into sitemap files.
+
+    With up to max_urls URLs the result is a single sitemap.xml; beyond that
+    URLs go to sitemap-1.xml, sitemap-2.xml, ... and sitemap.xml becomes a
+    sitemap index pointing at them.
+
+    Usage:
+        with SitemapWriter(output_dir, base_url, writer) as sitemap:
+            sitemap.add('tools/chatgpt.html', '2024-11-14T03:07:44+00:00')
+    """
+
+    MAX_URLS = 50000
+
+    def __init__(self, output_dir: Path, base_url: str, writer: OutputWriter, max_urls: int = MAX_URLS):
+        self.output_dir = Path(output_dir)
+        self.base_url = base_url.rstrip('/')
+        self.writer = writer
+        self.max_urls = max_urls
+        self.url_count = 0
+        self._chunks = 0
+        self._chunk_urls = 0
+        self._pending = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._pending:
+            self._pending.discard()
+        return False
+
+    def add(self, path: str, lastmod: Optional[str] = None) -> None:
+        """Add a site-relative path to the sitemap."""
+        if self._pending is None or self._chunk_urls >= self.max_urls:
+            self._start_chunk()
+        entry = f"<url><loc>{escape(f'{self.base_url}/{path}')}</loc>"
+        if lastmod:
+            entry += f"<lastmod>{escape(lastmod)}</lastmod>"
+        self._pending.handle.write(entry + "</url>\n")
+        self._chunk_urls += 1
+        self.url_count += 1
+
+    def close(self) -> None:
+        """Finish the last chunk and write the sitemap index if needed."""
+        if self._pending is None:
+            self._start_chunk()
+        self._pending.handle.write("</urlset>\n")
+
+        if self._chunks == 1:
+            self._pending.commit(self.output_dir / 'sitemap.xml')
+        else:
+            self._pending.commit(self.output_dir / f'sitemap-{self._chunks}.xml')
+            with self.writer.open_text(self.output_dir / 'sitemap.xml') as handle:
+                handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                handle.write(f'<sitemapindex xmlns="{SITEMAP_NS}">\n')
+                for chunk in range(1, self._chunks + 1):
+                    handle.write(f"<sitemap><loc>{escape(f'{self.base_url}/sitemap-{chunk}.xml')}</loc></sitemap>\n")
+                handle.write("</sitemapindex>\n")
+        self._pending = None
+
+        # Remove chunks left over from a bigger previous sitemap
+        first_stale = self._chunks + 1 if self._chunks > 1 else 1
+        for stale in self.output_dir.glob('sitemap-*.xml'):
+            number = stale.stem.split('-', 1)[1]
+            if number.isdigit() and int(number) >= first_stale:
+                remove_with_sidecars(stale)
+
+    def _start_chunk(self) -> None:
+        """Close the current chunk (if any) and start a new one."""
+        if self._pending is not None:
+            self._pending.handle.write("</urlset>\n")
+            self._pending.commit(self.output_dir / f'sitemap-{self._chunks}.xml')
+        self._chunks += 1
+        self._chunk_urls = 0
+        self._pending = self.writer.open_pending(self.output_dir)
+        self._pending.handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self._pending.handle.write(f'<urlset xmlns="{SITEMAP_NS}">\n')
+
+
+def write_atom_feed(output_dir: Path, site_settings: dict, tools: Iterable[dict],
+                    writer: OutputWriter, limit: int = 50) -> int:
+    """
+    Write feed.xml with the latest tools, newest first.
+
+    Only the newest `limit` tools are kept while iterating, so memory use does
+    not depend on catalog size.
+
+    Returns:
+        Number of entries in the feed
+    """
+    base_url = site_settings['base_url'].rstrip('/')
+    latest = heapq.nlargest(
+        limit,
+        ((to_rfc3339(tool.get('added_date')) or '', tool['id'], tool) for tool in tools),
+        key=lambda item: (item[0], item[1])
+    )
+    updated = max(
+        (to_rfc3339(tool.get('last_updated')) or added for added, _, tool in latest),
+        default=to_rfc3339(datetime.now(timezone.utc).isoformat())
+    )
+
+    with writer.open_text(Path(output_dir) / 'feed.xml') as handle:
+        handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        handle.write(f'<feed xmlns="{ATOM_NS}">\n')
+        handle.write(f"<title>{escape(site_settings['site_title'])} - Latest Tools</title>\n")
+        handle.write(f"<subtitle>{escape(site_settings['site_description'])}</subtitle>\n")
+        handle.write(f'<link href="{escape(base_url)}/feed.xml" rel="self"/>\n')
+        handle.write(f'<link href="{escape(base_url)}/"/>\n')
+        handle.write(f"<id>{escape(base_url)}/</id>\n")
+        handle.write(f"<updated>{updated}</updated>\n")
+        for added, _, tool in latest:
+            url = f"{base_url}/tools/{tool['id']}.html"
+            handle.write("<entry>\n")
+            handle.write(f"<title>{escape(tool['name'])}</title>\n")
+            handle.write(f'<link href="{escape(url)}"/>\n')
+            handle.write(f"<id>{escape(url)}</id>\n")
+            handle.write(f"<published>{added}</published>\n")
+            handle.write(f"<updated>{to_rfc3339(tool.get('last_updated')) or added}</updated>\n")
+            if tool.get('category'):
+                handle.write(f'<category term="{escape(tool["category"], {chr(34): "&quot;"})}"/>\n')
+            handle.write(f"<summary>{escape(tool.get('description') or '')}</summary>\n")
+            handle.write("</entry>\n")
+        handle.write("</feed>\n")
+
+    return len(latest)
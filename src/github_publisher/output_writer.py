@@ -0,0 +1,206 @@
+"""
+Change-aware output writer for the static site.
+
+Files are only rewritten when their content differs from what is already on
+disk, and changed files are replaced atomically, so unchanged pages keep their
+mtime and never show up in the git diff of docs/.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, TextIO
+
+
+class OutputWriter:
+    """
+    Writes build outputs, skipping files whose content is unchanged.
+
+    Attributes:
+        changed: Paths written or copied during this build
+        unchanged: Number of writes skipped because content was identical
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        self.changed: List[Path] = []
+        self.unchanged = 0
+
+    def write_text(self, path: Path, content: str) -> bool:
+        """Write text to path if it differs from the existing file."""
+        return self.write_bytes(path, content.encode('utf-8'))
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """
+        Write bytes to path if they differ from the existing file.
+
+        Returns:
+            True if the file was written, False if it was already identical
+        """
+        path = Path(path)
+        if self._matches(path, len(data), hashlib.sha256(data).digest()):
+            self.unchanged += 1
+            return False
+
+        self._replace(path, lambda handle: handle.write(data))
+        self.changed.append(path)
+        return True
+
+    @contextmanager
+    def open_text(self, path: Path) -> TextIO:
+        """
+        Stream text into path without holding the whole document in memory.
+        
+        Content goes to a temporary file that replaces path on exit only if
+        it differs from the existing file.
+        """
+        pending = self.open_pending(Path(path).parent)
+        try:
+            yield pending.handle
+        except BaseException:
+            pending.discard()
+            raise
+        pending.commit(path)
+
+    def open_pending(self, directory: Path) -> 'PendingFile':
+        """Open a temporary text file whose final path is chosen when it is committed."""
+        return PendingFile(self, Path(directory))
+
+    def copy_file(self, src: Path, dest: Path) -> bool:
+        """Copy src to dest if their contents differ."""
+        src, dest = Path(src), Path(dest)
+        if self._matches(dest, src.stat().st_size, self._file_digest(src)):
+            self.unchanged += 1
+            return False
+
+        def copy(handle):
+            with open(src, 'rb') as source:
+                shutil.copyfileobj(source, handle, self.CHUNK_SIZE)
+
+        self._replace(dest, copy)
+        shutil.copystat(src, dest)
+        self.changed.append(dest)
+        return True
+
+    def sync_tree(self, src_dir: Path, dest_dir: Path,
+                  keep: Callable[[Path], bool] = None) -> Dict[str, int]:
+        """
+        Mirror src_dir into dest_dir incrementally.
+
+        Changed or new files are copied, identical files are left alone and
+        files missing from src_dir are removed, unless keep(path) is true.
+
+        Returns:
+            Counts of copied, unchanged and removed files
+        """
+        src_dir, dest_dir = Path(src_dir), Path(dest_dir)
+        stats = {'copied': 0, 'unchanged': 0, 'removed': 0}
+
+        expected = set()
+        for src in sorted(src_dir.rglob('*')):
+            if not src.is_file():
+                continue
+            relative = src.relative_to(src_dir)
+            expected.add(relative)
+            if self.copy_file(src, dest_dir / relative):
+                stats['copied'] += 1
+            else:
+                stats['unchanged'] += 1
+
+        if dest_dir.exists():
+            for dest in sorted(dest_dir.rglob('*'), reverse=True):
+                relative = dest.relative_to(dest_dir)
+                if dest.is_file() and relative not in expected and not (keep and keep(dest)):
+                    dest.unlink()
+                    stats['removed'] += 1
+                elif dest.is_dir() and not any(dest.iterdir()):
+                    dest.rmdir()
+
+        return stats
+
+    def _matches(self, path: Path, size: int, digest: bytes) -> bool:
+        """Check whether path already holds content with the given size and hash."""
+        try:
+            if path.stat().st_size != size:
+                return False
+            return self._file_digest(path) == digest
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logging.warning(f"Could not compare {path}: {e}")
+            return False
+
+    def _file_digest(self, path: Path) -> bytes:
+        """Hash a file in chunks."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(self.CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.digest()
+
+    def _replace(self, path: Path, write: Callable) -> None:
+        """Write to a temporary file next to path and atomically move it into place."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                write(handle)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+
+class PendingFile:
+    """
+    Temporary output file that is moved into place, or discarded, later.
+
+    Attributes:
+        handle: Text handle to write content to
+    """
+
+    def __init__(self, writer: OutputWriter, directory: Path):
+        self.writer = writer
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, self.tmp_name = tempfile.mkstemp(dir=directory, prefix='.pending.', suffix='.tmp')
+        self.handle = os.fdopen(fd, 'w', encoding='utf-8')
+
+    def commit(self, path: Path) -> bool:
+        """
+        Move the content to path unless path already holds identical content.
+
+        Returns:
+            True if path was written, False if it was already identical
+        """
+        path = Path(path)
+        self.handle.close()
+        try:
+            if self.writer._matches(path, os.path.getsize(self.tmp_name),
+                                    self.writer._file_digest(Path(self.tmp_name))):
+                os.unlink(self.tmp_name)
+                self.writer.unchanged += 1
+                return False
+            os.chmod(self.tmp_name, 0o644)
+            os.replace(self.tmp_name, path)
+        except BaseException:
+            self.discard()
+            raise
+        self.writer.changed.append(path)
+        return True
+
+    def discard(self) -> None:
+        """Throw the content away."""
+        self.handle.close()
+        try:
+            os.unlink(self.tmp_name)
+        except FileNotFoundError:
+            pass
@@ -2,13 +2,15 @@
 GitHub Publisher module for managing content updates and deployment.
 """
 
-import json
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable, Optional
 
 from utils.helpers import slugify
+from utils.known_tools import KnownTools
+from github_publisher.digests import DigestStore
 from github_publisher.static_generator import StaticGenerator
+from github_publisher.tool_store import LazyCatalog, ToolStore
 
 class GitHubPublisher:
     def __init__(self, config):
@@ -21,68 +23,129 @@ class GitHubPublisher:
         self.data_dir.mkdir(exist_ok=True)
         self.content_dir.mkdir(exist_ok=True)
         
+        # Tool catalog lives in SQLite; tools.json and tools.snapshot are exports
+        self.tools_file = self.data_dir / 'tools.json'
+        self.snapshot_file = self.data_dir / 'tools.snapshot'
+        self.store = ToolStore(self.data_dir / 'tools.db')
+        if not len(self.store):
+            self._seed_store()
+        elif self._tools_file_changed():
+            # tools.json is what gets committed (written by --mode export before a
+            # commit), so a newer copy (a pull, a hand edit) wins
+            print(f"🔄 {self.tools_file} is newer than the tool store, merging it")
+            self.store.import_json(self.tools_file)
+        self._mark_tools_file_synced()
+        
+        # Content hashes of tools discovery has already processed
+        self.known_tools = KnownTools(
+            self.store,
+            self.data_dir / 'known_tools.bloom',
+            capacity=config.get('known_tools_capacity', 100000)
+        )
+        
         # Load existing data
         self.tools_data = self._load_tools_data()
         
-    def _load_tools_data(self) -> Dict[str, Any]:
-        """Load existing tools data from file."""
-        tools_file = self.data_dir / 'tools.json'
-        if not tools_file.exists():
-            return {}
-        try:
-            return json.loads(tools_file.read_text())
-        except json.JSONDecodeError:
-            return {}
-
-    def _update_tools_data(self, new_tools: List[Dict[str, Any]]) -> None:
-        """Update tools data with new discoveries."""
-        for tool in new_tools:
-            tool_id = slugify(tool['name'])
-            if tool_id not in self.tools_data:
-                tool['added_date'] = datetime.now().isoformat()
-            tool['last_updated'] = datetime.now().isoformat()
-            self.tools_data[tool_id] = tool
+    def _seed_store(self) -> None:
+        """
+        Fill an empty tool store from the newest export, preferring the snapshot.
         
-        # Save updated data
-        tools_file = self.data_dir / 'tools.json'
-        tools_file.write_text(json.dumps(self.tools_data, indent=4))
+        A snapshot that cannot be loaded (corrupt, or written in an older
+        format or by an interpreter with another marshal version) falls back
+        to tools.json.
+        """
+        snapshot_mtime = self.snapshot_file.stat().st_mtime if self.snapshot_file.exists() else None
+        json_mtime = self.tools_file.stat().st_mtime if self.tools_file.exists() else None
+        if snapshot_mtime is not None and (json_mtime is None or snapshot_mtime >= json_mtime):
+            if self.store.import_snapshot(self.snapshot_file):
+                return
+            if json_mtime is not None:
+                print(f"⚠️ Could not load {self.snapshot_file}, seeding from {self.tools_file}")
+        if json_mtime is not None:
+            self.store.import_json(self.tools_file)
+
+    def _tools_file_changed(self) -> bool:
+        """Whether tools.json was modified since the store last imported or exported it."""
+        if not self.tools_file.exists():
+            return False
+        return str(self.tools_file.stat().st_mtime_ns) != self.store.get_meta('tools_json_mtime')
 
-    def _create_weekly_digest(self) -> Dict[str, Any]:
-        """Create weekly digest of new and trending tools."""
-        now = datetime.now()
-        digest = {
-            'id': f"{now.year}-w{now.isocalendar()[1]:02d}",
-            'week_number': now.isocalendar()[1],
-            'year': now.year,
-            'published_date': now.isoformat(),
-            'highlights': [],
-            'featured_tools': [],
-            'trends': [],
-            'categories': list(set(tool['category'] for tool in self.tools_data.values())),
-            'stats': {
-                'total_new_tools': len(self.tools_data),
-                'avg_quality_score': sum(t.get('quality_score', 0) for t in self.tools_data.values()) / len(self.tools_data) if self.tools_data else 0,
-                'top_category': max(set(tool['category'] for tool in self.tools_data.values()), key=list(tool['category'] for tool in self.tools_data.values()).count) if self.tools_data else None
-            }
-        }
+    def _mark_tools_file_synced(self) -> None:
+        """Record the current tools.json as in sync with the store."""
+        if self.tools_file.exists():
+            self.store.set_meta('tools_json_mtime', str(self.tools_file.stat().st_mtime_ns))
+
+    def _load_tools_data(self) -> LazyCatalog:
+        """Open existing tools data as a lazy view; tools are decoded only when read."""
+        return LazyCatalog(self.store)
+
+    def store_tools(self, new_tools: List[Dict[str, Any]], content_hashes: Iterable[str] = ()) -> int:
+        """
+        Write new discoveries to the tool store in one batched upsert.
+        
+        Exports and the site are left to finish_update(), so a streaming
+        discovery cycle can call this once per batch.
+        
+        Args:
+            new_tools: Tools to store
+            content_hashes: Content hashes of the discovered tools, recorded as processed
         
-        # Save digest
-        digests_file = self.data_dir / 'digests.json'
-        existing_digests = json.loads(digests_file.read_text()) if digests_file.exists() else []
-        existing_digests.append(digest)
-        digests_file.write_text(json.dumps(existing_digests, indent=4))
+        Returns:
+            Number of tools written
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        updates = {slugify(tool['name']): tool for tool in new_tools}
+        existing = self.store.get_many(updates)
         
-        return digest
+        for tool_id, tool in updates.items():
+            if tool_id in existing:
+                # Keep the date the tool was first added
+                tool['added_date'] = existing[tool_id].get('added_date', now)
+            else:
+                tool['added_date'] = now
+            tool['last_updated'] = now
+        
+        # tools_data reads through to the store, so it sees the new tools immediately
+        self.store.upsert_many(updates.items())
+        self.known_tools.add_many(content_hashes)
+        return len(updates)
+
+    def export_tools_data(self) -> int:
+        """Export the tool store to data/tools.json and the data/tools.snapshot snapshot."""
+        count = self.store.export_json(self.tools_file)
+        self._mark_tools_file_synced()
+        self.store.export_snapshot(self.snapshot_file)
+        print(f"📦 Exported {count} tools to {self.tools_file} and {self.snapshot_file}")
+        return count
+
+    def _create_weekly_digest(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Create the digest of the week containing now and update the digest index."""
+        return DigestStore(self.data_dir).build(self.store, now)
 
     async def update_repository(self, new_tools: List[Dict[str, Any]]) -> None:
         """Update repository with new tools and generate site."""
-        if new_tools:
-            self._update_tools_data(new_tools)
+        await self.finish_update(self.store_tools(new_tools) if new_tools else 0)
+
+    async def finish_update(self, stored: int) -> None:
+        """
+        Export the catalog (if configured and tools were stored) and regenerate the site.
+
+        A full export rewrites every tool, so it is off by default; run
+        ``--mode export`` before committing the catalog instead.
+
+        Args:
+            stored: Number of tools written with store_tools() this cycle
+        """
+        self.known_tools.save()
+        if stored and self.config.get('export_tools_json'):
+            self.export_tools_data()
+        
+        # Create weekly digest if it's Sunday, before the archive is rendered.
+        # Digest weeks are UTC ISO weeks, so the day is taken in UTC as well.
+        now = datetime.now(timezone.utc)
+        if now.weekday() == 6:
+            self._create_weekly_digest(now)
         
         # Generate static site
         generator = StaticGenerator(self.config)
-        generator.generate_site(self.tools_data)
-        
-        # Create weekly digest if it's Sunday
-        if datetime.now().weekday() == 6:
-            self._create_weekly_digest()
\ No newline at end of file
+        generator.generate_site(self.tools_data)
\ No newline at end of file
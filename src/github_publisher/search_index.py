@@ -0,0 +1,135 @@
+"""
+Client-side search index for the static site.
+
+Builds an inverted index over tool names, categories, features and
+descriptions and writes it as small JSON shards keyed by token prefix, so the
+browser only downloads the shard matching what the user typed.
+
+Layout under docs/search/:
+    index.json          shard list with sizes, prefix length, doc count and the
+                        stopwords left out of the index (the client drops them
+                        from queries too)
+    docs.json           [id, name, category] for every tool, by doc number
+    shards/<prefix>.json  {token: [doc, score, doc, score, ...]}
+"""
+
+import json
+import logging
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable
+
+from github_publisher.compressor import remove_with_sidecars
+from github_publisher.output_writer import OutputWriter
+from github_publisher.similarity import STOPWORDS
+
+# Score contributed by a token depending on where it appears
+FIELD_SCORES = {
+    'name': 4,
+    'category': 2,
+    'features': 2,
+    'description': 1
+}
+
+
+def search_tokens(text: str) -> list:
+    """Split text into lowercase search tokens."""
+    return [
+        token for token in re.findall(r'[a-z0-9]+', (text or '').lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+class SearchIndexBuilder:
+    """
+    Builds the sharded search index and writes it through an OutputWriter.
+
+    Only shards whose content changed are rewritten, so the index is updated
+    incrementally along with the pages.
+    """
+
+    VERSION = 2
+
+    def __init__(self, output_dir: Path, writer: OutputWriter, prefix_length: int = 2):
+        self.output_dir = Path(output_dir) / 'search'
+        self.writer = writer
+        self.prefix_length = prefix_length
+
+    def build(self, tools: Iterable[dict]) -> Dict:
+        """
+        Index prepared tools and write the shards.
+
+        Returns:
+            Build report with timing, token and shard size figures
+        """
+        start = time.perf_counter()
+        tools = sorted(tools, key=lambda tool: tool['id'])
+
+        postings = defaultdict(lambda: defaultdict(int))
+        for doc, tool in enumerate(tools):
+            fields = {
+                'name': tool.get('name'),
+                'category': tool.get('category'),
+                'features': ' '.join(tool.get('features') or []),
+                'description': tool.get('description')
+            }
+            for field, text in fields.items():
+                for token in set(search_tokens(text)):
+                    postings[token][doc] += FIELD_SCORES[field]
+
+        shards = defaultdict(dict)
+        for token in sorted(postings):
+            ranked = sorted(postings[token].items(), key=lambda item: (-item[1], item[0]))
+            shards[token[:self.prefix_length]][token] = [value for pair in ranked for value in pair]
+
+        shard_sizes = {}
+        changed_shards = 0
+        for prefix, shard in shards.items():
+            data = json.dumps(shard, separators=(',', ':'))
+            shard_sizes[prefix] = len(data.encode('utf-8'))
+            if self.writer.write_text(self.output_dir / 'shards' / f'{prefix}.json', data):
+                changed_shards += 1
+        removed_shards = self._remove_stale_shards(set(shards))
+
+        self.writer.write_text(
+            self.output_dir / 'docs.json',
+            json.dumps([[tool['id'], tool['name'], tool.get('category')] for tool in tools],
+                       separators=(',', ':'))
+        )
+        self.writer.write_text(
+            self.output_dir / 'index.json',
+            json.dumps({
+                'version': self.VERSION,
+                'prefix_length': self.prefix_length,
+                'doc_count': len(tools),
+                'stopwords': sorted(STOPWORDS),
+                'shards': dict(sorted(shard_sizes.items()))
+            }, separators=(',', ':'))
+        )
+
+        largest = max(shard_sizes.items(), key=lambda item: item[1]) if shard_sizes else (None, 0)
+        report = {
+            'build_seconds': round(time.perf_counter() - start, 3),
+            'documents': len(tools),
+            'tokens': len(postings),
+            'shards': len(shard_sizes),
+            'changed_shards': changed_shards,
+            'removed_shards': removed_shards,
+            'total_bytes': sum(shard_sizes.values()),
+            'largest_shard': {'prefix': largest[0], 'bytes': largest[1]}
+        }
+        logging.info(f"Search index built: {report}")
+        return report
+
+    def _remove_stale_shards(self, prefixes: set) -> int:
+        """Delete shards for prefixes that no longer have any tokens."""
+        shard_dir = self.output_dir / 'shards'
+        removed = 0
+        if shard_dir.exists():
+            for shard_file in shard_dir.glob('*.json'):
+                if shard_file.stem not in prefixes:
+                    remove_with_sidecars(shard_file)
+                    removed += 1
+        return removed
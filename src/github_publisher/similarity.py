@@ -0,0 +1,132 @@
+"""
+Feature-similarity index used to pick "similar tools" for tool pages.
+
+Each tool is turned into a sparse TF-IDF vector over its features, category,
+pricing and description tokens. Neighbours are scored through an inverted
+index whose posting lists keep only the tools each token matters most to, so
+the cost per tool is bounded instead of growing with the catalog, and the
+top-k results for every tool are computed once per build.
+"""
+
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'into', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this',
+    'through', 'to', 'with', 'ai', 'tool', 'tools'
+})
+
+# Relative weight of each kind of token in a tool vector
+FIELD_WEIGHTS = {
+    'category': 2.0,
+    'feature': 1.5,
+    'pricing': 0.5,
+    'word': 1.0
+}
+
+# Postings kept per token, so the work per tool stays bounded as the catalog grows
+MAX_POSTINGS = 64
+
+# Candidates whose exact cosine similarity is computed before picking the top-k
+RESCORE_CANDIDATES = 24
+
+
+def tokenize(tool: dict) -> List[Tuple[str, float]]:
+    """Build the weighted tokens describing a tool."""
+    tokens = []
+    if tool.get('category'):
+        tokens.append((f"category:{tool['category'].lower()}", FIELD_WEIGHTS['category']))
+    for feature in tool.get('features') or []:
+        tokens.append((f"feature:{feature.lower()}", FIELD_WEIGHTS['feature']))
+    if tool.get('pricing'):
+        tokens.append((f"pricing:{tool['pricing'].lower()}", FIELD_WEIGHTS['pricing']))
+    for word in re.findall(r'[a-z0-9]+', (tool.get('description') or '').lower()):
+        if len(word) > 2 and word not in STOPWORDS:
+            tokens.append((f"word:{word}", FIELD_WEIGHTS['word']))
+    return tokens
+
+
+class SimilarityIndex:
+    """
+    Precomputed top-k similar tools for a catalog.
+
+    Attributes:
+        limit: Number of neighbours kept per tool
+        neighbours: Tool id -> ordered list of similar tool ids
+    """
+
+    def __init__(self, tools: Iterable[dict], limit: int = 3):
+        self.limit = limit
+        self.neighbours: Dict[str, List[str]] = {}
+        self._build(list(tools))
+
+    def similar(self, tool_id: str) -> List[str]:
+        """Return the ids of the tools most similar to tool_id."""
+        return self.neighbours.get(tool_id, [])
+
+    def _build(self, tools: List[dict]) -> None:
+        """Vectorize every tool and compute its nearest neighbours."""
+        ids = [tool['id'] for tool in tools]
+        term_counts = []
+        document_frequency = defaultdict(int)
+        for tool in tools:
+            counts = defaultdict(float)
+            for token, weight in tokenize(tool):
+                counts[token] += weight
+            term_counts.append(counts)
+            for token in counts:
+                document_frequency[token] += 1
+
+        # L2-normalized TF-IDF vectors
+        total = len(tools)
+        vectors = []
+        for counts in term_counts:
+            vector = {
+                token: weight * (1.0 + math.log((1 + total) / (1 + document_frequency[token])))
+                for token, weight in counts.items()
+            }
+            norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+            vectors.append({token: value / norm for token, value in vector.items()})
+
+        # Impact-ordered postings: each token keeps the tools it weighs most in
+        postings = defaultdict(list)
+        for position, vector in enumerate(vectors):
+            for token, value in vector.items():
+                postings[token].append((value, position))
+        for token, token_postings in postings.items():
+            if len(token_postings) > MAX_POSTINGS:
+                token_postings.sort(key=lambda item: (-item[0], item[1]))
+                del token_postings[MAX_POSTINGS:]
+
+        quality = [tool.get('quality_score', 0) for tool in tools]
+        for position, vector in enumerate(vectors):
+            # Accumulate dot products over the (truncated) postings of every token
+            scores = defaultdict(float)
+            for token, value in vector.items():
+                for other_value, other in postings[token]:
+                    scores[other] += value * other_value
+            scores.pop(position, None)
+
+            # Rescore the strongest candidates with their full vectors
+            for other in heapq.nlargest(RESCORE_CANDIDATES, scores, key=scores.__getitem__):
+                other_vector = vectors[other]
+                scores[other] = sum(
+                    value * other_vector.get(token, 0.0) for token, value in vector.items()
+                )
+
+            self.neighbours[ids[position]] = self._top_k(scores, quality, ids)
+
+    def _top_k(self, scores: Dict[int, float], quality: List[float], ids: List[str]) -> List[str]:
+        """Pick the best scoring tools; ties are broken by quality, then id for stable output."""
+        if not scores:
+            return []
+        threshold = heapq.nlargest(self.limit, scores.values())[-1]
+        best = sorted(
+            (other for other, score in scores.items() if score >= threshold),
+            key=lambda other: (-scores[other], -quality[other], ids[other])
+        )
+        return [ids[other] for other in best[:self.limit]]
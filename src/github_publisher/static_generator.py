@@ -5,80 +5,292 @@ Static site generator for AI Tools Curator.
 import logging
 from pathlib import Path
 from datetime import datetime, timezone
-from jinja2 import Environment, FileSystemLoader
-import shutil
+import json
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, meta
+from jinja2.bccache import Bucket
+from concurrent.futures import ProcessPoolExecutor
+import calendar
+import hashlib
+import math
+from typing import Union
+
+from github_publisher.build_manifest import BuildManifest
+from github_publisher.compressor import Precompressor, is_sidecar, remove_with_sidecars
+from github_publisher.digests import DigestStore
+from github_publisher.feeds import SitemapWriter, to_rfc3339, write_atom_feed
+from github_publisher.output_writer import OutputWriter
+from github_publisher.search_index import SearchIndexBuilder
+from github_publisher.similarity import SimilarityIndex
+from github_publisher.tool_store import LazyCatalog, StoreDateIndex
+from utils.dates import DateIndex, normalize_tool_dates, parse_datetime, parse_timestamp
+from utils.helpers import freeze
+
+def format_date(date_str: str) -> str:
+    """Format an ISO date string, datetime or epoch timestamp to human-readable format."""
+    try:
+        if isinstance(date_str, (int, float)):
+            date = datetime.fromtimestamp(date_str, timezone.utc)
+        else:
+            date = parse_datetime(date_str)
+        return date.strftime('%B %d, %Y')
+    except Exception as e:
+        logging.error(f"Error formatting date {date_str}: {e}")
+        return date_str
+
+class SourceHashBytecodeCache(FileSystemBytecodeCache):
+    """
+    On-disk cache of compiled template bytecode keyed by template source hash.
+    
+    Editing a template produces a new cache entry instead of invalidating
+    the old one, so switching between template versions never recompiles.
+    """
+    
+    def get_bucket(self, environment, name, filename, source):
+        checksum = self.get_source_checksum(source)
+        key = hashlib.sha1(f"{name}\0{checksum}".encode('utf-8')).hexdigest()
+        bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+# Environments are reused across generator instances within a process
+_environments = {}
+
+def month_name(month: int) -> str:
+    """Convert a month number to its English name."""
+    return calendar.month_name[int(month)]
+
+def month_of(date_str: str) -> int:
+    """Extract the month number from an ISO date string."""
+    return parse_datetime(date_str).month
+
+def create_environment(template_dir: Path, cache_dir: Path = None) -> Environment:
+    """Create (or reuse) the Jinja2 environment used to render site templates."""
+    key = (Path(template_dir).resolve(), Path(cache_dir).resolve() if cache_dir else None)
+    if key in _environments:
+        return _environments[key]
+    
+    bytecode_cache = None
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = SourceHashBytecodeCache(str(cache_dir))
+    
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=True,
+        bytecode_cache=bytecode_cache
+    )
+    
+    # Add custom filters
+    env.filters['format_date'] = format_date
+    env.filters['month_name'] = month_name
+    env.filters['month'] = month_of
+    
+    _environments[key] = env
+    return env
+
+def precompile_templates(template_dir: Path, cache_dir: Path) -> int:
+    """
+    Compile every HTML template into the bytecode cache.
+    
+    Cache entries that no longer match any current template source are removed.
+    
+    Returns:
+        Number of templates compiled
+    """
+    env = create_environment(template_dir, cache_dir)
+    bytecode_cache = env.bytecode_cache
+    live_files = set()
+    
+    names = env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    for name in names:
+        env.get_template(name)
+        source, filename, _ = env.loader.get_source(env, name)
+        bucket = bytecode_cache.get_bucket(env, name, filename, source)
+        live_files.add(bytecode_cache.pattern % bucket.key)
+    
+    for cache_file in Path(cache_dir).glob(bytecode_cache.pattern % '*'):
+        if cache_file.name not in live_files:
+            cache_file.unlink()
+    
+    logging.info(f"Precompiled {len(names)} templates into {cache_dir}")
+    return len(names)
+
+def render_jobs(env: Environment, jobs: list) -> list:
+    """
+    Render a batch of (page, template_name, context) jobs.
+    
+    Returns:
+        List of (page, content, error) tuples in job order; content is None
+        and error holds the message when a page fails to render
+    """
+    results = []
+    for page, template_name, context in jobs:
+        try:
+            content = env.get_template(template_name).render(**context)
+            results.append((page, content, None))
+        except Exception as e:
+            results.append((page, None, f"{type(e).__name__}: {e}"))
+    return results
+
+# Per-process environment used by render pool workers
+_worker_env = None
+
+def _init_render_worker(template_dir: Path, cache_dir: Path) -> None:
+    """Give each render worker process its own Jinja2 environment."""
+    global _worker_env
+    _worker_env = create_environment(template_dir, cache_dir)
+
+def _render_chunk(jobs: list) -> list:
+    """Render a chunk of jobs inside a worker process."""
+    return render_jobs(_worker_env, jobs)
 
 class StaticGenerator:
     def __init__(self, config):
         self.config = config
         self.output_dir = Path('docs')
         self.template_dir = Path('templates')
+        self.data_dir = Path('data')
+        self.template_cache_dir = Path(config.get('cache_dir') or '.cache') / 'templates'
         
         # Ensure output directory exists
         self.output_dir.mkdir(exist_ok=True)
         
-        # Setup Jinja2 environment
-        self.env = Environment(
-            loader=FileSystemLoader(self.template_dir),
-            autoescape=True
-        )
+        # Incremental build state
+        self.incremental = config.get('incremental_build', True)
+        self.manifest = BuildManifest(self.data_dir / 'build_manifest.json')
+        self._template_digests = {}
+        self._force = not self.incremental
+        self.build_stats = {'rendered': 0, 'skipped': 0, 'errors': []}
+        
+        # Category pages are split into fixed-size pages
+        self.category_page_size = max(1, config.get('category_page_size', 48) or 48)
+        
+        # Optional .gz/.br sidecars for changed outputs; the marker records that
+        # the whole site has sidecars, so later builds only compress changed files
+        self.precompress = config.get('precompress', False)
+        self.compress_workers = config.get('compress_workers')
+        self.precompressed_marker = self.data_dir / 'precompressed'
         
-        # Add custom filters
-        self.env.filters['format_date'] = self.format_date
+        # Outputs are only rewritten when their content changes
+        self.writer = OutputWriter()
+        
+        # Build-scoped cache of prepared, read-only tool data
+        self._prepared_tools = {}
+        
+        # Parallel rendering: pages are queued and rendered in a process pool,
+        # a batch at a time so rendered pages never pile up in memory
+        self.render_workers = max(1, config.get('render_workers', 1) or 1)
+        self.render_batch_size = max(1, config.get('render_batch_size', 512) or 512)
+        self._pending_jobs = []
+        self._executor = None
+        
+        # Setup Jinja2 environment backed by the compiled template cache
+        self.env = create_environment(self.template_dir, self.template_cache_dir)
         
     def format_date(self, date_str: str) -> str:
         """Format ISO date string to human-readable format."""
-        try:
-            if isinstance(date_str, str):
-                date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            else:
-                date = date_str
-            return date.strftime('%B %d, %Y')
-        except Exception as e:
-            logging.error(f"Error formatting date {date_str}: {e}")
-            return date_str
+        return format_date(date_str)
 
-    def generate_site(self, tools_data: dict) -> None:
-        """Generate static site from tools data."""
+    def generate_site(self, tools_data: dict, force: bool = False) -> dict:
+        """
+        Generate static site from tools data.
+        
+        Pages whose inputs are unchanged since the last build are skipped
+        unless incremental builds are disabled or force is set.
+        
+        Every tool is prepared once and kept for the whole build, because the
+        index page, similarity index, search index, sitemap and feed all need
+        the full catalog. Rendering is what scales with the size of the site,
+        and it is done in batches of render_batch_size pages.
+        """
         try:
             print("🏗️ Generating static site...")
+            self.build_stats = {'rendered': 0, 'skipped': 0, 'errors': []}
+            self._force = force or not self.incremental
+            self._pending_jobs = []
+            self.writer = OutputWriter()
+            self._build_time = datetime.now(timezone.utc).isoformat()
             
-            # Prepare data
-            tools_list = list(tools_data.values())
+            # Prepare every tool once; all pages share the frozen results
+            self._prepared_tools = {}
+            tools_list = [self._get_prepared_tool(tool) for tool in tools_data.values()]
             categories = self._get_categories(tools_list)
             
+            # Latest and recent tools come from the store's added_ts index when
+            # there is one; a plain dict catalog is sorted by its parsed timestamps
+            if isinstance(tools_data, LazyCatalog):
+                date_index = tools_data.date_index()
+            else:
+                date_index = DateIndex(tools_list, key=lambda tool: tool.get('added_ts'))
+            
             # Calculate stats
-            stats = self._calculate_stats(tools_list)
+            stats = self._calculate_stats(tools_list, date_index)
             
             # Prepare category tools
             category_tools = self._prepare_category_tools(tools_list)
             
+            # Precompute similar tools once for the whole build
+            self._build_similarity_index(tools_list)
+            
             # Generate index page
-            self._generate_index(tools_list, categories, stats, category_tools)
+            self._generate_index(date_index, tools_list, categories, stats, category_tools)
             
             # Generate category pages
             for category in categories:
-                self._generate_category(category, tools_list, stats)
+                self._generate_category(category, category_tools[category], stats)
             
             # Generate individual tool pages
             for tool in tools_list:
-                self._generate_tool_page(tool, tools_list)
+                self._generate_tool_page(tool)
+            
+            # Generate the weekly digest archive
+            has_digests = self._generate_digest_archive()
+            
+            # Render the pages still queued from the last batch
+            self._render_pending_jobs()
+            
+            # Update the client-side search index
+            self._generate_search_index(tools_list)
+            
+            # Stream the sitemap and latest-tools feed
+            self._generate_sitemap(tools_list, categories, category_tools, has_digests)
+            write_atom_feed(self.output_dir, self.config.site_settings, tools_list, self.writer)
             
             # Copy static assets
             self._copy_static_assets()
             
-            print("✨ Site generated successfully!")
-            logging.info("Static site generated successfully")
+            # Drop pages the previous build produced but this one did not
+            self._remove_stale_pages()
+            
+            # Precompress everything that changed in this build
+            self._precompress_outputs()
+            
+            # Remember page inputs for the next build
+            self.manifest.save()
+            
+            for error in self.build_stats['errors']:
+                logging.error(f"Error rendering {error['page']}: {error['error']}")
+            
+            self.build_stats['files_written'] = len(self.writer.changed)
+            print(f"✨ Site generated successfully! "
+                  f"({self.build_stats['rendered']} rendered, {self.build_stats['skipped']} unchanged, "
+                  f"{len(self.build_stats['errors'])} failed, {self.build_stats['files_written']} files written)")
+            logging.info(f"Static site generated successfully: {self.build_stats}")
+            return self.build_stats
             
         except Exception as e:
             logging.error(f"Error generating static site: {str(e)}")
             raise
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
 
     def _get_categories(self, tools: list) -> list:
         """Get sorted list of unique categories."""
         return sorted(list(set(tool['category'] for tool in tools if 'category' in tool)))
 
-    def _calculate_stats(self, tools: list) -> dict:
+    def _calculate_stats(self, tools: list, date_index: Union[DateIndex, StoreDateIndex]) -> dict:
         """Calculate site statistics."""
         now = datetime.now(timezone.utc)
         week_ago = now.timestamp() - (7 * 24 * 60 * 60)
@@ -86,9 +298,7 @@ class StaticGenerator:
         return {
             'total_tools': len(tools),
             'categories': len(self._get_categories(tools)),
-            'this_week': len([t for t in tools if 
-                datetime.fromisoformat(t['added_date'].replace('Z', '+00:00')).timestamp() > week_ago
-            ]),
+            'this_week': date_index.count_since(week_ago),
             'avg_quality': sum(t.get('quality_score', 0) for t in tools) / len(tools) if tools else 0
         }
 
@@ -103,12 +313,26 @@ class StaticGenerator:
                 category_tools[category].append(tool)
         return category_tools
 
+    def _tool_id(self, tool: dict) -> str:
+        """Get the page id of a tool."""
+        return tool.get('id') or tool['name'].lower().replace(' ', '-')
+
+    def _get_prepared_tool(self, tool: dict) -> dict:
+        """Get the read-only prepared form of a tool, preparing it once per build."""
+        tool_id = self._tool_id(tool)
+        if tool_id not in self._prepared_tools:
+            self._prepared_tools[tool_id] = freeze(self._prepare_tool_data(tool))
+        return self._prepared_tools[tool_id]
+
     def _prepare_tool_data(self, tool: dict) -> dict:
         """Prepare tool data with all required fields."""
-        tool_data = tool.copy()
+        tool_data = dict(normalize_tool_dates(tool))
         
         # Ensure basic fields
-        tool_data['id'] = tool_data.get('id') or tool_data['name'].lower().replace(' ', '-')
+        tool_data['id'] = self._tool_id(tool_data)
+        
+        # Parse the added date once; sorting and filtering use the epoch value
+        tool_data['added_ts'] = parse_timestamp(tool_data.get('added_date'))
         
         # Create metrics dictionary
         metrics = {
@@ -140,93 +364,124 @@ class StaticGenerator:
         
         return tool_data
 
-    def _generate_index(self, tools: list, categories: list, stats: dict, category_tools: dict) -> None:
-        """Generate index page."""
-        template = self.env.get_template('index.html')
-        
-        # Prepare all tools with required fields
-        prepared_tools = [self._prepare_tool_data(tool) for tool in tools]
-        
-        # Sort tools by date for latest tools
-        latest_tools = sorted(
-            prepared_tools,
-            key=lambda x: datetime.fromisoformat(x['added_date'].replace('Z', '+00:00')),
-            reverse=True
-        )[:10]
+    def _generate_index(self, date_index: Union[DateIndex, StoreDateIndex], tools: list, categories: list,
+                        stats: dict, category_tools: dict) -> None:
+        """Generate index page from prepared tools."""
+        # Latest tools come straight from the date index; a store index returns
+        # raw tools, which map to the forms prepared for this build
+        latest_tools = [self._get_prepared_tool(tool) for tool in date_index.latest(10)]
         
         # Sort tools by quality score for top rated
         top_rated = sorted(
-            prepared_tools,
+            tools,
             key=lambda x: x.get('quality_score', 0),
             reverse=True
         )[:6]
         
-        # Prepare category tools
-        prepared_category_tools = {
-            category: [self._prepare_tool_data(tool) for tool in tools]
-            for category, tools in category_tools.items()
-        }
-        
-        content = template.render(
+        self._render_page(
+            'index.html',
+            self.output_dir / 'index.html',
             latest_tools=latest_tools,
             top_rated=top_rated,
             categories=categories,
-            category_tools=prepared_category_tools,
-            stats=stats,
-            last_updated=datetime.now(timezone.utc).isoformat()
+            category_tools=category_tools,
+            stats=stats
         )
-        
-        (self.output_dir / 'index.html').write_text(content)
+
+    def _category_slug(self, category: str) -> str:
+        """Get the URL slug of a category."""
+        return category.lower().replace(" ", "-")
 
     def _generate_category(self, category: str, tools: list, stats: dict) -> None:
-        """Generate category page."""
-        template = self.env.get_template('category.html')
-        
-        # Filter and prepare tools for this category
-        category_tools = [
-            self._prepare_tool_data(tool) 
-            for tool in tools 
-            if tool.get('category') == category
-        ]
-        
-        content = template.render(
-            category=category,
-            tools=category_tools,
-            stats=stats,
-            last_updated=datetime.now(timezone.utc).isoformat()
-        )
+        """
+        Generate the paginated pages and JSON shards of a category.
         
+        Page 1 lives at categories/<slug>.html and page N at
+        categories/<slug>/page-N.html; all links between them are relative.
+        Pages 2 and up also get a shard, categories/<slug>/page-N.json, that
+        the previous page loads to show them in place. Each shard links to
+        the next one.
+        """
+        category_tools = [tool for tool in tools if tool.get('category') == category]
+        slug = self._category_slug(category)
         category_dir = self.output_dir / 'categories'
-        category_dir.mkdir(exist_ok=True)
-        (category_dir / f'{category.lower().replace(" ", "-")}.html').write_text(content)
+        page_size = self.category_page_size
+        total_pages = max(1, -(-len(category_tools) // page_size))
+        
+        # Shards used to cover the whole category in one file
+        remove_with_sidecars(category_dir / f'{slug}.json')
+        
+        def page_url(page: int, from_page: int, suffix: str = 'html') -> str:
+            prefix = '../' if from_page > 1 else ''
+            if page == 1:
+                return f'{prefix}{slug}.{suffix}'
+            return f'page-{page}.{suffix}' if from_page > 1 else f'{slug}/page-{page}.{suffix}'
+        
+        for page in range(1, total_pages + 1):
+            offset = (page - 1) * page_size
+            page_tools = category_tools[offset:offset + page_size]
+            has_next = page < total_pages
+            if page > 1:
+                self.writer.write_text(
+                    category_dir / slug / f'page-{page}.json',
+                    json.dumps({
+                        'page': page,
+                        'tools': [self._category_shard_entry(tool) for tool in page_tools],
+                        'next': page_url(page + 1, page, 'json') if has_next else None
+                    }, separators=(',', ':'))
+                )
+            
+            output_file = category_dir / (f'{slug}.html' if page == 1 else f'{slug}/page-{page}.html')
+            self._render_page(
+                'category.html',
+                output_file,
+                category=category,
+                tools=page_tools,
+                stats=stats,
+                pagination={
+                    'page': page,
+                    'total_pages': total_pages,
+                    'page_size': page_size,
+                    'offset': offset,
+                    'total_tools': len(category_tools),
+                    'prev_url': page_url(page - 1, page) if page > 1 else None,
+                    'next_url': page_url(page + 1, page) if has_next else None,
+                    'shard_url': page_url(page + 1, page, 'json') if has_next else None
+                }
+            )
 
-    def _generate_tool_page(self, tool: dict, all_tools: list) -> None:
+    def _category_shard_entry(self, tool: dict) -> dict:
+        """Reduce a prepared tool to the fields shown on a category card."""
+        return {
+            'id': tool['id'],
+            'name': tool['name'],
+            'description': (tool.get('description') or '')[:150],
+            'url': tool.get('url'),
+            'quality_score': tool.get('quality_score', 0),
+            'added_date': tool.get('added_date'),
+            'features': list(tool.get('features') or [])[:3],
+            'views': tool['metrics'].get('views', 0),
+            'clicks': tool['metrics'].get('clicks', 0)
+        }
+
+    def _generate_tool_page(self, tool: dict) -> None:
         """Generate individual tool page."""
         try:
-            logging.info(f"Starting to generate page for tool: {tool.get('name', 'unknown')}")
+            logging.info(f"Preparing page for tool: {tool.get('name', 'unknown')}")
             
-            # Prepare tool data with all required fields
-            tool_data = self._prepare_tool_data(tool)
+            # Tool data comes prepared from the build cache
+            tool_data = self._get_prepared_tool(tool)
+            similar_tools = self._find_similar_tools(tool_data)
             
-            # Find similar tools and prepare them
-            similar_tools = [
-                self._prepare_tool_data(t) 
-                for t in self._find_similar_tools(tool_data, all_tools)
-            ]
-            
-            template = self.env.get_template('tool.html')
-            content = template.render(
+            self._render_page(
+                'tool.html',
+                self.output_dir / 'tools' / f"{tool_data['id']}.html",
                 tool=tool_data,
                 similar_tools=similar_tools,
-                metrics=tool_data['metrics'],
-                last_updated=datetime.now(timezone.utc).isoformat()
+                metrics=tool_data['metrics']
             )
             
-            tools_dir = self.output_dir / 'tools'
-            tools_dir.mkdir(exist_ok=True)
-            (tools_dir / f"{tool_data['id']}.html").write_text(content)
-            
-            logging.info(f"Successfully generated page for {tool_data.get('name')}")
+            logging.info(f"Prepared page for {tool_data.get('name')}")
             
         except Exception as e:
             logging.error(f"Error generating page for tool {tool.get('name', 'unknown')}: {str(e)}")
@@ -234,21 +489,191 @@ class StaticGenerator:
             logging.error(f"Traceback:", exc_info=True)
             raise
 
-    def _find_similar_tools(self, tool: dict, all_tools: list, limit: int = 3) -> list:
-        """Find similar tools based on category."""
-        return [t for t in all_tools 
-                if t['category'] == tool['category'] 
-                and t['name'] != tool['name']][:limit]
+    def _generate_digest_archive(self) -> bool:
+        """
+        Generate the digest archive page from the digest index.
+        
+        Returns:
+            True if there are digests (and so an archive page)
+        """
+        index = DigestStore(self.data_dir).load_index()
+        if not index['digests']:
+            return False
+        self._render_page(
+            'digest_archive.html',
+            self.output_dir / 'digests' / 'index.html',
+            digests=index['digests'],
+            latest=index['latest'],
+            stats=index['stats']
+        )
+        return True
+
+    def _generate_sitemap(self, tools: list, categories: list, category_tools: dict,
+                          has_digests: bool = False) -> None:
+        """Write sitemap.xml with every page, using each tool's last_updated as lastmod."""
+        def latest_update(group: list) -> str:
+            return max((to_rfc3339(tool.get('last_updated')) or '' for tool in group), default='') or None
+        
+        with SitemapWriter(self.output_dir, self.config.site_settings['base_url'], self.writer) as sitemap:
+            sitemap.add('', latest_update(tools))
+            for category in categories:
+                group = category_tools[category]
+                slug = self._category_slug(category)
+                lastmod = latest_update(group)
+                total_pages = max(1, -(-len(group) // self.category_page_size))
+                sitemap.add(f'categories/{slug}.html', lastmod)
+                for page in range(2, total_pages + 1):
+                    sitemap.add(f'categories/{slug}/page-{page}.html', lastmod)
+            for tool in tools:
+                sitemap.add(f"tools/{tool['id']}.html", to_rfc3339(tool.get('last_updated')))
+            if has_digests:
+                sitemap.add('digests/', None)
+        self.build_stats['sitemap_urls'] = sitemap.url_count
+
+    def _generate_search_index(self, tools: list) -> None:
+        """Rebuild the sharded search index when any searchable field changed."""
+        index_file = self.output_dir / 'search' / 'index.json'
+        digest = BuildManifest.hash_inputs(SearchIndexBuilder.VERSION, [
+            (tool['id'], tool['name'], tool.get('category'), tool.get('features'), tool.get('description'))
+            for tool in tools
+        ])
+        self.manifest.record('search/index.json', digest)
+        
+        if not self._force and self.manifest.is_fresh('search/index.json', digest, index_file):
+            self.build_stats['search_index'] = {'skipped': True}
+            return
+        
+        report = SearchIndexBuilder(self.output_dir, self.writer).build(tools)
+        self.build_stats['search_index'] = report
+        print(f"🔎 Search index: {report['tokens']} tokens in {report['shards']} shards, "
+              f"{report['total_bytes']} bytes (largest {report['largest_shard']['bytes']} bytes) "
+              f"built in {report['build_seconds']}s")
+
+    def _render_page(self, template_name: str, output_file: Path, **context) -> bool:
+        """
+        Queue a template render to output_file unless its inputs are unchanged.
+        
+        The build timestamp is left out of the input hash so that a page is
+        only rebuilt when its data or templates change.
+        
+        Returns:
+            True if the page was queued, False if it was skipped
+        """
+        page = output_file.relative_to(self.output_dir).as_posix()
+        digest = BuildManifest.hash_inputs(self._template_digest(template_name), context)
+        
+        if not self._force and self.manifest.is_fresh(page, digest, output_file):
+            self.manifest.record(page, digest)
+            self.build_stats['skipped'] += 1
+            return False
+        
+        context['last_updated'] = self._build_time
+        self._pending_jobs.append((page, template_name, context, digest))
+        if len(self._pending_jobs) >= self.render_batch_size:
+            self._render_pending_jobs()
+        return True
+
+    def _render_pending_jobs(self) -> None:
+        """
+        Render queued pages serially or across a process pool and write them out.
+        
+        Results are written in queue order regardless of which worker
+        rendered them, so output is deterministic. Pages that fail are
+        reported in build_stats['errors'] and left out of the manifest so
+        the next build retries them.
+        """
+        jobs = [(page, template_name, context) for page, template_name, context, _ in self._pending_jobs]
+        digests = {page: digest for page, _, _, digest in self._pending_jobs}
+        self._pending_jobs = []
+        
+        if self.render_workers > 1 and len(jobs) > 1:
+            chunk_size = max(1, math.ceil(len(jobs) / (self.render_workers * 4)))
+            chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+            # One pool serves every batch of the build
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.render_workers,
+                    initializer=_init_render_worker,
+                    initargs=(self.template_dir, self.template_cache_dir)
+                )
+            results = [result for chunk in self._executor.map(_render_chunk, chunks) for result in chunk]
+        else:
+            results = render_jobs(self.env, jobs)
+        
+        for page, content, error in results:
+            if error:
+                self.build_stats['errors'].append({'page': page, 'error': error})
+                continue
+            self.writer.write_text(self.output_dir / page, content)
+            self.manifest.record(page, digests[page])
+            self.build_stats['rendered'] += 1
+
+    def _precompress_outputs(self) -> None:
+        """Write sidecars for changed outputs, or for the whole site on the first precompressed build."""
+        if not self.precompress:
+            # Files written from now on get no sidecars, so the next precompressed build rescans
+            self.precompressed_marker.unlink(missing_ok=True)
+            return
+        rescan = not self.precompressed_marker.exists()
+        self.build_stats['compression'] = Precompressor(self.compress_workers).compress(
+            self.writer.changed, self.output_dir, rescan=rescan
+        )
+        if rescan:
+            self.precompressed_marker.parent.mkdir(parents=True, exist_ok=True)
+            self.precompressed_marker.touch()
+
+    def _remove_stale_pages(self) -> None:
+        """Delete generated pages, and their category page shards, that are no longer part of the site."""
+        if self.build_stats['errors']:
+            return
+        for page in set(self.manifest.entries) - set(self.manifest.current):
+            stale_file = self.output_dir / page
+            if stale_file.exists():
+                logging.info(f"Removed stale page {page}")
+            remove_with_sidecars(stale_file)
+            # Every category page owns the shard next to it
+            if page.startswith('categories/'):
+                remove_with_sidecars(stale_file.with_suffix('.json'))
+            page_dir = stale_file.parent
+            if page_dir != self.output_dir and page_dir.is_dir() and not any(page_dir.iterdir()):
+                page_dir.rmdir()
+
+    def _template_digest(self, template_name: str) -> str:
+        """Hash a template's source together with every template it extends or includes."""
+        if template_name not in self._template_digests:
+            source, _, _ = self.env.loader.get_source(self.env, template_name)
+            referenced = sorted(
+                name for name in meta.find_referenced_templates(self.env.parse(source))
+                if name and name != template_name
+            )
+            self._template_digests[template_name] = BuildManifest.hash_inputs(
+                source, [self._template_digest(name) for name in referenced]
+            )
+        return self._template_digests[template_name]
+
+    def _build_similarity_index(self, tools: list) -> None:
+        """Index tools by feature similarity for constant-time neighbour lookups."""
+        self._tools_by_id = {tool['id']: tool for tool in tools}
+        self.similarity_index = SimilarityIndex(self._tools_by_id.values(), limit=3)
+
+    def _find_similar_tools(self, tool: dict, limit: int = 3) -> list:
+        """Find similar tools using the precomputed similarity index."""
+        return [
+            self._tools_by_id[tool_id]
+            for tool_id in self.similarity_index.similar(tool['id'])[:limit]
+        ]
 
     def _copy_static_assets(self) -> None:
-        """Copy static assets to output directory."""
+        """Sync static assets into the output directory, copying only changed files."""
         static_src = self.template_dir / 'static'
         static_dest = self.output_dir / 'static'
         
         if static_src.exists():
-            if static_dest.exists():
-                shutil.rmtree(static_dest)
-            shutil.copytree(static_src, static_dest)
-            logging.info("Static assets copied successfully")
+            # Keep compressed sidecars of assets that still exist
+            stats = self.writer.sync_tree(
+                static_src, static_dest,
+                keep=lambda path: is_sidecar(path) and path.with_suffix('').exists()
+            )
+            logging.info(f"Static assets synced: {stats}")
         else:
-            logging.warning("No static assets directory found")
\ No newline at end of file
+            logging.warning("No static assets directory found")
@@ -0,0 +1,566 @@
+"""
+SQLite-backed storage for the tool catalog.
+
+Replaces rewriting the whole of data/tools.json on every update: tools are
+upserted in batches into an indexed table, queried by range (latest, top
+rated, per category) and exported to the legacy JSON format on demand.
+"""
+
+import json
+import logging
+import sqlite3
+from collections.abc import Mapping
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.catalog import iter_json_object
+from utils.dates import normalize_tool_dates, parse_timestamp
+from utils.known_tools import content_hash
+from utils.near_duplicates import Fingerprint, best_match
+from utils.tool_record import Tool, read_snapshot, write_snapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tools (
+    slug TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT,
+    added_date TEXT,
+    added_ts REAL,
+    last_updated TEXT,
+    quality_score REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tools_category ON tools (category, quality_score);
+CREATE INDEX IF NOT EXISTS idx_tools_added ON tools (added_ts);
+CREATE INDEX IF NOT EXISTS idx_tools_quality ON tools (quality_score);
+
+-- Tools per category, kept current by triggers as tools are upserted
+CREATE TABLE IF NOT EXISTS category_counts (
+    category TEXT PRIMARY KEY,
+    tools INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS tools_count_insert AFTER INSERT ON tools
+WHEN NEW.category IS NOT NULL
+BEGIN
+    INSERT INTO category_counts (category, tools) VALUES (NEW.category, 1)
+    ON CONFLICT(category) DO UPDATE SET tools = tools + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tools_count_update AFTER UPDATE OF category ON tools
+WHEN OLD.category IS NOT NEW.category
+BEGIN
+    UPDATE category_counts SET tools = tools - 1 WHERE category = OLD.category;
+    DELETE FROM category_counts WHERE category = OLD.category AND tools <= 0;
+    INSERT INTO category_counts (category, tools) SELECT NEW.category, 1 WHERE NEW.category IS NOT NULL
+    ON CONFLICT(category) DO UPDATE SET tools = tools + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tools_count_delete AFTER DELETE ON tools
+WHEN OLD.category IS NOT NULL
+BEGIN
+    UPDATE category_counts SET tools = tools - 1 WHERE category = OLD.category;
+    DELETE FROM category_counts WHERE category = OLD.category AND tools <= 0;
+END;
+
+-- Near-duplicate lookup: URL key, name key and MinHash signature per tool,
+-- plus the signature's LSH band keys
+CREATE TABLE IF NOT EXISTS tool_fingerprints (
+    slug TEXT PRIMARY KEY,
+    url_key TEXT,
+    name_key TEXT,
+    signature BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_url ON tool_fingerprints (url_key);
+CREATE TABLE IF NOT EXISTS tool_bands (
+    band INTEGER NOT NULL,
+    slug TEXT NOT NULL,
+    PRIMARY KEY (band, slug)
+) WITHOUT ROWID;
+-- Content hashes of every tool discovery has processed (see utils.known_tools)
+CREATE TABLE IF NOT EXISTS known_content (
+    digest BLOB PRIMARY KEY
+) WITHOUT ROWID;
+-- Content hashes the quality scorer rejected, with the scorer settings that did
+CREATE TABLE IF NOT EXISTS rejected_content (
+    digest BLOB PRIMARY KEY,
+    scorer TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS tools_fingerprint_delete AFTER DELETE ON tools
+BEGIN
+    DELETE FROM tool_fingerprints WHERE slug = OLD.slug;
+END;
+
+-- Bookkeeping values such as the tools.json version the store last synced with
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ToolStore:
+    """
+    Indexed tool catalog stored in a local SQLite database.
+
+    Attributes:
+        db_file: Path of the SQLite database
+        connection: Open database connection
+    """
+
+    # Data version kept in PRAGMA user_version
+    VERSION = 3
+
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_file))
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self._backfill_category_counts()
+        self._migrate()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM tools').fetchone()[0]
+
+    def __contains__(self, slug: str) -> bool:
+        return self.connection.execute('SELECT 1 FROM tools WHERE slug = ?', (slug,)).fetchone() is not None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a bookkeeping value, or None if it was never set."""
+        row = self.connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write a bookkeeping value."""
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                (key, value)
+            )
+
+    def upsert_many(self, tools: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Insert or replace tools in a single transaction.
+
+        Date fields are stored normalized to timezone-aware UTC ISO strings,
+        and each tool's near-duplicate fingerprint is updated with it.
+
+        Args:
+            tools: (slug, tool) pairs
+
+        Returns:
+            Number of tools written
+        """
+        tools = [(slug, normalize_tool_dates(tool)) for slug, tool in tools]
+        rows = [self._row(slug, tool) for slug, tool in tools]
+        with self.connection:
+            self.connection.executemany(
+                """
+                INSERT INTO tools (slug, name, category, added_date, added_ts, last_updated, quality_score, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(slug) DO UPDATE SET
+                    name = excluded.name,
+                    category = excluded.category,
+                    added_date = excluded.added_date,
+                    added_ts = excluded.added_ts,
+                    last_updated = excluded.last_updated,
+                    quality_score = excluded.quality_score,
+                    data = excluded.data
+                """,
+                rows
+            )
+            self._write_fingerprints(tools)
+        return len(rows)
+
+    @staticmethod
+    def _row(slug: str, tool: Dict[str, Any]) -> tuple:
+        """Column values of a tool row."""
+        return (
+            slug,
+            tool['name'],
+            tool.get('category'),
+            tool.get('added_date'),
+            parse_timestamp(tool.get('added_date')),
+            tool.get('last_updated'),
+            tool.get('quality_score'),
+            json.dumps(tool)
+        )
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Get a tool by slug."""
+        row = self.connection.execute('SELECT data FROM tools WHERE slug = ?', (slug,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, slugs: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several tools by slug; unknown slugs are left out."""
+        slugs = list(slugs)
+        found = {}
+        # Stay well below SQLite's bound parameter limit
+        for start in range(0, len(slugs), 500):
+            batch = slugs[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            for slug, data in self.connection.execute(
+                f'SELECT slug, data FROM tools WHERE slug IN ({placeholders})', batch
+            ):
+                found[slug] = json.loads(data)
+        return found
+
+    def iter_tools(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (slug, tool) pairs in insertion order."""
+        for slug, data in self.connection.execute('SELECT slug, data FROM tools ORDER BY rowid'):
+            yield slug, json.loads(data)
+
+    def iter_slugs(self) -> Iterator[str]:
+        """Yield tool slugs in insertion order without decoding the tools."""
+        for (slug,) in self.connection.execute('SELECT slug FROM tools ORDER BY rowid'):
+            yield slug
+
+    def find_duplicate(self, fingerprint: Fingerprint, threshold: float = 0.5) -> Optional[str]:
+        """
+        Find a catalog tool that is a near-duplicate of fingerprint.
+
+        Candidates come from the URL key and LSH band indexes, so the cost
+        depends on the number of similar tools rather than the catalog size.
+
+        Returns:
+            Slug of the best match, or None
+        """
+        bands = fingerprint.band_keys()
+        placeholders = ','.join('?' * len(bands))
+        candidates = {
+            slug: Fingerprint.from_row(url, name, signature)
+            for slug, url, name, signature in self.connection.execute(
+                f"""
+                SELECT slug, url_key, name_key, signature FROM tool_fingerprints
+                WHERE slug IN (SELECT slug FROM tool_bands WHERE band IN ({placeholders}))
+                   OR (url_key = ? AND url_key != '')
+                """,
+                (*bands, fingerprint.url_key)
+            )
+        }
+        return best_match(fingerprint, candidates, threshold)
+
+    def is_known(self, digest: bytes) -> bool:
+        """Whether a content digest has been recorded."""
+        return self.connection.execute('SELECT 1 FROM known_content WHERE digest = ?', (digest,)).fetchone() is not None
+
+    def add_known(self, digests: Iterable[bytes]) -> List[bytes]:
+        """
+        Record content digests.
+
+        Returns:
+            The digests that were not recorded before
+        """
+        digests = list(digests)
+        existing = set()
+        for start in range(0, len(digests), 500):
+            batch = digests[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            existing.update(row[0] for row in self.connection.execute(
+                f'SELECT digest FROM known_content WHERE digest IN ({placeholders})', batch
+            ))
+        added = [digest for digest in digests if digest not in existing]
+        with self.connection:
+            self.connection.executemany('INSERT OR IGNORE INTO known_content (digest) VALUES (?)', [(d,) for d in added])
+        return added
+
+    def known_count(self) -> int:
+        """Number of recorded content digests."""
+        return self.connection.execute('SELECT COUNT(*) FROM known_content').fetchone()[0]
+
+    def iter_known(self) -> Iterator[bytes]:
+        """Yield every recorded content digest."""
+        for (digest,) in self.connection.execute('SELECT digest FROM known_content'):
+            yield digest
+
+    def is_rejected(self, digest: bytes, scorer: str) -> bool:
+        """Whether a content digest was rejected by the scorer with the given settings key."""
+        return self.connection.execute(
+            'SELECT 1 FROM rejected_content WHERE digest = ? AND scorer = ?', (digest, scorer)
+        ).fetchone() is not None
+
+    def add_rejected(self, digests: Iterable[bytes], scorer: str) -> None:
+        """Record content digests rejected by the scorer with the given settings key."""
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO rejected_content (digest, scorer) VALUES (?, ?)',
+                [(digest, scorer) for digest in digests]
+            )
+
+    def prune_rejected(self, scorer: str) -> int:
+        """
+        Forget rejections made with scorer settings other than the given key.
+
+        Returns:
+            Number of rejections removed
+        """
+        with self.connection:
+            return self.connection.execute('DELETE FROM rejected_content WHERE scorer != ?', (scorer,)).rowcount
+
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """Get the most recently added tools."""
+        return self._query('ORDER BY added_ts DESC, slug LIMIT ?', (limit,))
+
+    def top_rated(self, limit: int) -> List[Dict[str, Any]]:
+        """Get the highest scoring tools."""
+        return self._query('ORDER BY quality_score DESC, slug LIMIT ?', (limit,))
+
+    def by_category(self, category: str, limit: int = -1) -> List[Dict[str, Any]]:
+        """Get the tools of a category, highest scoring first."""
+        return self._query('WHERE category = ? ORDER BY quality_score DESC, slug LIMIT ?', (category, limit))
+
+    def added_between(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Get tools added in [start, end), oldest first."""
+        return self._query(
+            'WHERE added_ts >= ? AND added_ts < ? ORDER BY added_ts, slug',
+            (start.timestamp(), end.timestamp())
+        )
+
+    def count_added_since(self, timestamp: float) -> int:
+        """Count tools added strictly after timestamp, using the added_ts index."""
+        return self.connection.execute('SELECT COUNT(*) FROM tools WHERE added_ts > ?', (timestamp,)).fetchone()[0]
+
+    def categories(self) -> List[str]:
+        """Get the sorted list of categories."""
+        return [row[0] for row in self.connection.execute(
+            'SELECT category FROM category_counts ORDER BY category'
+        )]
+
+    def category_counts(self) -> Dict[str, int]:
+        """Get the number of tools per category, largest first."""
+        return dict(self.connection.execute(
+            'SELECT category, tools FROM category_counts ORDER BY tools DESC, category'
+        ))
+
+    def import_json(self, json_file: Path, batch_size: int = 1000) -> int:
+        """Stream tools from a legacy tools.json file into the store in batches."""
+        count = 0
+        try:
+            tools = iter_json_object(json_file)
+            while True:
+                batch = list(islice(tools, batch_size))
+                if not batch:
+                    break
+                count += self.upsert_many(batch)
+        except (FileNotFoundError, ValueError) as e:
+            logging.error(f"Error importing {json_file}: {e}")
+        logging.info(f"Imported {count} tools from {json_file}")
+        return count
+
+    def import_snapshot(self, snapshot_file: Path) -> int:
+        """
+        Load tools from a snapshot written by export_snapshot.
+
+        Returns:
+            Number of tools imported, 0 if the snapshot is missing or unreadable
+        """
+        try:
+            tools = read_snapshot(snapshot_file)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error importing {snapshot_file}: {e}")
+            return 0
+        count = self.upsert_many((slug, tool.to_dict()) for slug, tool in tools.items())
+        logging.info(f"Imported {count} tools from {snapshot_file}")
+        return count
+
+    def export_snapshot(self, snapshot_file: Path) -> int:
+        """
+        Write the catalog as a snapshot of Tool records.
+
+        Returns:
+            Number of tools exported
+        """
+        return write_snapshot(
+            snapshot_file,
+            ((slug, Tool.from_dict(tool)) for slug, tool in self.iter_tools())
+        )
+
+    def export_json(self, json_file: Path) -> int:
+        """
+        Write the catalog in the legacy tools.json format, one tool at a time.
+
+        Returns:
+            Number of tools exported
+        """
+        json_file = Path(json_file)
+        tmp_file = json_file.with_name(json_file.name + '.tmp')
+        count = 0
+        with open(tmp_file, 'w') as handle:
+            handle.write('{')
+            for slug, tool in self.iter_tools():
+                handle.write(',' if count else '')
+                handle.write(f'\n    {json.dumps(slug)}: ')
+                handle.write(json.dumps(tool, indent=4).replace('\n', '\n    '))
+                count += 1
+            handle.write('\n}' if count else '}')
+        tmp_file.replace(json_file)
+        return count
+
+    def _migrate(self) -> None:
+        """Bring rows written by older versions up to date."""
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version >= self.VERSION:
+            return
+        with self.connection:
+            if version < 1:
+                # Version 1: naive timestamps are rewritten as aware UTC
+                updates = []
+                for slug, data in self.connection.execute('SELECT slug, data FROM tools'):
+                    tool = json.loads(data)
+                    normalized = normalize_tool_dates(tool)
+                    if normalized is not tool:
+                        updates.append(self._row(slug, normalized))
+                self.connection.executemany(
+                    """
+                    UPDATE tools SET name = ?2, category = ?3, added_date = ?4, added_ts = ?5,
+                        last_updated = ?6, quality_score = ?7, data = ?8
+                    WHERE slug = ?1
+                    """,
+                    updates
+                )
+            if version < 2:
+                # Version 2: near-duplicate fingerprints for existing tools
+                self.connection.execute('DELETE FROM tool_fingerprints')
+                self.connection.execute('DELETE FROM tool_bands')
+                self._write_fingerprints(list(self.iter_tools()))
+            if version < 3:
+                # Version 3: quality rejections were recorded as known content and
+                # content hashes were stored inside tools. Known content restarts
+                # from the stored tools, so anything else is processed once more.
+                updates = []
+                digests = []
+                for slug, data in self.connection.execute('SELECT slug, data FROM tools'):
+                    tool = json.loads(data)
+                    if tool.pop('content_hash', None) is not None:
+                        updates.append((json.dumps(tool), slug))
+                    digests.append((bytes.fromhex(content_hash(tool)),))
+                self.connection.executemany('UPDATE tools SET data = ? WHERE slug = ?', updates)
+                self.connection.execute('DELETE FROM known_content')
+                self.connection.executemany('INSERT OR IGNORE INTO known_content (digest) VALUES (?)', digests)
+            self.connection.execute(f'PRAGMA user_version = {self.VERSION}')
+
+    def _write_fingerprints(self, tools: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Replace the fingerprints and band keys of tools (inside the caller's transaction)."""
+        fingerprints = [(slug, Fingerprint.of(tool)) for slug, tool in tools]
+        # Band rows are keyed by band, so stale ones are found through the old signatures
+        stale = []
+        slugs = [slug for slug, _ in fingerprints]
+        for start in range(0, len(slugs), 500):
+            batch = slugs[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            for slug, url, name, signature in self.connection.execute(
+                f'SELECT slug, url_key, name_key, signature FROM tool_fingerprints WHERE slug IN ({placeholders})',
+                batch
+            ):
+                stale.extend((band, slug) for band in Fingerprint.from_row(url, name, signature).band_keys())
+        self.connection.executemany('DELETE FROM tool_bands WHERE band = ? AND slug = ?', stale)
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO tool_fingerprints (slug, url_key, name_key, signature) VALUES (?, ?, ?, ?)',
+            [(slug, *fingerprint.to_row()) for slug, fingerprint in fingerprints]
+        )
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO tool_bands (band, slug) VALUES (?, ?)',
+            [(band, slug) for slug, fingerprint in fingerprints for band in fingerprint.band_keys()]
+        )
+
+    def _backfill_category_counts(self) -> None:
+        """Fill category_counts for databases created before it existed."""
+        empty = self.connection.execute(
+            'SELECT NOT EXISTS (SELECT 1 FROM category_counts) AND EXISTS (SELECT 1 FROM tools)'
+        ).fetchone()[0]
+        if empty:
+            with self.connection:
+                self.connection.execute(
+                    """
+                    INSERT INTO category_counts (category, tools)
+                    SELECT category, COUNT(*) FROM tools WHERE category IS NOT NULL GROUP BY category
+                    """
+                )
+
+    def _query(self, clause: str, params: tuple) -> List[Dict[str, Any]]:
+        """Run a SELECT over the tools table and decode the results."""
+        return [
+            json.loads(row[0])
+            for row in self.connection.execute(f'SELECT data FROM tools {clause}', params)
+        ]
+
+
+class LazyCatalog(Mapping):
+    """
+    Read-only slug -> tool mapping over a ToolStore.
+
+    Nothing is decoded up front: a tool is read from the database when it is
+    accessed, and values()/items() stream the catalog one tool at a time.
+    Reads always reflect the current contents of the store.
+    """
+
+    def __init__(self, store: ToolStore):
+        self.store = store
+
+    def __getitem__(self, slug: str) -> Dict[str, Any]:
+        tool = self.store.get(slug)
+        if tool is None:
+            raise KeyError(slug)
+        return tool
+
+    def __contains__(self, slug: object) -> bool:
+        return isinstance(slug, str) and slug in self.store
+
+    def __iter__(self) -> Iterator[str]:
+        return self.store.iter_slugs()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def items(self):
+        return _CatalogView(self.store.iter_tools, len(self.store))
+
+    def date_index(self) -> 'StoreDateIndex':
+        """Date queries answered by the store's indexes instead of a sort of the catalog."""
+        return StoreDateIndex(self.store)
+
+    def values(self):
+        return _CatalogView(lambda: (tool for _, tool in self.store.iter_tools()), len(self.store))
+
+
+class _CatalogView:
+    """Re-iterable view that streams from the store on every iteration."""
+
+    def __init__(self, iterate, length: int):
+        self._iterate = iterate
+        self._length = length
+
+    def __iter__(self):
+        return self._iterate()
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class StoreDateIndex:
+    """
+    DateIndex counterpart backed by the added_ts index of a ToolStore.
+
+    Only the rows asked for are read, so nothing is collected or sorted per
+    build. Undated tools sort last, as in DateIndex.
+    """
+
+    def __init__(self, store: ToolStore):
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """The newest `limit` tools."""
+        return self.store.latest(limit)
+
+    def count_since(self, timestamp: float) -> int:
+        """Number of tools strictly newer than timestamp."""
+        return self.store.count_added_since(timestamp)
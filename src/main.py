@@ -12,8 +12,12 @@ from utils.config import Config
 from utils.error_handler import ErrorHandler
 from utils.quality_scorer import QualityScorer
 from utils.performance_optimizer import PerformanceOptimizer
+from utils.pipeline import run_pipeline
+from utils.near_duplicates import ToolDeduplicator
+from utils.known_tools import content_hash
 from tools_discovery.crawler import ToolsDiscovery
 from github_publisher.publisher import GitHubPublisher
+from github_publisher.static_generator import precompile_templates
 from analytics.tracker import AnalyticsTracker
 import schedule
 import time
@@ -57,47 +61,57 @@ class AIToolsCurator:
             logging.info(f"Starting new {mode} cycle")
             
             if mode == 'discover':
-                # 1. Find new AI tools
-                print("🔍 Discovering new AI tools...")
-                new_tools = await self.performance_optimizer.optimize_task(
-                    self.tools_discovery.find_new_tools,
-                    priority=1
+                # Discover -> dedupe -> score -> persist, all stages running concurrently
+                print("🔍 Discovering, evaluating and storing new AI tools...")
+                stats = {}
+                stored_tools = await self.performance_optimizer.optimize_task(
+                    run_pipeline,
+                    priority=1,
+                    source=self.tools_discovery.iter_new_tools(),
+                    stages=[self._dedupe_tools, self._score_tools, self._persist_tools],
+                    maxsize=self.config.get('pipeline_queue_size', 64),
+                    stats=stats
                 )
                 
+                # Tools that got past deduplication are the new ones; the rest were known
+                new_tools = stats.get('_dedupe_tools', 0)
+                logging.info(f"Discovery pipeline: {stats}")
                 if not new_tools:
-                    print("No new tools found this cycle")
+                    print(f"No new tools found this cycle ({stats.get('source', 0)} already known)")
+                    self.publisher.known_tools.save()
                     return
                 
-                print(f"Found {len(new_tools)} new tools")
-                
-                # 2. Score and filter tools
-                print("⭐ Evaluating tool quality...")
-                quality_tools = []
-                for tool in new_tools:
-                    score_result = await self.performance_optimizer.optimize_task(
-                        self.quality_scorer.score_tool,
-                        priority=2,
-                        tool=tool
-                    )
-                    if score_result['passed_threshold']:
-                        tool['quality_score'] = score_result['overall_score']
-                        tool['quality_details'] = score_result
-                        quality_tools.append(tool)
-                
-                print(f"{len(quality_tools)} tools passed quality threshold")
+                print(f"Found {new_tools} new tools")
+                print(f"{len(stored_tools)} tools passed quality threshold")
+                if not stored_tools:
+                    # Nothing changed in the catalog, so there is nothing to publish
+                    self.publisher.known_tools.save()
+                    return
                 
-                # 3. Update GitHub repository
                 print("📤 Updating repository...")
                 await self.performance_optimizer.optimize_task(
-                    self.publisher.update_repository,
+                    self.publisher.finish_update,
                     priority=1,
-                    new_tools=quality_tools
+                    stored=len(stored_tools)
                 )
             
             elif mode == 'generate':
                 print("🏗️ Generating static site...")
                 await self.publisher.update_repository([])  # Generate site with existing tools
             
+            elif mode == 'export':
+                self.publisher.export_tools_data()
+                return
+            
+            elif mode == 'precompile':
+                print("⚙️ Precompiling templates...")
+                count = precompile_templates(
+                    self.config.get('templates_dir'),
+                    self.config.get('cache_dir') / 'templates'
+                )
+                print(f"Compiled {count} templates")
+                return
+            
             # 4. Track analytics
             analytics_report = await self.performance_optimizer.optimize_task(
                 self.analytics.get_performance_report,
@@ -109,15 +123,89 @@ class AIToolsCurator:
             print(f"\n❌ Error: {str(e)}")
             self.error_handler.handle_error(e, 'main', 'run_cycle')
 
+    async def _dedupe_tools(self, tools):
+        """
+        Pipeline stage: skip tools whose content was already processed or
+        rejected, drop near-duplicates found this cycle and merge those of
+        catalog tools.
+        
+        Yields (content_hash, tool) pairs; the hash travels alongside the
+        tool so it never ends up in stored data.
+        """
+        known_tools = self.publisher.known_tools
+        store = self.publisher.store
+        scorer = self.quality_scorer.settings_key
+        deduplicator = ToolDeduplicator(store, threshold=self.config.get('duplicate_threshold', 0.5))
+        unchanged = rejected = 0
+        dropped = []
+        async for tool in tools:
+            digest = content_hash(tool)
+            if digest in known_tools:
+                unchanged += 1
+                continue
+            if store.is_rejected(bytes.fromhex(digest), scorer):
+                rejected += 1
+                continue
+            resolved = deduplicator.resolve(tool)
+            if resolved is None:
+                dropped.append(digest)
+            else:
+                yield digest, resolved
+        # A dropped duplicate has nothing to add next time either
+        known_tools.add_many(dropped)
+        logging.info(f"Deduplication: {deduplicator.stats}, {unchanged} unchanged, {rejected} previously rejected")
+        print(f"⏭️ {unchanged} unchanged tools skipped, {rejected} previously rejected")
+        print(f"🧹 {deduplicator.stats['merged']} tools merged into existing entries, "
+              f"{deduplicator.stats['dropped']} duplicates dropped")
+
+    async def _score_tools(self, tools):
+        """Pipeline stage: score (content_hash, tool) pairs and pass on those above the quality threshold."""
+        store = self.publisher.store
+        scorer = self.quality_scorer.settings_key
+        # Rejections from other scoring rules or thresholds no longer hold
+        store.prune_rejected(scorer)
+        rejected = []
+        async for digest, tool in tools:
+            score_result = await self.quality_scorer.score_tool(tool)
+            if score_result['passed_threshold']:
+                tool['quality_score'] = score_result['overall_score']
+                tool['quality_details'] = score_result
+                yield digest, tool
+            else:
+                rejected.append(bytes.fromhex(digest))
+        # Unchanged content would be rejected again under the same settings, so it is not rescored
+        store.add_rejected(rejected, scorer)
+
+    async def _persist_tools(self, tools):
+        """Pipeline stage: write (content_hash, tool) pairs to the store in batches, yielding tools once stored."""
+        batch_size = self.config.get('persist_batch_size', 50)
+        batch = []
+        async for item in tools:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                for stored in self._store_batch(batch):
+                    yield stored
+                batch = []
+        if batch:
+            for stored in self._store_batch(batch):
+                yield stored
+
+    def _store_batch(self, batch):
+        """Store a batch of (content_hash, tool) pairs and return the tools."""
+        stored = [tool for _, tool in batch]
+        self.publisher.store_tools(stored, content_hashes=[digest for digest, _ in batch])
+        return stored
+
 async def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='AI Tools Curator')
-    parser.add_argument('--mode', choices=['discover', 'generate'], 
+    parser.add_argument('--mode', choices=['discover', 'generate', 'precompile', 'export'], 
                       default='discover', help='Operation mode')
     args = parser.parse_args()
     
     curator = AIToolsCurator()
     await curator.run_cycle(mode=args.mode)
+    curator.performance_optimizer.flush_metrics()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -2,13 +2,34 @@
 Tool discovery module for finding new AI tools from various sources.
 """
 
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any
+import time
+from pathlib import Path
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime, timezone
 
+from tools_discovery.http_cache import HTTPCache
+from tools_discovery.http_client import AsyncHTTPClient
+
 class ToolsDiscovery:
+    """
+    Finds new AI tools.
+    
+    With use_sample_data set the built-in sample tools are returned;
+    otherwise every configured listing source is fetched concurrently.
+    A source is a URL returning JSON, either a list of tools or an object
+    with a "tools" list; entries need at least a name and a url.
+    Sources come from DISCOVERY_SOURCES and from sources_file, a JSON list
+    of URLs or {"url": ..., "category": ...} objects. Responses are cached
+    under http_cache_dir and revalidated on later crawls.
+    """
+    
     def __init__(self, config):
         self.config = config
+        self.sources_file = Path(config.get('sources_file') or 'data/sources.json')
+        self.crawl_stats = {}
         current_time = datetime.now(timezone.utc).isoformat()
         
         self.sample_tools = [
@@ -115,16 +136,161 @@ class ToolsDiscovery:
         ]
 
     async def find_new_tools(self) -> List[Dict[str, Any]]:
-        """Discover new AI tools (currently using sample data)."""
+        """Discover new AI tools from sample data or the configured sources."""
+        tools = [tool async for tool in self.iter_new_tools()]
+        if self.config.get('use_sample_data', True):
+            print(f"\n🎉 Found {len(tools)} tools!")
+        return tools
+
+    async def iter_new_tools(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield new AI tools as they are discovered, from sample data or the configured sources."""
+        if not self.config.get('use_sample_data', True):
+            async for tool in self.iter_sources(self._load_sources()):
+                yield tool
+            return
+        
         logging.info("Using sample data for tool discovery")
         print("📚 Using sample data for development...")
         
         # Simulate discovery process
-        discovered_tools = []
         for tool in self.sample_tools:
             logging.info(f"Found tool: {tool['name']}")
             print(f"✨ Discovered: {tool['name']} ({tool['category']})")
-            discovered_tools.append(tool)
+            yield tool
+
+    async def crawl_sources(self, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fetch all listing sources concurrently over pooled connections.
+        
+        Args:
+            sources: Source dicts with a 'url' and an optional default 'category'
             
-        print(f"\n🎉 Found {len(discovered_tools)} tools!")
-        return discovered_tools
\ No newline at end of file
+        Returns:
+            Tools found across all sources
+        """
+        return [tool async for tool in self.iter_sources(sources)]
+
+    async def iter_sources(self, sources: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch all listing sources concurrently, yielding each source's tools as soon as it arrives.
+        
+        Args:
+            sources: Source dicts with a 'url' and an optional default 'category'
+        """
+        print(f"🌐 Crawling {len(sources)} sources...")
+        start = time.perf_counter()
+        found = failed = 0
+        cache = HTTPCache(
+            self.config.get('http_cache_dir') or 'data/http_cache',
+            max_bytes=self.config.get('http_cache_max_mb', 64) * 1024 * 1024,
+            max_age=self.config.get('http_cache_max_age_days', 30) * 86400
+        )
+        try:
+            async with AsyncHTTPClient(
+                max_connections=self.config.get('crawl_concurrency', 64),
+                per_host=self.config.get('crawl_per_host', 4),
+                timeout=self.config.get('crawl_timeout', 10.0),
+                cache=cache
+            ) as client:
+                fetches = [asyncio.ensure_future(self._fetch_source(client, source)) for source in sources]
+                try:
+                    for fetch in asyncio.as_completed(fetches):
+                        tools = await fetch
+                        if tools is None:
+                            failed += 1
+                            continue
+                        for tool in tools:
+                            found += 1
+                            yield tool
+                finally:
+                    # Stop outstanding fetches if the consumer gave up early
+                    for fetch in fetches:
+                        fetch.cancel()
+                    await asyncio.gather(*fetches, return_exceptions=True)
+                self.crawl_stats = dict(client.stats)
+        finally:
+            # Pending cache writes and eviction happen once, here
+            cache.close()
+        self.crawl_stats['cache'] = dict(cache.stats)
+        
+        self.crawl_stats.update({
+            'sources': len(sources),
+            'failed_sources': failed,
+            'tools': found,
+            'seconds': round(time.perf_counter() - start, 3)
+        })
+        logging.info(f"Crawl finished: {self.crawl_stats}")
+        print(f"\n🎉 Found {found} tools from {len(sources)} sources "
+              f"in {self.crawl_stats['seconds']}s!")
+
+    async def _fetch_source(self, client: AsyncHTTPClient, source: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one listing source; returns None if it could not be read."""
+        url = source['url']
+        try:
+            response = await client.get(url, headers={'Accept': 'application/json'})
+            if not response.ok:
+                logging.warning(f"Source {url} returned HTTP {response.status}")
+                return None
+            data = response.json()
+        except asyncio.TimeoutError:
+            logging.warning(f"Timed out fetching source {url}")
+            return None
+        except (OSError, ValueError, EOFError) as e:
+            # EOFError covers asyncio.IncompleteReadError from truncated bodies
+            logging.warning(f"Error fetching source {url}: {e!r}")
+            return None
+        
+        entries = data.get('tools', []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            logging.warning(f"Source {url} did not return a tool list")
+            return None
+        
+        tools = []
+        limit = self.config.get('max_tools_per_source', 10)
+        for entry in entries:
+            if len(tools) >= limit:
+                break
+            tool = self._normalize_tool(entry, source)
+            if tool:
+                logging.info(f"Found tool: {tool['name']} ({url})")
+                tools.append(tool)
+        return tools
+
+    def _normalize_tool(self, entry: Any, source: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Turn a listing entry into a tool dict, or None if it lacks a name or URL."""
+        if not isinstance(entry, dict):
+            return None
+        name, url = entry.get('name'), entry.get('url')
+        if not isinstance(name, str) or not name.strip() or not isinstance(url, str) or not url.strip():
+            return None
+        
+        now = datetime.now(timezone.utc).isoformat()
+        features = entry.get('features') or []
+        return {
+            'name': name.strip(),
+            'description': str(entry.get('description') or '').strip(),
+            'url': url.strip(),
+            'category': entry.get('category') or source.get('category') or 'Uncategorized',
+            'features': [str(feature) for feature in features] if isinstance(features, list) else [],
+            'pricing': entry.get('pricing') or 'Unknown',
+            'added_date': now,
+            'last_updated': now,
+            'source': source['url']
+        }
+
+    def _load_sources(self) -> List[Dict[str, Any]]:
+        """Read listing sources from the config and the sources file."""
+        sources = [{'url': url} for url in self.config.get('discovery_sources') or []]
+        if self.sources_file.exists():
+            try:
+                for source in json.loads(self.sources_file.read_text()):
+                    sources.append(source if isinstance(source, dict) else {'url': source})
+            except (json.JSONDecodeError, TypeError) as e:
+                logging.error(f"Error loading {self.sources_file}: {e}")
+        
+        # Keep the first occurrence of each URL
+        unique = {}
+        for source in sources:
+            if source.get('url'):
+                unique.setdefault(source['url'], source)
+        return list(unique.values())
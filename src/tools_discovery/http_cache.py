@@ -0,0 +1,292 @@
+"""
+On-disk HTTP response cache for the discovery crawler.
+
+Responses are stored in a SQLite database with their validators (ETag and
+Last-Modified) and a freshness deadline taken from Cache-Control max-age or
+Expires. Fresh entries are served without a request, stale ones are
+revalidated with a conditional GET, and the cache is kept under a size and
+age budget by evicting the least recently used entries.
+
+Lookups are single indexed reads. Everything that writes (new responses,
+revalidations, last-access times, eviction) is buffered in memory and
+written in one transaction by flush(), normally once per crawl, so the
+crawl's event loop never waits on a commit per request.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from tools_discovery.http_client import HTTPResponse
+
+# Bump to drop caches written in an older layout (it is only a cache)
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    vary TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A cached response, its freshness deadline and the request headers it varies on."""
+    response: HTTPResponse
+    expires_at: float
+    vary: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if 'etag' in self.response.headers:
+            headers['If-None-Match'] = self.response.headers['etag']
+        if 'last-modified' in self.response.headers:
+            headers['If-Modified-Since'] = self.response.headers['last-modified']
+        return headers
+
+
+def freshness_deadline(headers: Dict[str, str], now: float) -> Optional[float]:
+    """
+    Epoch time until which a response may be served without revalidation.
+
+    Returns:
+        None if the response must not be stored (no-store), otherwise the
+        deadline (now for responses without explicit freshness)
+    """
+    directives = {}
+    for part in headers.get('cache-control', '').lower().split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name] = value.strip('"')
+
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return now
+    if 'max-age' in directives:
+        try:
+            return now + max(0, int(directives['max-age']))
+        except ValueError:
+            return now
+    if 'expires' in headers:
+        try:
+            return parsedate_to_datetime(headers['expires']).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now
+
+
+def vary_key(response_headers: Dict[str, str], request_headers: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """
+    Request header values a response varies on.
+
+    Returns:
+        Lowercase header name -> request value, or None for 'Vary: *'
+        (the response cannot be reused for any other request)
+    """
+    names = [name.strip().lower() for name in response_headers.get('vary', '').split(',') if name.strip()]
+    if '*' in names:
+        return None
+    request = {name.lower(): value for name, value in request_headers.items()}
+    return {name: request.get(name, '') for name in names}
+
+
+class HTTPCache:
+    """
+    SQLite-backed cache of GET responses keyed by URL.
+
+    Attributes:
+        db_file: Path of the cache database
+        max_bytes: Total body size kept before least recently used entries are evicted
+        max_age: Seconds since last use after which entries are dropped
+        stats: hits (served fresh), revalidated (304), misses, stores, evictions
+            and bytes_saved (body bytes not downloaded)
+    """
+
+    # Pending bodies held in memory before an early flush
+    FLUSH_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 64 * 1024 * 1024, max_age: float = 30 * 86400):
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_file = cache_dir / 'responses.db'
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bytes_saved': 0}
+        self.connection = sqlite3.connect(str(self.db_file))
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            with self.connection:
+                self.connection.execute('DROP TABLE IF EXISTS responses')
+                self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.connection.executescript(SCHEMA)
+
+        # Writes waiting for flush()
+        self._stores: Dict[str, tuple] = {}
+        self._updates: Dict[str, tuple] = {}
+        self._touched: Dict[str, float] = {}
+        self._pending_bytes = 0
+
+    def close(self) -> None:
+        """Write pending changes and close the cache database."""
+        self.flush()
+        self.connection.close()
+
+    def lookup(self, url: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        Get the cached entry for a request, fresh or not.
+
+        Entries whose Vary'd request headers differ from request_headers are
+        treated as absent.
+        """
+        row = self._stores.get(url)
+        if row is not None:
+            status, headers, vary, body, expires_at = row[1], row[2], row[3], row[4], row[7]
+        else:
+            row = self.connection.execute(
+                'SELECT status, headers, vary, body, expires_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            status, headers, vary, body, expires_at = row
+        if url in self._updates:
+            headers, expires_at = self._updates[url][:2]
+
+        entry = CachedResponse(HTTPResponse(url, status, json.loads(headers), body), expires_at, json.loads(vary))
+        request = {name.lower(): value for name, value in (request_headers or {}).items()}
+        if any(request.get(name, '') != value for name, value in entry.vary.items()):
+            return None
+        return entry
+
+    def hit(self, url: str, entry: CachedResponse) -> HTTPResponse:
+        """Record that a fresh entry was served without a request."""
+        self.stats['hits'] += 1
+        self.stats['bytes_saved'] += len(entry.response.body)
+        self._touched[url] = time.time()
+        return entry.response
+
+    def miss(self) -> None:
+        """Record a request that had to download the body."""
+        self.stats['misses'] += 1
+
+    def revalidate(self, url: str, entry: CachedResponse, headers: Dict[str, str]) -> HTTPResponse:
+        """
+        Refresh an entry after a 304 Not Modified and return the cached response.
+
+        Headers sent with the 304 (new validators, new max-age) replace the
+        stored ones.
+        """
+        self.stats['revalidated'] += 1
+        self.stats['bytes_saved'] += len(entry.response.body)
+        merged = {**entry.response.headers, **headers}
+        # Body-describing headers belong to the stored body, not to the 304
+        for name in ('content-length', 'content-encoding', 'transfer-encoding'):
+            if name in entry.response.headers:
+                merged[name] = entry.response.headers[name]
+        now = time.time()
+        expires_at = freshness_deadline(merged, now)
+        self._updates[url] = (json.dumps(merged), expires_at if expires_at is not None else now)
+        self._touched[url] = now
+        return HTTPResponse(entry.response.url, entry.response.status, merged, entry.response.body)
+
+    def store(self, url: str, response: HTTPResponse, request_headers: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Queue a 200 response for storage unless it forbids it.
+
+        Returns:
+            True if the response will be stored
+        """
+        if response.status != 200:
+            return False
+        now = time.time()
+        expires_at = freshness_deadline(response.headers, now)
+        if expires_at is None:
+            return False
+        if expires_at <= now and 'etag' not in response.headers and 'last-modified' not in response.headers:
+            # Neither fresh nor revalidatable: storing it could never save a download
+            return False
+        vary = vary_key(response.headers, request_headers or {})
+        if vary is None:
+            return False
+
+        self._stores[url] = (
+            url, response.status, json.dumps(response.headers), json.dumps(vary), response.body,
+            len(response.body), now, expires_at, now
+        )
+        self._updates.pop(url, None)
+        self._touched.pop(url, None)
+        self._pending_bytes += len(response.body)
+        self.stats['stores'] += 1
+        if self._pending_bytes > self.FLUSH_BYTES:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """Write queued responses, revalidations and access times in one transaction, then evict."""
+        with self.connection:
+            self.connection.executemany(
+                """
+                INSERT OR REPLACE INTO responses
+                    (url, status, headers, vary, body, size, stored_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                self._stores.values()
+            )
+            self.connection.executemany(
+                'UPDATE responses SET headers = ?, expires_at = ? WHERE url = ?',
+                [(headers, expires_at, url) for url, (headers, expires_at) in self._updates.items()]
+            )
+            self.connection.executemany(
+                'UPDATE responses SET last_access = ? WHERE url = ?',
+                [(last_access, url) for url, last_access in self._touched.items()]
+            )
+            removed = self._evict()
+        self._stores.clear()
+        self._updates.clear()
+        self._touched.clear()
+        self._pending_bytes = 0
+        if removed:
+            self.stats['evictions'] += removed
+            logging.info(f"Evicted {removed} entries from the HTTP cache")
+
+    def _evict(self) -> int:
+        """
+        Drop entries unused for longer than max_age, then least recently used
+        entries until the total size fits max_bytes (inside flush's transaction).
+
+        Returns:
+            Number of entries removed
+        """
+        cursor = self.connection.execute('DELETE FROM responses WHERE last_access < ?', (time.time() - self.max_age,))
+        removed = cursor.rowcount
+        total = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total > self.max_bytes:
+            doomed = []
+            for url, size in self.connection.execute('SELECT url, size FROM responses ORDER BY last_access'):
+                if total <= self.max_bytes:
+                    break
+                doomed.append((url,))
+                total -= size
+            self.connection.executemany('DELETE FROM responses WHERE url = ?', doomed)
+            removed += len(doomed)
+        return removed
@@ -0,0 +1,307 @@
+"""
+Asynchronous HTTP/1.1 client for the discovery crawler.
+
+Built on asyncio streams so it needs no third-party packages. Connections
+are kept alive and pooled per host; a global cap and a per-host cap bound
+how many requests are in flight, and every request runs under a timeout.
+GETs can go through an HTTPCache to reuse and revalidate earlier responses.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+
+@dataclass
+class HTTPResponse:
+    """A fully read HTTP response."""
+    url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b''
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self, encoding: str = 'utf-8') -> str:
+        return self.body.decode(encoding, errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class AsyncHTTPClient:
+    """
+    Pooled keep-alive HTTP client with concurrency limits.
+
+    Usage:
+        async with AsyncHTTPClient(max_connections=64, per_host=4) as client:
+            response = await client.get('https://example.com/tools.json')
+
+    Attributes:
+        max_connections: Requests in flight across all hosts
+        per_host: Requests in flight (and idle connections kept) per host
+        timeout: Seconds allowed for a whole request, connection included
+        connect_timeout: Seconds allowed to open a connection
+        cache: Optional HTTPCache consulted by get()
+        stats: Request and connection counters
+    """
+
+    MAX_REDIRECTS = 5
+    MAX_BODY_BYTES = 10 * 1024 * 1024
+    USER_AGENT = 'AIToolsCurator/2.0 (+https://github.com/TeddyM94/ai-tools-curator)'
+
+    def __init__(self, max_connections: int = 64, per_host: int = 4, timeout: float = 10.0,
+                 connect_timeout: float = 5.0, user_agent: str = USER_AGENT, cache=None):
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.user_agent = user_agent
+        self.cache = cache
+        self.stats = {'requests': 0, 'connections_opened': 0, 'connections_reused': 0, 'errors': 0}
+        self._global_limit = asyncio.Semaphore(max_connections)
+        self._host_limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._ssl_context = ssl.create_default_context()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """
+        GET a URL, following redirects.
+
+        With a cache, a fresh cached response is returned without a request
+        and a stale one is revalidated with If-None-Match / If-Modified-Since;
+        a 304 then yields the cached body.
+
+        Raises:
+            asyncio.TimeoutError: If the request does not finish in time
+            ConnectionError, OSError: On network failures
+            asyncio.IncompleteReadError: If the server closes the connection mid-body
+            ValueError: On unsupported URLs or malformed responses
+        """
+        if self.cache is None:
+            return await self._follow(url, headers or {})
+
+        headers = headers or {}
+        cached = self.cache.lookup(url, headers)
+        if cached is not None and cached.fresh:
+            return self.cache.hit(url, cached)
+        request_headers = {**headers, **(cached.validators() if cached else {})}
+        response = await self._follow(url, request_headers)
+        if response.status == 304 and cached is not None:
+            return self.cache.revalidate(url, cached, response.headers)
+        self.cache.miss()
+        self.cache.store(url, response, headers)
+        return response
+
+    async def _follow(self, url: str, headers: Dict[str, str]) -> HTTPResponse:
+        """GET a URL, following up to MAX_REDIRECTS redirects."""
+        for _ in range(self.MAX_REDIRECTS + 1):
+            response = await self.request('GET', url, headers)
+            location = response.headers.get('location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            return response
+        raise ValueError(f"Too many redirects fetching {url}")
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """Send a single request (no redirect handling) within the concurrency limits."""
+        key, target = self._split(url)
+        host_limit = self._host_limits.get(key)
+        if host_limit is None:
+            host_limit = self._host_limits[key] = asyncio.Semaphore(self.per_host)
+
+        # Take the host slot first so a request waiting on a busy host does not hold a global slot
+        async with host_limit, self._global_limit:
+            self.stats['requests'] += 1
+            try:
+                return await asyncio.wait_for(self._send(key, method, target, url, headers or {}), self.timeout)
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    def _split(self, url: str) -> Tuple[Tuple[str, str, int], str]:
+        """Pool key (scheme, host, port) and request target of a URL."""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        target = parts.path or '/'
+        if parts.query:
+            target += f'?{parts.query}'
+        return (parts.scheme, parts.hostname, port), target
+
+    async def _send(self, key, method: str, target: str, url: str, headers: Dict[str, str]) -> HTTPResponse:
+        """Send a request over a pooled connection, retrying once if a reused one went stale."""
+        reader, writer, reused = await self._acquire(key)
+        try:
+            return await self._exchange(key, reader, writer, method, target, url, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            if not reused:
+                raise
+        except BaseException:
+            writer.close()
+            raise
+        # The server closed an idle keep-alive connection; try once on a fresh one
+        reader, writer, _ = await self._acquire(key, fresh=True)
+        try:
+            return await self._exchange(key, reader, writer, method, target, url, headers)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _acquire(self, key, fresh: bool = False):
+        """Get an idle pooled connection for a host, or open a new one."""
+        idle = self._idle.get(key)
+        while idle and not fresh:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                self.stats['connections_reused'] += 1
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl_context if scheme == 'https' else None),
+            self.connect_timeout
+        )
+        self.stats['connections_opened'] += 1
+        return reader, writer, False
+
+    def _release(self, key, reader, writer) -> None:
+        """Return a connection to the pool, keeping at most per_host idle ones."""
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.per_host and not writer.is_closing():
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def _exchange(self, key, reader, writer, method: str, target: str, url: str,
+                        headers: Dict[str, str]) -> HTTPResponse:
+        """Write one request and read its response."""
+        scheme, host, port = key
+        default_port = 443 if scheme == 'https' else 80
+        request_headers = {
+            'Host': host if port == default_port else f'{host}:{port}',
+            'User-Agent': self.user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            **headers
+        }
+        lines = [f'{method} {target} HTTP/1.1'] + [f'{name}: {value}' for name, value in request_headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError(f"Connection closed before response from {url}")
+        try:
+            version, status, *_ = status_line.decode('latin-1').split(None, 2)
+            status = int(status)
+        except ValueError:
+            raise ValueError(f"Malformed status line from {url}: {status_line!r}")
+
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        reusable = version == 'HTTP/1.1' and response_headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in response_headers.get('transfer-encoding', '').lower():
+            body = await self._read_chunked(reader, url)
+        elif 'content-length' in response_headers:
+            length = int(response_headers['content-length'])
+            if length > self.MAX_BODY_BYTES:
+                raise ValueError(f"Response from {url} is too large ({length} bytes)")
+            body = await reader.readexactly(length)
+        else:
+            body = await reader.read(self.MAX_BODY_BYTES + 1)
+            if len(body) > self.MAX_BODY_BYTES:
+                raise ValueError(f"Response from {url} is too large")
+            reusable = False
+
+        if reusable:
+            self._release(key, reader, writer)
+        else:
+            writer.close()
+
+        encoding = response_headers.get('content-encoding', '').lower()
+        if encoding in ('gzip', 'deflate') and body:
+            body = self._decompress(body, encoding, url)
+        return HTTPResponse(url=url, status=status, headers=response_headers, body=body)
+
+    async def _read_chunked(self, reader: asyncio.StreamReader, url: str) -> bytes:
+        """Read a chunked transfer-encoded body, trailers included."""
+        chunks = []
+        total = 0
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+            except ValueError:
+                raise ValueError(f"Malformed chunk size from {url}: {size_line!r}")
+            if size == 0:
+                break
+            total += size
+            if total > self.MAX_BODY_BYTES:
+                raise ValueError(f"Response from {url} is too large")
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        # Trailers end with an empty line
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        return b''.join(chunks)
+
+    def _decompress(self, body: bytes, encoding: str, url: str) -> bytes:
+        """
+        Undo gzip or deflate content encoding.
+
+        The output is capped at MAX_BODY_BYTES as it is produced, so a small
+        compressed body cannot expand without limit in memory.
+
+        Raises:
+            ValueError: If the decoded body is larger than MAX_BODY_BYTES
+        """
+        limit = self.MAX_BODY_BYTES + 1
+        try:
+            if encoding == 'gzip':
+                decoded = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(body, limit)
+            else:
+                try:
+                    decoded = zlib.decompressobj().decompress(body, limit)
+                except zlib.error:
+                    # Some servers send raw deflate without the zlib header
+                    decoded = zlib.decompressobj(-zlib.MAX_WBITS).decompress(body, limit)
+        except zlib.error as e:
+            logging.warning(f"Could not decode {encoding} body from {url}: {e}")
+            return body
+        if len(decoded) > self.MAX_BODY_BYTES:
+            raise ValueError(f"Decoded response from {url} is too large")
+        return decoded
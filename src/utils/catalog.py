@@ -0,0 +1,86 @@
+"""
+Streaming reader for the tools.json catalog format.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_object(path: Path, chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield the (key, value) pairs of a top-level JSON object one at a time.
+
+    The file is read in chunks and each value is decoded as soon as it is
+    complete, so memory use is bounded by the largest single entry rather
+    than the size of the file.
+
+    Raises:
+        ValueError: If the file is not a JSON object
+    """
+    with open(path, 'r', encoding='utf-8') as handle:
+        buffer = ''
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            """Read another chunk, dropping what has already been consumed."""
+            nonlocal buffer, position, eof
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def next_char() -> str:
+            """Skip whitespace and return the next character without consuming it."""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in _WHITESPACE:
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not fill():
+                    return ''
+
+        def decode() -> Any:
+            """Decode the next complete JSON value, reading more input as needed."""
+            nonlocal position
+            while True:
+                try:
+                    value, end = _decoder.raw_decode(buffer, position)
+                    # A value touching the end of the buffer (e.g. a number) may continue
+                    if end < len(buffer) or eof:
+                        position = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        if next_char() != '{':
+            raise ValueError(f"{path} does not contain a JSON object")
+        position += 1
+
+        if next_char() == '}':
+            return
+        while True:
+            key = decode()
+            if next_char() != ':':
+                raise ValueError(f"Expected ':' after key {key!r} in {path}")
+            position += 1
+            next_char()
+            yield key, decode()
+
+            separator = next_char()
+            position += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' after value of {key!r} in {path}")
+            next_char()
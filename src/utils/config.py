@@ -16,13 +16,26 @@ class Config:
             'site_title': os.getenv('SITE_TITLE', 'AI Tools Curator'),
             'site_description': os.getenv('SITE_DESCRIPTION', 'Discover the best AI tools'),
             'base_url': os.getenv('BASE_URL', 'https://ai-tools-curator.github.io'),
+            'category_page_size': int(os.getenv('CATEGORY_PAGE_SIZE', 48)),
         }
         
         # Discovery settings
         self.discovery_settings = {
             'max_tools_per_source': int(os.getenv('MAX_TOOLS_PER_SOURCE', 10)),
             'min_quality_score': float(os.getenv('MIN_QUALITY_SCORE', 0.6)),
-            'use_sample_data': os.getenv('USE_SAMPLE_DATA', 'True').lower() == 'true'
+            'use_sample_data': os.getenv('USE_SAMPLE_DATA', 'True').lower() == 'true',
+            'sources_file': Path(os.getenv('SOURCES_FILE', 'data/sources.json')),
+            'discovery_sources': [url.strip() for url in os.getenv('DISCOVERY_SOURCES', '').split(',') if url.strip()],
+            'crawl_concurrency': int(os.getenv('CRAWL_CONCURRENCY', 64)),
+            'crawl_per_host': int(os.getenv('CRAWL_PER_HOST', 4)),
+            'crawl_timeout': float(os.getenv('CRAWL_TIMEOUT', 10.0)),
+            'http_cache_dir': Path(os.getenv('HTTP_CACHE_DIR', 'data/http_cache')),
+            'http_cache_max_mb': int(os.getenv('HTTP_CACHE_MAX_MB', 64)),
+            'http_cache_max_age_days': int(os.getenv('HTTP_CACHE_MAX_AGE_DAYS', 30)),
+            'pipeline_queue_size': int(os.getenv('PIPELINE_QUEUE_SIZE', 64)),
+            'persist_batch_size': int(os.getenv('PERSIST_BATCH_SIZE', 50)),
+            'duplicate_threshold': float(os.getenv('DUPLICATE_THRESHOLD', 0.5)),
+            'known_tools_capacity': int(os.getenv('KNOWN_TOOLS_CAPACITY', 100000))
         }
         
         # System settings
@@ -32,7 +45,15 @@ class Config:
             'data_dir': Path('data'),
             'docs_dir': Path('docs'),
             'templates_dir': Path('templates'),
-            'max_retries': int(os.getenv('MAX_RETRIES', 3))  # Added this
+            'cache_dir': Path(os.getenv('CACHE_DIR', '.cache')),
+            'max_retries': int(os.getenv('MAX_RETRIES', 3)),  # Added this
+            'analytics_storage': os.getenv('ANALYTICS_STORAGE', 'wal').lower(),
+            'export_tools_json': os.getenv('EXPORT_TOOLS_JSON', 'False').lower() == 'true',
+            'incremental_build': os.getenv('INCREMENTAL_BUILD', 'True').lower() == 'true',
+            'render_workers': int(os.getenv('RENDER_WORKERS', 1)),
+            'render_batch_size': int(os.getenv('RENDER_BATCH_SIZE', 512)),
+            'precompress': os.getenv('PRECOMPRESS', 'False').lower() == 'true',
+            'compress_workers': int(os.getenv('COMPRESS_WORKERS', os.cpu_count() or 1))
         }
         
         # GitHub settings
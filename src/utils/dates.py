@@ -0,0 +1,94 @@
+"""
+Timestamp helpers for the tool catalog.
+
+Catalog dates are stored as timezone-aware ISO strings in UTC. Older
+entries were written with naive datetime.now(), i.e. the host's local time,
+and were compared against naive local times. They are now read as UTC
+instead. This is a deliberate change, so every date compares on one
+timeline: on a host that is not on UTC, an old entry shifts by the UTC
+offset, and a tool added near midnight can move in or out of "this week"
+counts and date filters.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DATE_FIELDS = ('added_date', 'last_updated')
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO date string (or pass a datetime through) as an aware UTC datetime."""
+    if isinstance(value, datetime):
+        date = value
+    elif isinstance(value, str) and value:
+        try:
+            date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    else:
+        return None
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Convert an ISO date string to an epoch timestamp; naive times are taken as UTC."""
+    date = parse_datetime(value)
+    return date.timestamp() if date else None
+
+
+def normalize_timestamp(value: Any) -> Any:
+    """Rewrite an ISO date as an aware UTC ISO string; unparseable values are returned unchanged."""
+    date = parse_datetime(value)
+    return date.isoformat() if date else value
+
+
+def normalize_tool_dates(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the tool with normalized date fields, copying it only if something changes."""
+    changes = {}
+    for field in DATE_FIELDS:
+        if field in tool:
+            normalized = normalize_timestamp(tool[field])
+            if normalized != tool[field]:
+                changes[field] = normalized
+    return {**tool, **changes} if changes else tool
+
+
+class DateIndex:
+    """
+    Tools ordered by a timestamp, newest first, for catalogs held in memory.
+
+    Answers "latest N" by slicing and "added since" by binary search, but
+    building it collects and sorts every item. The site generator uses it
+    only for plain dict catalogs; a store-backed catalog answers the same
+    queries from the store's added_ts index (tool_store.StoreDateIndex).
+    """
+
+    def __init__(self, items: Iterable[Any], key: Callable[[Any], Optional[float]]):
+        dated = [(key(item), item) for item in items]
+        # Newest first; undated items go last. The sort is stable, so ties keep input order.
+        dated.sort(key=lambda pair: pair[0] if pair[0] is not None else float('-inf'), reverse=True)
+        self._items = [item for _, item in dated]
+        # Negated timestamps ascend, which is what bisect needs
+        self._keys = [-ts if ts is not None else float('inf') for ts, _ in dated]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def latest(self, limit: int) -> List[Any]:
+        """The newest `limit` items."""
+        return self._items[:limit]
+
+    def count_since(self, timestamp: float) -> int:
+        """Number of items strictly newer than timestamp."""
+        return bisect_left(self._keys, -timestamp)
+
+    def since(self, timestamp: float) -> List[Any]:
+        """Items strictly newer than timestamp, newest first."""
+        return self._items[:self.count_since(timestamp)]
+
+    def between(self, start: float, end: float) -> List[Any]:
+        """Items with start <= timestamp < end, newest first."""
+        return self._items[bisect_right(self._keys, -end):bisect_right(self._keys, -start)]
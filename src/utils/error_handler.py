@@ -1,10 +1,28 @@
+import atexit
 import logging
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+import time
 import traceback
 import json
 
 class ErrorHandler:
+    """
+    Logs errors and keeps sliding-window error counters.
+    
+    Counts are kept in memory per (component, operation) as a queue of
+    fixed-size time buckets, expired by age and written to
+    logs/error_counts.json periodically and at exit rather than on every error.
+    """
+    
+    BUCKET_SECONDS = 300  # Width of a counter bucket
+    WINDOW_HOURS = 24  # Age after which counts expire
+    FLUSH_INTERVAL = 30.0  # Seconds between counter flushes
+    # Components that call handle_error; used to split old component_operation
+    # keys, since operation names may contain underscores
+    COMPONENTS = ('main',)
+    
     def __init__(self, config):
         self.config = config
         self.log_dir = Path('logs')
@@ -17,12 +35,26 @@ class ErrorHandler:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         
-        self.error_counts = self._load_error_counts()
+        self.counts_file = self.log_dir / 'error_counts.json'
+        self._buckets = {}  # (component, operation) -> deque of [bucket_start, count]
+        self._totals = {}  # (component, operation) -> count within the window
+        self._dirty = False
+        self._load_error_counts()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush_error_counts)
+    
+    @property
+    def error_counts(self):
+        """Errors within the window, keyed by component_operation"""
+        self._expire(time.time() - self.WINDOW_HOURS * 3600)
+        return {f"{component}_{operation}": count for (component, operation), count in self._totals.items()}
     
     def handle_error(self, error, component, operation):
         """Handle errors with retry logic and logging"""
-        error_key = f"{component}_{operation}"
-        self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
+        key = (component, operation)
+        now = time.time()
+        self._expire(now - self.WINDOW_HOURS * 3600, key)
+        count = self._increment(key, now)
         
         error_data = {
             'timestamp': str(datetime.now()),
@@ -31,54 +63,120 @@ class ErrorHandler:
             'error_type': type(error).__name__,
             'error_message': str(error),
             'traceback': traceback.format_exc(),
-            'count': self.error_counts[error_key]
+            'count': count
         }
         
         # Log the error
         logging.error(f"Error in {component} during {operation}: {str(error)}")
         
-        # Save error counts
-        self._save_error_counts()
+        # Save error counts now and then, not on every error
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush_error_counts()
         
         # Determine if operation should be retried
-        if self.error_counts[error_key] <= self.config.MAX_RETRIES:
+        if count <= self.config.MAX_RETRIES:
             return 'retry'
         
         return 'abort'
     
+    def _increment(self, key, now):
+        """Add one error to the current bucket of a counter and return its window total"""
+        bucket_start = int(now // self.BUCKET_SECONDS) * self.BUCKET_SECONDS
+        buckets = self._buckets.setdefault(key, deque())
+        if buckets and buckets[-1][0] == bucket_start:
+            buckets[-1][1] += 1
+        else:
+            buckets.append([bucket_start, 1])
+        self._totals[key] = self._totals.get(key, 0) + 1
+        self._dirty = True
+        return self._totals[key]
+    
+    def _expire(self, cutoff, key=None):
+        """Drop buckets that ended before cutoff, for one counter or all of them"""
+        keys = [key] if key is not None else list(self._buckets)
+        for key in keys:
+            buckets = self._buckets.get(key)
+            if not buckets:
+                continue
+            while buckets and buckets[0][0] + self.BUCKET_SECONDS <= cutoff:
+                self._totals[key] -= buckets.popleft()[1]
+                self._dirty = True
+            if not buckets:
+                del self._buckets[key]
+                del self._totals[key]
+    
     def _load_error_counts(self):
         """Load existing error counts"""
         try:
-            with open(self.log_dir / 'error_counts.json', 'r') as f:
-                return json.load(f)
+            with open(self.counts_file, 'r') as f:
+                data = json.load(f)
         except FileNotFoundError:
-            return {}
+            return
+        except json.JSONDecodeError as e:
+            logging.error(f"Error loading {self.counts_file}: {e}")
+            return
+        
+        if 'counters' not in data:
+            # Old format: undated totals keyed by component_operation, counted as of now
+            bucket_start = int(time.time() // self.BUCKET_SECONDS) * self.BUCKET_SECONDS
+            for error_key, count in data.items():
+                key = self._split_legacy_key(error_key)
+                self._buckets[key] = deque([[bucket_start, count]])
+                self._totals[key] = count
+            self._dirty = True
+            return
+        
+        for counter in data['counters']:
+            key = (counter['component'], counter['operation'])
+            self._buckets[key] = deque([start, count] for start, count in counter['buckets'])
+            self._totals[key] = sum(count for _, count in counter['buckets'])
+        self._expire(time.time() - self.WINDOW_HOURS * 3600)
+    
+    def _split_legacy_key(self, error_key):
+        """Split an old component_operation key, preferring the longest known component"""
+        for component in sorted(self.COMPONENTS, key=len, reverse=True):
+            if error_key.startswith(component + '_'):
+                return component, error_key[len(component) + 1:]
+        # Unknown component: the old summary grouped by the text before the first '_'
+        component, _, operation = error_key.partition('_')
+        return component, operation
     
-    def _save_error_counts(self):
-        """Save error counts to file"""
-        with open(self.log_dir / 'error_counts.json', 'w') as f:
-            json.dump(self.error_counts, f, indent=4)
+    def close(self):
+        """Flush the counters now instead of at interpreter exit"""
+        self.flush_error_counts()
+        atexit.unregister(self.flush_error_counts)
+    
+    def flush_error_counts(self):
+        """Save error counts to file if they changed since the last flush"""
+        self._last_flush = time.monotonic()
+        if not self._dirty:
+            return
+        data = {
+            'bucket_seconds': self.BUCKET_SECONDS,
+            'counters': [
+                {'component': component, 'operation': operation, 'buckets': list(buckets)}
+                for (component, operation), buckets in sorted(self._buckets.items())
+            ]
+        }
+        try:
+            tmp_file = self.counts_file.with_name(self.counts_file.name + '.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            tmp_file.replace(self.counts_file)
+            self._dirty = False
+        except Exception as e:
+            logging.error(f"Error saving {self.counts_file}: {e}")
     
     def clear_error_counts(self, age_hours=24):
-        """Clear old error counts"""
-        current_time = datetime.now()
-        cleared_counts = {}
-        
-        for key, count in self.error_counts.items():
-            try:
-                error_time = datetime.fromisoformat(key.split('_')[0])
-                if (current_time - error_time).total_seconds() < age_hours * 3600:
-                    cleared_counts[key] = count
-            except:
-                continue
-        
-        self.error_counts = cleared_counts
-        self._save_error_counts()
+        """Clear error counts older than age_hours"""
+        self._expire(time.time() - age_hours * 3600)
+        self.flush_error_counts()
     
     def get_error_summary(self):
-        """Get summary of recent errors"""
+        """Get summary of errors within the window"""
+        self._expire(time.time() - self.WINDOW_HOURS * 3600)
         return {
-            'total_errors': sum(self.error_counts.values()),
+            'total_errors': sum(self._totals.values()),
             'errors_by_component': self._group_errors_by_component(),
             'most_common_errors': self._get_most_common_errors(5)
         }
@@ -86,16 +184,15 @@ class ErrorHandler:
     def _group_errors_by_component(self):
         """Group errors by component"""
         component_errors = {}
-        for key, count in self.error_counts.items():
-            component = key.split('_')[0]
+        for (component, _), count in self._totals.items():
             component_errors[component] = component_errors.get(component, 0) + count
         return component_errors
     
     def _get_most_common_errors(self, limit=5):
         """Get most common errors"""
         sorted_errors = sorted(
-            self.error_counts.items(),
+            self._totals.items(),
             key=lambda x: x[1],
             reverse=True
         )
-        return dict(sorted_errors[:limit])
\ No newline at end of file
+        return {f"{component}_{operation}": count for (component, operation), count in sorted_errors[:limit]}
@@ -3,6 +3,7 @@ Utility helper functions for the AI Tools Curator.
 """
 
 import re
+import sys
 from typing import Any, Dict, List
 from datetime import datetime
 import unicodedata
@@ -51,4 +52,31 @@ def truncate_text(text: str, length: int = 200) -> str:
     """Truncate text to specified length with ellipsis."""
     if len(text) <= length:
         return text
-    return text[:length].rsplit(' ', 1)[0] + '...'
\ No newline at end of file
+    return text[:length].rsplit(' ', 1)[0] + '...'
+
+class FrozenDict(dict):
+    """Read-only dict that can still be pickled, JSON-encoded and rendered by Jinja2."""
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert dicts to FrozenDicts and lists to tuples.
+    Short string values are interned so repeated categories, pricing tiers
+    and feature names share a single object.
+    """
+    if isinstance(value, dict):
+        return FrozenDict((sys.intern(k) if isinstance(k, str) else k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, str) and len(value) <= 64:
+        return sys.intern(value)
+    return value
@@ -0,0 +1,188 @@
+"""
+Membership index of tool contents that discovery has already processed.
+
+A tool's content hash covers the fields a source provides (name,
+description, URL, category, features, pricing), so a tool found again with
+the same content can be skipped before it is scored and rewritten. The
+exact set of hashes lives in the tool store; a Bloom filter kept in memory
+(and saved next to the catalog) answers most lookups for new tools without
+touching the database.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from utils.near_duplicates import canonicalize_url
+
+CONTENT_FIELDS = ('name', 'description', 'url', 'category', 'features', 'pricing')
+
+BLOOM_MAGIC = b'AITBLOOM'
+BLOOM_VERSION = 1
+_HEADER = struct.Struct('<8sHQHQ')
+
+
+def content_hash(tool: Dict[str, Any]) -> str:
+    """Hex digest of a tool's source-provided content."""
+    content = {field: tool.get(field) for field in CONTENT_FIELDS}
+    if isinstance(content['url'], str) and content['url']:
+        content['url'] = canonicalize_url(content['url'])
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 128-bit digests.
+
+    Attributes:
+        size: Number of bits
+        hashes: Bit positions set per item
+        count: Items added
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def capacity(self) -> int:
+        """Items the filter holds at its target error rate."""
+        return int(self.size * math.log(2) / self.hashes)
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def _positions(self, digest: bytes):
+        # Double hashing over the two halves of the digest
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:16], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def save(self, path: Path) -> None:
+        """Write the filter to a file atomically."""
+        path = Path(path)
+        tmp_file = path.with_name(path.name + '.tmp')
+        with open(tmp_file, 'wb') as handle:
+            handle.write(_HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self.size, self.hashes, self.count))
+            handle.write(self.bits)
+            handle.flush()
+            os.fsync(handle.fileno())
+        tmp_file.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'BloomFilter':
+        """
+        Read a filter written by save().
+
+        Raises:
+            ValueError: If the file is not a Bloom filter or is truncated
+        """
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not a Bloom filter")
+        magic, version, size, hashes, count = _HEADER.unpack_from(data)
+        if magic != BLOOM_MAGIC or version != BLOOM_VERSION:
+            raise ValueError(f"{path} is not a Bloom filter")
+        bits = bytearray(data[_HEADER.size:])
+        if len(bits) != (size + 7) // 8:
+            raise ValueError(f"Truncated Bloom filter {path}")
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hashes, bloom.count, bloom.bits = size, hashes, count, bits
+        return bloom
+
+
+class KnownTools:
+    """
+    Content hashes of tools already processed, with a Bloom filter in front.
+
+    The store's exact set is authoritative: a Bloom miss means the content
+    is new, a Bloom hit is confirmed against the store. The filter is
+    rebuilt from the store whenever its saved copy is missing, out of date
+    or full.
+
+    Attributes:
+        store: ToolStore holding the exact hash set
+        bloom_file: Where the filter is saved between runs
+        stats: known, new and false_positives lookup counts
+    """
+
+    def __init__(self, store, bloom_file: Path, capacity: int = 100000):
+        self.store = store
+        self.bloom_file = Path(bloom_file)
+        self.stats = {'known': 0, 'new': 0, 'false_positives': 0}
+        self._dirty = False
+        self.bloom = self._load_bloom(capacity)
+
+    def __contains__(self, content_hash: str) -> bool:
+        digest = bytes.fromhex(content_hash)
+        if digest not in self.bloom:
+            self.stats['new'] += 1
+            return False
+        if self.store.is_known(digest):
+            self.stats['known'] += 1
+            return True
+        self.stats['false_positives'] += 1
+        self.stats['new'] += 1
+        return False
+
+    def add_many(self, content_hashes: Iterable[str]) -> int:
+        """
+        Record content hashes as processed.
+
+        Returns:
+            Number of hashes that were not known yet
+        """
+        digests = {bytes.fromhex(content_hash) for content_hash in content_hashes}
+        added = self.store.add_known(digests)
+        if added:
+            # Grow before the false-positive rate degrades
+            if self.bloom.count + len(added) > self.bloom.capacity:
+                self.bloom = self._rebuild(2 * (self.bloom.count + len(added)))
+            else:
+                for digest in added:
+                    self.bloom.add(digest)
+            self._dirty = True
+        return len(added)
+
+    def save(self) -> None:
+        """Save the Bloom filter if it changed."""
+        if self._dirty:
+            self.bloom.save(self.bloom_file)
+            self._dirty = False
+
+    def _load_bloom(self, capacity: int) -> BloomFilter:
+        """Load the saved filter, rebuilding it if it does not match the store."""
+        known = self.store.known_count()
+        try:
+            bloom = BloomFilter.load(self.bloom_file)
+            # A crash between updating the store and saving the filter leaves the counts apart
+            if bloom.count == known and known <= bloom.capacity:
+                return bloom
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logging.warning(f"Rebuilding known-tool filter: {e}")
+        return self._rebuild(max(capacity, 2 * known))
+
+    def _rebuild(self, capacity: int) -> BloomFilter:
+        """Build a filter of the given capacity from the store's hash set."""
+        bloom = BloomFilter(capacity)
+        for digest in self.store.iter_known():
+            bloom.add(digest)
+        self._dirty = True
+        logging.info(f"Built known-tool filter: {bloom.count} hashes, {len(bloom.bits)} bytes")
+        return bloom
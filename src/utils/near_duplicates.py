@@ -0,0 +1,255 @@
+"""
+Near-duplicate detection for discovered tools.
+
+The same product often shows up on several sources under slightly different
+names ("Claude", "Claude 3") or URL variants (tracking parameters, "www.",
+trailing slashes). Each tool gets a Fingerprint: a canonical URL key, a
+normalized name and a MinHash signature over name trigrams and description
+words. Signatures are split into LSH bands, so candidates are found by
+looking up band keys instead of comparing against every known tool.
+"""
+
+import hashlib
+import logging
+import re
+import struct
+import unicodedata
+from array import array
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from utils.helpers import slugify
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: candidates above roughly 0.5 estimated Jaccard
+NAME_THRESHOLD = 0.5  # Minimum name trigram similarity for a near-duplicate
+
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'source', 'via'
+})
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'with', 'your'
+})
+_SIGNATURE = struct.Struct(f'<{NUM_PERM}I')
+_BAND_TAGS = [band.to_bytes(2, 'little') for band in range(BANDS)]
+_VERSION_TOKEN = re.compile(r'\b(?:v?\d+(?:\.\d+)*[a-z]?)\b')
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Clean a tool URL: lowercase scheme and host, drop default ports, fragments,
+    tracking parameters and trailing slashes, and sort the query.
+    """
+    url = url.strip()
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if parts.port and parts.port != {'http': 80, 'https': 443}.get(scheme):
+        host = f'{host}:{parts.port}'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def url_key(url: str) -> str:
+    """Match key of a URL: the canonical URL without scheme and 'www.'."""
+    parts = urlsplit(canonicalize_url(url))
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    return host + parts.path + (f'?{parts.query}' if parts.query else '')
+
+
+def name_key(name: str) -> str:
+    """Normalized tool name with version tokens removed ("Claude 3" -> "claude")."""
+    text = unicodedata.normalize('NFKD', str(name).lower()).encode('ascii', 'ignore').decode()
+    words = re.sub(r'[^a-z0-9.]+', ' ', text)
+    stripped = ' '.join(_VERSION_TOKEN.sub(' ', words).split())
+    return stripped or ' '.join(words.split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the trigram sets of two name keys."""
+    if a == b:
+        return 1.0
+    first, second = _trigrams(a), _trigrams(b)
+    return len(first & second) / len(first | second) if first and second else 0.0
+
+
+def minhash(shingles: Set[str]) -> array:
+    """
+    MinHash signature of a non-empty shingle set.
+
+    One SHAKE-128 digest per shingle supplies NUM_PERM independent 32-bit
+    hashes; slot i of the signature is the minimum of hash i over the set.
+    """
+    hashes = [_SIGNATURE.unpack(hashlib.shake_128(shingle.encode()).digest(_SIGNATURE.size)) for shingle in shingles]
+    return array('I', map(min, zip(*hashes)))
+
+
+class Fingerprint:
+    """
+    What near-duplicate detection knows about a tool.
+
+    Attributes:
+        url_key: URL match key (see url_key())
+        name_key: Normalized name (see name_key())
+        signature: MinHash signature, NUM_PERM 32-bit values
+    """
+
+    __slots__ = ('url_key', 'name_key', 'signature')
+
+    def __init__(self, url_key: str, name_key: str, signature: array):
+        self.url_key = url_key
+        self.name_key = name_key
+        self.signature = signature
+
+    @classmethod
+    def of(cls, tool: Dict[str, Any]) -> 'Fingerprint':
+        """Fingerprint a tool dict from its url, name and description."""
+        key = name_key(tool.get('name') or '')
+        shingles = {f'n:{gram}' for gram in _trigrams(key)}
+        for word in re.findall(r'[a-z0-9]+', str(tool.get('description') or '').lower()):
+            if len(word) > 2 and word not in STOPWORDS:
+                shingles.add(f'w:{word}')
+        return cls(url_key(tool['url']) if tool.get('url') else '', key, minhash(shingles))
+
+    @classmethod
+    def from_row(cls, url_key: str, name_key: str, signature: bytes) -> 'Fingerprint':
+        """Rebuild a fingerprint stored with to_row()."""
+        return cls(url_key, name_key, array('I', signature))
+
+    def to_row(self) -> tuple:
+        """(url_key, name_key, signature bytes) for storage."""
+        return self.url_key, self.name_key, self.signature.tobytes()
+
+    def band_keys(self) -> List[int]:
+        """One signed 64-bit key per LSH band (fits an SQLite INTEGER)."""
+        data = self.signature.tobytes()
+        width = len(data) // BANDS
+        return [
+            int.from_bytes(
+                hashlib.blake2b(data[band * width:(band + 1) * width], digest_size=8, person=_BAND_TAGS[band]).digest(),
+                'little', signed=True
+            )
+            for band in range(BANDS)
+        ]
+
+    def similarity(self, other: 'Fingerprint') -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return sum(1 for a, b in zip(self.signature, other.signature) if a == b) / NUM_PERM
+
+    def matches(self, other: 'Fingerprint', threshold: float) -> bool:
+        """
+        Whether two fingerprints describe the same tool.
+
+        A shared URL is enough unless it is a bare domain, which several
+        products of one company may share; otherwise the names must be alike
+        and the estimated similarity must reach threshold.
+        """
+        names_alike = name_similarity(self.name_key, other.name_key) >= NAME_THRESHOLD
+        if self.url_key and self.url_key == other.url_key and ('/' in self.url_key or names_alike):
+            return True
+        return names_alike and self.similarity(other) >= threshold
+
+
+class NearDuplicateIndex:
+    """In-memory LSH index of fingerprints, used for tools seen in one discovery cycle."""
+
+    def __init__(self, threshold: float = 0.5):
+        self.threshold = threshold
+        self._fingerprints: Dict[str, Fingerprint] = {}
+        self._urls: Dict[str, str] = {}
+        self._bands: Dict[int, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, key: str, fingerprint: Fingerprint) -> None:
+        """Index a fingerprint under key."""
+        self._fingerprints[key] = fingerprint
+        if fingerprint.url_key:
+            self._urls.setdefault(fingerprint.url_key, key)
+        for band in fingerprint.band_keys():
+            self._bands.setdefault(band, []).append(key)
+
+    def find(self, fingerprint: Fingerprint) -> Optional[str]:
+        """Key of the most similar indexed near-duplicate, or None."""
+        candidates = {key for band in fingerprint.band_keys() for key in self._bands.get(band, ())}
+        if fingerprint.url_key in self._urls:
+            candidates.add(self._urls[fingerprint.url_key])
+        return best_match(fingerprint, {key: self._fingerprints[key] for key in candidates}, self.threshold)
+
+
+def best_match(fingerprint: Fingerprint, candidates: Dict[str, Fingerprint], threshold: float) -> Optional[str]:
+    """Key of the candidate that matches fingerprint with the highest similarity, or None."""
+    matching = [
+        (candidate.similarity(fingerprint), key)
+        for key, candidate in candidates.items()
+        if fingerprint.matches(candidate, threshold)
+    ]
+    return max(matching)[1] if matching else None
+
+
+class ToolDeduplicator:
+    """
+    Resolves discovered tools against each other and the catalog.
+
+    A near-duplicate of a tool already seen this cycle is dropped. A
+    near-duplicate of a catalog tool under another slug is merged into it:
+    it takes the catalog name (so it updates that entry) and the name it was
+    found under is kept in 'aliases'.
+
+    Attributes:
+        store: ToolStore providing find_duplicate() and get(), or None
+        threshold: Estimated Jaccard similarity needed for a near-duplicate
+        stats: unique, merged and dropped counts
+    """
+
+    def __init__(self, store=None, threshold: float = 0.5):
+        self.store = store
+        self.threshold = threshold
+        self.seen = NearDuplicateIndex(threshold)
+        self.stats = {'unique': 0, 'merged': 0, 'dropped': 0}
+
+    def resolve(self, tool: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Canonicalize a tool's URL and resolve it against known tools.
+
+        Returns:
+            The tool to keep (possibly renamed onto a catalog entry), or None
+            if it duplicates a tool already seen this cycle
+        """
+        if tool.get('url'):
+            tool = {**tool, 'url': canonicalize_url(tool['url'])}
+        fingerprint = Fingerprint.of(tool)
+
+        duplicate_of = self.seen.find(fingerprint)
+        if duplicate_of is not None:
+            self.stats['dropped'] += 1
+            logging.info(f"Dropping {tool['name']}: near-duplicate of {duplicate_of} found this cycle")
+            return None
+
+        slug = slugify(tool['name'])
+        match = self.store.find_duplicate(fingerprint, self.threshold) if self.store is not None else None
+        if match is not None and match != slug:
+            existing = self.store.get(match)
+            aliases = list(existing.get('aliases', []))
+            if tool['name'] not in aliases and tool['name'] != existing['name']:
+                aliases.append(tool['name'])
+            logging.info(f"Merging {tool['name']} into existing tool {existing['name']}")
+            tool = {**tool, 'name': existing['name'], 'aliases': aliases}
+            slug = match
+            self.stats['merged'] += 1
+        else:
+            self.stats['unique'] += 1
+
+        self.seen.add(slug, fingerprint)
+        return tool
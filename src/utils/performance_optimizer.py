@@ -6,9 +6,10 @@ Features:
 - Resource monitoring
 - Task prioritization
 - Concurrent execution
-- Performance metrics
+- Performance metrics (append-only log with buffered flushes, compacted as it grows)
 """
 
+import atexit
 import psutil
 import logging
 from datetime import datetime, timedelta
@@ -19,6 +20,7 @@ from typing import Dict, Any
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import queue
+from collections import deque
 from dataclasses import dataclass, asdict
 
 @dataclass
@@ -41,23 +43,43 @@ class PerformanceOptimizer:
         thresholds: Resource usage limits
         task_queue: Priority queue for tasks
         thread_pool: Thread pool for concurrent execution
-        metrics_history: Historical performance data
+        metrics_history: Bounded ring buffer of recent performance data
     
     Methods:
         optimize_task: Main method to optimize task execution
         _check_resources: Monitors system resources
         _wait_for_resources: Handles resource availability
         get_performance_report: Generates performance metrics
+        flush_metrics: Appends buffered metrics to the metrics log
+        compact_metrics: Rewrites the metrics log with recent history only,
+            once COMPACT_AT records are on disk
     """
     
+    # Metrics log settings
+    MAX_HISTORY = 1000  # Records kept in memory
+    FLUSH_EVERY = 50  # Buffered records that trigger a flush
+    FLUSH_INTERVAL = 30.0  # Seconds between time-based flushes
+    COMPACT_AT = 2 * MAX_HISTORY  # Logged records that trigger compaction
+    MAX_LOG_BYTES = 1024 * 1024  # Log size that triggers rotation
+    ROTATED_LOGS = 3  # Rotated log files kept
+    
     def __init__(self, config):
         self.config = config
         self.data_dir = Path('data')
         self.data_dir.mkdir(exist_ok=True)
         
-        # Performance logs
-        self.metrics_file = self.data_dir / 'performance_metrics.json'
-        self.metrics_history = self._load_metrics_history()
+        # Performance logs: line-delimited JSON, appended in batches
+        self.metrics_log = self.data_dir / 'performance_metrics.jsonl'
+        self.legacy_metrics_file = self.data_dir / 'performance_metrics.json'
+        self._loaded_legacy = False
+        self._logged_records = 0  # Records in the current and rotated logs
+        self.metrics_history = deque(self._load_metrics_history(), maxlen=self.MAX_HISTORY)
+        self._metrics_buffer = []
+        self._last_flush = time.monotonic()
+        if self._loaded_legacy:
+            # Migrate history from the old single-file format
+            self.compact_metrics()
+        atexit.register(self.flush_metrics)
         
         # Resource thresholds
         self.thresholds = {
@@ -182,8 +204,14 @@ class PerformanceOptimizer:
             timestamp=datetime.now().isoformat()
         )
         
-        self.metrics_history.append(asdict(metrics))
-        self._save_metrics()
+        record = asdict(metrics)
+        self.metrics_history.append(record)
+        self._metrics_buffer.append(record)
+        
+        # Flush in batches instead of after every task
+        if (len(self._metrics_buffer) >= self.FLUSH_EVERY or
+                time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+            self.flush_metrics()
         
         # Log if thresholds are exceeded
         self._check_thresholds(metrics)
@@ -204,7 +232,7 @@ class PerformanceOptimizer:
         if not self.metrics_history:
             return {}
         
-        recent_metrics = self.metrics_history[-100:]  # Last 100 records
+        recent_metrics = list(self.metrics_history)[-100:]  # Last 100 records
         
         return {
             'average_response_time': sum(m['response_time'] for m in recent_metrics) / len(recent_metrics),
@@ -216,21 +244,70 @@ class PerformanceOptimizer:
         }
     
     def _load_metrics_history(self) -> list:
-        """Load metrics history from file"""
+        """Load the most recent metrics from the rotated and current logs"""
+        history = deque(maxlen=self.MAX_HISTORY)
         try:
-            if self.metrics_file.exists():
-                return json.loads(self.metrics_file.read_text())
+            log_files = [self._rotated_log(n) for n in range(self.ROTATED_LOGS, 0, -1)] + [self.metrics_log]
+            existing_logs = [log_file for log_file in log_files if log_file.exists()]
+            
+            if not existing_logs and self.legacy_metrics_file.exists():
+                history.extend(json.loads(self.legacy_metrics_file.read_text()))
+                self._loaded_legacy = True
+            
+            for log_file in existing_logs:
+                with open(log_file) as handle:
+                    for line in handle:
+                        self._logged_records += 1
+                        try:
+                            history.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue  # Skip a partially written last line
         except Exception as e:
             logging.error(f"Error loading metrics history: {e}")
-        return []
+        return list(history)
+    
+    def flush_metrics(self):
+        """Append buffered metrics to the log, compacting or rotating it when it grows too large"""
+        self._last_flush = time.monotonic()
+        if not self._metrics_buffer:
+            return
+        try:
+            with open(self.metrics_log, 'a') as handle:
+                handle.writelines(json.dumps(record) + '\n' for record in self._metrics_buffer)
+            self._logged_records += len(self._metrics_buffer)
+            self._metrics_buffer = []
+            
+            # Only the last MAX_HISTORY records are ever read back
+            if self._logged_records >= self.COMPACT_AT:
+                self.compact_metrics()
+            elif self.metrics_log.stat().st_size > self.MAX_LOG_BYTES:
+                self._rotate_logs()
+        except Exception as e:
+            logging.error(f"Error saving metrics: {e}")
     
-    def _save_metrics(self):
-        """Save metrics to file"""
+    def compact_metrics(self):
+        """Rewrite the log with only the in-memory history and drop rotated logs"""
         try:
-            # Keep only last 1000 metrics
-            if len(self.metrics_history) > 1000:
-                self.metrics_history = self.metrics_history[-1000:]
+            self._metrics_buffer = []
+            tmp_file = self.metrics_log.with_name(self.metrics_log.name + '.tmp')
+            with open(tmp_file, 'w') as handle:
+                handle.writelines(json.dumps(record) + '\n' for record in self.metrics_history)
+            tmp_file.replace(self.metrics_log)
+            self._logged_records = len(self.metrics_history)
             
-            self.metrics_file.write_text(json.dumps(self.metrics_history, indent=2))
+            for n in range(1, self.ROTATED_LOGS + 1):
+                self._rotated_log(n).unlink(missing_ok=True)
         except Exception as e:
-            logging.error(f"Error saving metrics: {e}")
\ No newline at end of file
+            logging.error(f"Error compacting metrics: {e}")
+    
+    def _rotate_logs(self):
+        """Shift metrics log files: .jsonl -> .jsonl.1 -> .jsonl.2 ..., dropping the oldest"""
+        self._rotated_log(self.ROTATED_LOGS).unlink(missing_ok=True)
+        for n in range(self.ROTATED_LOGS - 1, 0, -1):
+            if self._rotated_log(n).exists():
+                self._rotated_log(n).replace(self._rotated_log(n + 1))
+        self.metrics_log.replace(self._rotated_log(1))
+    
+    def _rotated_log(self, n: int) -> Path:
+        """Path of the n-th rotated metrics log"""
+        return self.metrics_log.with_name(f"{self.metrics_log.name}.{n}")
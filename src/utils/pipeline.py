@@ -0,0 +1,73 @@
+"""
+Streaming pipeline of async-generator stages joined by bounded queues.
+
+Each stage is an async generator function that takes an async iterator of
+items and yields items for the next stage, so it can filter, transform or
+batch. Every stage runs as its own task; the bounded queues between them
+let a fast stage run ahead of a slow one only by `maxsize` items, and an
+error in any stage cancels the rest.
+"""
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+Stage = Callable[[AsyncIterator[Any]], AsyncIterator[Any]]
+
+_DONE = object()
+
+
+async def _drain(queue: asyncio.Queue) -> AsyncIterator[Any]:
+    """Yield queued items until the producer signals it is done."""
+    while True:
+        item = await queue.get()
+        if item is _DONE:
+            return
+        yield item
+
+
+async def _pump(items: AsyncIterable[Any], queue: Optional[asyncio.Queue], name: str,
+                stats: Dict[str, int], results: List[Any]) -> None:
+    """Move items into the next queue (or the results list) and count them."""
+    stats[name] = 0
+    async for item in items:
+        stats[name] += 1
+        if queue is None:
+            results.append(item)
+        else:
+            await queue.put(item)
+    if queue is not None:
+        await queue.put(_DONE)
+
+
+async def run_pipeline(source: AsyncIterable[Any], stages: Sequence[Stage], maxsize: int = 64,
+                       stats: Optional[Dict[str, int]] = None) -> List[Any]:
+    """
+    Run items from source through stages concurrently.
+
+    Args:
+        source: Async iterable of input items
+        stages: Async generator functions, applied in order
+        maxsize: Capacity of each queue between stages
+        stats: Optional dict that receives the number of items produced by
+            the source ('source') and by each stage (keyed by its __name__)
+
+    Returns:
+        Items yielded by the last stage
+    """
+    stats = {} if stats is None else stats
+    results = []
+    queues = [asyncio.Queue(maxsize) for _ in stages]
+
+    pumps = [_pump(source, queues[0] if queues else None, 'source', stats, results)]
+    for index, stage in enumerate(stages):
+        next_queue = queues[index + 1] if index + 1 < len(queues) else None
+        pumps.append(_pump(stage(_drain(queues[index])), next_queue, stage.__name__, stats, results))
+
+    tasks = [asyncio.ensure_future(pump) for pump in pumps]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return results
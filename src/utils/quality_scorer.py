@@ -7,6 +7,9 @@ from typing import Dict, Any
 from datetime import datetime
 
 class QualityScorer:
+    # Bump when scoring rules change, so earlier rejections are re-evaluated
+    VERSION = 1
+
     def __init__(self, config):
         self.config = config
         self.min_score = 0.6
@@ -17,6 +20,12 @@ class QualityScorer:
             'metadata_quality': 0.2
         }
 
+    @property
+    def settings_key(self) -> str:
+        """Identifies the scoring rules and threshold a verdict was reached with."""
+        weights = ','.join(f"{name}={weight}" for name, weight in sorted(self.weights.items()))
+        return f"v{self.VERSION};min={self.min_score};{weights}"
+
     async def score_tool(self, tool: Dict[str, Any]) -> Dict[str, Any]:
         """Score a tool based on various quality metrics."""
         try:
@@ -0,0 +1,130 @@
+/**
+ * Client-side tool search backed by the sharded index in /search/.
+ *
+ * Each query word is looked up in the shard for its first characters, so the
+ * browser only downloads the shards for what the user actually types.
+ */
+(function () {
+    'use strict';
+
+    const script = document.currentScript;
+    const siteRoot = script ? script.src.replace(/static\/js\/main\.js.*$/, '') : '/';
+    const searchRoot = siteRoot + 'search/';
+    const maxResults = 10;
+
+    let indexInfo = null;
+    let docs = null;
+    const shards = {};
+
+    async function fetchJSON(path) {
+        const response = await fetch(searchRoot + path);
+        if (!response.ok) {
+            throw new Error('Failed to load ' + path);
+        }
+        return response.json();
+    }
+
+    async function loadIndex() {
+        if (indexInfo === null) {
+            [indexInfo, docs] = await Promise.all([fetchJSON('index.json'), fetchJSON('docs.json')]);
+        }
+    }
+
+    async function loadShard(prefix) {
+        if (!(prefix in indexInfo.shards)) {
+            return {};
+        }
+        if (!(prefix in shards)) {
+            shards[prefix] = fetchJSON('shards/' + prefix + '.json');
+        }
+        return shards[prefix];
+    }
+
+    function tokenize(query) {
+        const words = (query.toLowerCase().match(/[a-z0-9]+/g) || []).filter(word => word.length > 1);
+        // The index leaves stopwords out, so they could never match; a query of
+        // nothing but stopwords is kept as prefixes of longer words ("ai" -> "aider")
+        const stopwords = new Set(indexInfo.stopwords || []);
+        const content = words.filter(word => !stopwords.has(word));
+        return content.length ? content : words;
+    }
+
+    async function search(query) {
+        await loadIndex();
+        const words = tokenize(query);
+        if (!words.length) {
+            return [];
+        }
+
+        let totals = null;
+        for (const word of words) {
+            const shard = await loadShard(word.slice(0, indexInfo.prefix_length));
+            const scores = new Map();
+            // Every indexed token starting with the query word matches
+            for (const [token, postings] of Object.entries(shard)) {
+                if (!token.startsWith(word)) {
+                    continue;
+                }
+                for (let i = 0; i < postings.length; i += 2) {
+                    scores.set(postings[i], Math.max(scores.get(postings[i]) || 0, postings[i + 1]));
+                }
+            }
+            // All query words must match
+            if (totals === null) {
+                totals = scores;
+            } else {
+                for (const doc of Array.from(totals.keys())) {
+                    if (scores.has(doc)) {
+                        totals.set(doc, totals.get(doc) + scores.get(doc));
+                    } else {
+                        totals.delete(doc);
+                    }
+                }
+            }
+        }
+
+        return Array.from(totals.entries())
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .slice(0, maxResults)
+            .map(([doc]) => ({id: docs[doc][0], name: docs[doc][1], category: docs[doc][2]}));
+    }
+
+    function renderResults(container, results) {
+        container.innerHTML = '';
+        results.forEach(result => {
+            const link = document.createElement('a');
+            link.className = 'list-group-item list-group-item-action';
+            link.href = siteRoot + 'tools/' + result.id + '.html';
+            link.textContent = result.name;
+            if (result.category) {
+                const category = document.createElement('small');
+                category.className = 'text-muted ms-2';
+                category.textContent = result.category;
+                link.appendChild(category);
+            }
+            container.appendChild(link);
+        });
+        container.hidden = results.length === 0;
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        const input = document.getElementById('toolSearch');
+        const container = document.getElementById('searchResults');
+        if (!input || !container) {
+            return;
+        }
+
+        let pending = 0;
+        input.addEventListener('input', async () => {
+            const request = ++pending;
+            try {
+                const results = await search(input.value);
+                if (request === pending) {
+                    renderResults(container, results);
+                }
+            } catch (error) {
+                console.error(error);
+            }
+        });
+    });
+})();
@@ -0,0 +1,74 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics.tracker import AnalyticsTracker
+
+TOOL = {'name': 'Alpha', 'quality_score': 0.8}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'data' / 'analytics'
+
+
+def test_close_folds_the_event_log_into_snapshots(data_dir):
+    tracker = AnalyticsTracker({'analytics_storage': 'wal'})
+    tracker.track_post(TOOL, 't1', 'program')
+    tracker.track_conversion('t1', 9.5)
+    tracker.event_log.flush()
+    assert (data_dir / 'events.wal').exists()
+
+    tracker.close()
+
+    assert not (data_dir / 'events.wal').exists()
+    reopened = AnalyticsTracker({'analytics_storage': 'wal'})
+    assert list(reopened.posts) == ['t1']
+    assert len(reopened.conversions) == 1
+    assert reopened.event_log.events_since_snapshot == 0
+    reopened.close()
+
+
+def test_unflushed_events_survive_a_restart_through_the_log(data_dir):
+    tracker = AnalyticsTracker({'analytics_storage': 'wal'})
+    tracker.track_post(TOOL, 't1', 'program')
+    tracker.event_log.flush()
+
+    reopened = AnalyticsTracker({'analytics_storage': 'wal'})
+
+    assert list(reopened.posts) == ['t1']
+    assert reopened.event_log.events_since_snapshot == 1
+    reopened.close()
+    tracker.close()
+
+
+def test_old_events_are_compacted_on_a_timer(data_dir, monkeypatch):
+    monkeypatch.setattr(AnalyticsTracker, 'COMPACT_INTERVAL', 0.0)
+    tracker = AnalyticsTracker({'analytics_storage': 'wal'})
+
+    tracker.track_post(TOOL, 't1', 'program')
+
+    assert tracker.event_log.events_since_snapshot == 0
+    assert (data_dir / 'posts.json').exists()
+    tracker.close()
+
+
+def test_report_summary_fields_cover_the_same_window(data_dir):
+    tracker = AnalyticsTracker({'analytics_storage': 'wal'})
+    # Inside the cutoff's clock hour, which the hourly rollups count, and just before it
+    hour_start = tracker.rollups.window_start((datetime.now() - timedelta(days=30)).timestamp())
+    tracker.track_events([
+        {'type': 'post', 'tool': TOOL, 'tweet_id': tweet_id, 'program': 'program',
+         'posted_at': datetime.fromtimestamp(posted).isoformat()}
+        for tweet_id, posted in [('edge', hour_start), ('before', hour_start - 1), ('recent', time.time())]
+    ])
+    tracker.track_events([{'type': 'metrics', 'tweet_id': tweet_id, 'metrics': {'likes': 10}}
+                          for tweet_id in ('edge', 'before', 'recent')])
+
+    summary = tracker.get_performance_report(days=30)['summary']
+
+    assert summary['total_posts'] == 2
+    assert summary['average_engagement'] == 10
+    tracker.close()
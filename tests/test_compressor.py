@@ -0,0 +1,44 @@
+import gzip
+
+from github_publisher.compressor import Precompressor
+
+PAGE = b'<html>' + b'tool ' * 100 + b'</html>'
+
+
+def test_only_changed_files_are_compressed(tmp_path):
+    changed, untouched = tmp_path / 'changed.html', tmp_path / 'untouched.html'
+    changed.write_bytes(PAGE)
+    untouched.write_bytes(PAGE)
+
+    stats = Precompressor(workers=1).compress([changed], tmp_path)
+
+    assert stats['files'] == 1
+    assert gzip.decompress((tmp_path / 'changed.html.gz').read_bytes()) == PAGE
+    assert not (tmp_path / 'untouched.html.gz').exists()
+
+
+def test_rescan_compresses_the_whole_site(tmp_path):
+    (tmp_path / 'tools').mkdir()
+    (tmp_path / 'tools' / 'alpha.html').write_bytes(PAGE)
+    (tmp_path / 'tiny.html').write_bytes(b'<p>hi</p>')
+
+    stats = Precompressor(workers=1).compress([], tmp_path, rescan=True)
+
+    assert stats['files'] == 1
+    assert (tmp_path / 'tools' / 'alpha.html.gz').exists()
+    assert not (tmp_path / 'tiny.html.gz').exists()
+
+
+def test_file_that_shrank_below_min_size_loses_its_sidecars(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_bytes(PAGE)
+    compressor = Precompressor(workers=1)
+    compressor.compress([page], tmp_path)
+    (tmp_path / 'page.html.br').write_bytes(b'stale')
+
+    page.write_bytes(b'<p>hi</p>')
+    stats = compressor.compress([page], tmp_path)
+
+    assert stats['sidecars_removed'] == 2
+    assert not (tmp_path / 'page.html.gz').exists()
+    assert not (tmp_path / 'page.html.br').exists()
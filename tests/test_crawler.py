@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+from conftest import send
+from tools_discovery.crawler import ToolsDiscovery
+
+
+def make_discovery(tmp_path, urls, **settings):
+    config = {
+        'use_sample_data': False,
+        'discovery_sources': urls,
+        'sources_file': tmp_path / 'sources.json',
+        'http_cache_dir': tmp_path / 'http_cache',
+        **settings
+    }
+    return ToolsDiscovery(config)
+
+
+def listing(*names):
+    return json.dumps({'tools': [{'name': name, 'url': f'https://{name.lower()}.ai'} for name in names]}).encode()
+
+
+def truncated(handler):
+    # Promise more bytes than are sent, then hang up
+    handler.send_response(200)
+    handler.send_header('Content-Length', '500')
+    handler.end_headers()
+    handler.wfile.write(b'{"tools": [')
+    handler.close_connection = True
+
+
+def test_crawl_collects_tools_from_all_sources(stub_server, tmp_path):
+    stub_server.routes['/a'] = lambda h: send(h, listing('Alpha', 'Beta'))
+    stub_server.routes['/b'] = lambda h: send(h, listing('Gamma'))
+    discovery = make_discovery(tmp_path, [stub_server.url('/a'), stub_server.url('/b')])
+
+    tools = asyncio.run(discovery.find_new_tools())
+
+    assert sorted(tool['name'] for tool in tools) == ['Alpha', 'Beta', 'Gamma']
+    assert all(tool['source'].startswith('http://127.0.0.1') for tool in tools)
+    assert discovery.crawl_stats['failed_sources'] == 0
+
+
+def test_truncated_source_fails_alone(stub_server, tmp_path):
+    stub_server.routes['/good'] = lambda h: send(h, listing('Alpha'))
+    stub_server.routes['/short'] = truncated
+    discovery = make_discovery(tmp_path, [stub_server.url('/good'), stub_server.url('/short')])
+
+    tools = asyncio.run(discovery.find_new_tools())
+
+    assert [tool['name'] for tool in tools] == ['Alpha']
+    assert discovery.crawl_stats['failed_sources'] == 1
+
+
+def test_error_status_and_bad_json_fail_the_source(stub_server, tmp_path):
+    stub_server.routes['/good'] = lambda h: send(h, listing('Alpha'))
+    stub_server.routes['/error'] = lambda h: send(h, b'oops', status=500)
+    stub_server.routes['/garbage'] = lambda h: send(h, b'not json')
+    urls = [stub_server.url(path) for path in ('/good', '/error', '/garbage', '/missing')]
+    discovery = make_discovery(tmp_path, urls)
+
+    tools = asyncio.run(discovery.find_new_tools())
+
+    assert [tool['name'] for tool in tools] == ['Alpha']
+    assert discovery.crawl_stats['failed_sources'] == 3
+
+
+def test_entries_without_name_or_url_are_skipped_and_limit_applies(stub_server, tmp_path):
+    entries = [{'name': 'NoUrl'}, {'url': 'https://x.ai'}, 'junk'] + [
+        {'name': f'Tool {i}', 'url': f'https://t{i}.ai'} for i in range(5)
+    ]
+    stub_server.routes['/list'] = lambda h: send(h, json.dumps(entries).encode())
+    discovery = make_discovery(tmp_path, [stub_server.url('/list')], max_tools_per_source=3)
+
+    tools = asyncio.run(discovery.find_new_tools())
+
+    assert [tool['name'] for tool in tools] == ['Tool 0', 'Tool 1', 'Tool 2']
+
+
+def test_sources_file_is_merged_and_deduplicated(stub_server, tmp_path):
+    stub_server.routes['/a'] = lambda h: send(h, listing('Alpha'))
+    url = stub_server.url('/a')
+    (tmp_path / 'sources.json').write_text(json.dumps([url, {'url': url, 'category': 'Other'}]))
+    discovery = make_discovery(tmp_path, [url])
+
+    assert discovery._load_sources() == [{'url': url}]
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+from utils.dates import DateIndex, normalize_timestamp, parse_datetime, parse_timestamp
+
+
+def test_naive_timestamps_are_read_as_utc():
+    assert parse_datetime('2024-03-01T23:30:00') == datetime(2024, 3, 1, 23, 30, tzinfo=timezone.utc)
+    assert parse_datetime('2024-03-01T23:30:00Z') == parse_datetime('2024-03-02T01:30:00+02:00')
+    assert normalize_timestamp('2024-03-01T23:30:00') == '2024-03-01T23:30:00+00:00'
+    assert normalize_timestamp('not a date') == 'not a date'
+
+
+def test_date_index_answers_latest_and_ranges():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tools = [{'id': i, 'ts': (start + timedelta(days=i)).timestamp()} for i in (3, 1, 4, 0, 2)]
+    tools.append({'id': 'undated', 'ts': None})
+    index = DateIndex(tools, key=lambda tool: tool['ts'])
+
+    assert [tool['id'] for tool in index.latest(2)] == [4, 3]
+    # Strictly newer: the tool added exactly at the cutoff is not counted
+    assert index.count_since(parse_timestamp('2024-01-03T00:00:00')) == 2
+    assert [tool['id'] for tool in index.between((start + timedelta(days=1)).timestamp(),
+                                                  (start + timedelta(days=3)).timestamp())] == [2, 1]
@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from github_publisher import publisher as publisher_module
+from github_publisher.publisher import GitHubPublisher
+
+
+class LateSunday(datetime):
+    """Sunday 23:30 UTC, already Monday on a clock two hours ahead of UTC."""
+
+    @classmethod
+    def now(cls, tz=None):
+        utc = datetime(2024, 3, 10, 23, 30, tzinfo=timezone.utc)
+        return utc.astimezone(tz) if tz else (utc + timedelta(hours=2)).replace(tzinfo=None)
+
+
+class NoSite:
+    def __init__(self, config):
+        pass
+
+    def generate_site(self, tools_data):
+        return {}
+
+
+def test_weekly_digest_is_triggered_on_the_utc_sunday(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(publisher_module, 'datetime', LateSunday)
+    monkeypatch.setattr(publisher_module, 'StaticGenerator', NoSite)
+    publisher = GitHubPublisher({})
+
+    asyncio.run(publisher.finish_update(0))
+
+    assert (tmp_path / 'data' / 'digests' / '2024-w10.json').exists()
+    publisher.store.close()
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('schedule')
+
+from github_publisher.publisher import GitHubPublisher
+from main import AIToolsCurator
+from utils.performance_optimizer import PerformanceOptimizer
+from utils.pipeline import run_pipeline
+from utils.quality_scorer import QualityScorer
+
+GOOD = {
+    'name': 'Alpha Writer', 'url': 'https://alpha.ai', 'category': 'Writing',
+    'description': 'Alpha Writer drafts long-form articles, emails and product copy from short prompts.',
+    'features': ['Drafting', 'Rewriting', 'Tone control'], 'pricing': 'Freemium'
+}
+POOR = {'name': 'Beta', 'url': 'https://beta.ai', 'description': 'Short.'}
+
+
+@pytest.fixture
+def curator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    curator = AIToolsCurator.__new__(AIToolsCurator)
+    curator.config = {'persist_batch_size': 1}
+    curator.quality_scorer = QualityScorer(curator.config)
+    curator.publisher = GitHubPublisher(curator.config)
+    yield curator
+    curator.publisher.store.close()
+
+
+def discover(curator, tools):
+    async def source():
+        for tool in tools:
+            yield dict(tool)
+
+    stats = {}
+    stored = asyncio.run(run_pipeline(
+        source(), [curator._dedupe_tools, curator._score_tools, curator._persist_tools], stats=stats
+    ))
+    return stored, stats
+
+
+def test_content_hashes_are_recorded_but_not_stored(curator):
+    stored, stats = discover(curator, [GOOD])
+
+    assert [tool['name'] for tool in stored] == ['Alpha Writer']
+    assert 'content_hash' not in curator.publisher.store.get('alpha-writer')
+    assert curator.publisher.store.known_count() == 1
+
+
+def test_unchanged_and_rejected_tools_are_skipped_next_cycle(curator):
+    discover(curator, [GOOD, POOR])
+
+    stored, stats = discover(curator, [GOOD, POOR])
+
+    assert stored == []
+    assert stats['_dedupe_tools'] == 0
+
+
+def test_rejections_are_rescored_when_the_threshold_changes(curator):
+    discover(curator, [POOR])
+    curator.quality_scorer.min_score = 0.0
+
+    stored, _ = discover(curator, [POOR])
+
+    assert [tool['name'] for tool in stored] == ['Beta']
+
+
+class Listing:
+    """Discovery double yielding a fixed list of tools."""
+
+    def __init__(self, tools):
+        self.tools = tools
+
+    async def iter_new_tools(self):
+        for tool in self.tools:
+            yield dict(tool)
+
+
+class Reraise:
+    def handle_error(self, error, component, operation):
+        raise error
+
+
+class NoAnalytics:
+    def get_performance_report(self):
+        return {}
+
+
+@pytest.mark.parametrize('tools, published', [([GOOD], True), ([POOR], False), ([], False)])
+def test_repository_is_only_updated_when_tools_were_stored(curator, monkeypatch, tools, published):
+    calls = []
+
+    async def finish_update(stored):
+        calls.append(stored)
+
+    curator.performance_optimizer = PerformanceOptimizer(curator.config)
+    curator.error_handler = Reraise()
+    curator.tools_discovery = Listing(tools)
+    curator.analytics = NoAnalytics()
+    monkeypatch.setattr(curator.publisher, 'finish_update', finish_update)
+
+    asyncio.run(curator.run_cycle('discover'))
+
+    assert calls == ([1] if published else [])
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from utils.error_handler import ErrorHandler
+
+
+class Settings:
+    MAX_RETRIES = 2
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'logs').mkdir()
+    return tmp_path / 'logs'
+
+
+def test_legacy_keys_are_split_on_known_component_names(logs):
+    (logs / 'error_counts.json').write_text(json.dumps({'main_run_cycle': 2, 'custom_job_step': 1}))
+
+    handler = ErrorHandler(Settings())
+
+    assert handler.get_error_summary()['errors_by_component'] == {'main': 2, 'custom': 1}
+    assert set(handler._totals) == {('main', 'run_cycle'), ('custom', 'job_step')}
+    handler.close()
+
+
+def test_counts_survive_a_close_and_reload(logs):
+    handler = ErrorHandler(Settings())
+    for _ in range(3):
+        result = handler.handle_error(ValueError('x'), 'main', 'run_cycle')
+
+    assert result == 'abort'
+    handler.close()
+    reopened = ErrorHandler(Settings())
+    assert reopened.error_counts == {'main_run_cycle': 3}
+    reopened.close()
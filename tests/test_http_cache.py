@@ -0,0 +1,109 @@
+import asyncio
+import sqlite3
+
+from conftest import send
+from tools_discovery.http_cache import HTTPCache
+from tools_discovery.http_client import AsyncHTTPClient, HTTPResponse
+
+
+def crawl(cache_dir, url, headers=None, times=1):
+    """GET a URL `times` times through a fresh cache, as one crawl would."""
+    async def run():
+        cache = HTTPCache(cache_dir)
+        try:
+            async with AsyncHTTPClient(cache=cache) as client:
+                return [await client.get(url, headers) for _ in range(times)], cache.stats
+        finally:
+            cache.close()
+    return asyncio.run(run())
+
+
+def etag_route(body, etag='"v1"', headers=None):
+    def route(handler):
+        if handler.headers.get('If-None-Match') == etag:
+            send(handler, status=304, headers={'ETag': etag, **(headers or {})})
+        else:
+            send(handler, body, headers={'ETag': etag, **(headers or {})})
+    return route
+
+
+def test_stale_entry_is_revalidated_with_etag(stub_server, tmp_path):
+    stub_server.routes['/list'] = etag_route(b'tools')
+    url = stub_server.url('/list')
+
+    (first,), stats = crawl(tmp_path, url)
+    assert first.body == b'tools'
+    assert stats['misses'] == 1 and stats['stores'] == 1
+
+    (second,), stats = crawl(tmp_path, url)
+    assert second.status == 200 and second.body == b'tools'
+    assert stats['revalidated'] == 1 and stats['bytes_saved'] == len(b'tools')
+    assert stub_server.requests[-1][1]['If-None-Match'] == '"v1"'
+
+
+def test_fresh_entry_is_served_without_a_request(stub_server, tmp_path):
+    stub_server.routes['/list'] = lambda h: send(h, b'fresh', headers={'Cache-Control': 'max-age=600'})
+    url = stub_server.url('/list')
+
+    crawl(tmp_path, url)
+    (response,), stats = crawl(tmp_path, url)
+
+    assert response.body == b'fresh'
+    assert stats['hits'] == 1
+    assert len(stub_server.requests) == 1
+
+
+def test_no_store_and_unvalidatable_responses_are_not_stored(stub_server, tmp_path):
+    stub_server.routes['/private'] = lambda h: send(h, b'x', headers={'Cache-Control': 'no-store, max-age=600'})
+    stub_server.routes['/plain'] = lambda h: send(h, b'y')
+
+    assert crawl(tmp_path, stub_server.url('/private'))[1]['stores'] == 0
+    assert crawl(tmp_path, stub_server.url('/plain'))[1]['stores'] == 0
+
+
+def test_vary_keys_entries_on_request_headers(stub_server, tmp_path):
+    def route(handler):
+        body = b'[]' if 'json' in handler.headers.get('Accept', '') else b'<html>'
+        send(handler, body, headers={'Cache-Control': 'max-age=600', 'Vary': 'Accept'})
+    stub_server.routes['/list'] = route
+    url = stub_server.url('/list')
+
+    crawl(tmp_path, url, {'Accept': 'application/json'})
+    (html,), stats = crawl(tmp_path, url, {'Accept': 'text/html'})
+    assert html.body == b'<html>' and stats['hits'] == 0
+
+    (html_again,), stats = crawl(tmp_path, url, {'Accept': 'text/html'})
+    assert html_again.body == b'<html>' and stats['hits'] == 1
+
+
+def test_vary_star_is_never_stored(stub_server, tmp_path):
+    stub_server.routes['/list'] = lambda h: send(h, b'x', headers={'Cache-Control': 'max-age=600', 'Vary': '*'})
+
+    assert crawl(tmp_path, stub_server.url('/list'))[1]['stores'] == 0
+
+
+def test_writes_are_deferred_to_flush(tmp_path):
+    cache = HTTPCache(tmp_path)
+    url = 'https://example.com/list'
+    cache.store(url, HTTPResponse(url, 200, {'etag': '"a"'}, b'body'))
+
+    # Visible to this crawl straight away, on disk only after flush
+    assert cache.lookup(url).response.body == b'body'
+    with sqlite3.connect(str(cache.db_file)) as other:
+        assert other.execute('SELECT COUNT(*) FROM responses').fetchone()[0] == 0
+    cache.close()
+    with sqlite3.connect(str(cache.db_file)) as other:
+        assert other.execute('SELECT COUNT(*) FROM responses').fetchone()[0] == 1
+
+
+def test_least_recently_used_entries_are_evicted_on_flush(tmp_path):
+    cache = HTTPCache(tmp_path, max_bytes=250)
+    for i in range(3):
+        url = f'https://example.com/{i}'
+        cache.store(url, HTTPResponse(url, 200, {'etag': f'"{i}"'}, b'x' * 100))
+    cache.close()
+
+    assert cache.stats['evictions'] == 1
+    cache = HTTPCache(tmp_path, max_bytes=250)
+    assert sum(cache.lookup(f'https://example.com/{i}') is not None for i in range(3)) == 2
+    cache.close()
@@ -0,0 +1,66 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from conftest import send
+from tools_discovery.http_client import AsyncHTTPClient
+
+
+def fetch(url, **settings):
+    async def run():
+        async with AsyncHTTPClient(**settings) as client:
+            return await client.get(url), dict(client.stats)
+    return asyncio.run(run())
+
+
+def test_gzip_and_deflate_bodies_are_decoded(stub_server):
+    stub_server.routes['/gzip'] = lambda h: send(h, gzip.compress(b'hello'), headers={'Content-Encoding': 'gzip'})
+    stub_server.routes['/deflate'] = lambda h: send(h, zlib.compress(b'world'), headers={'Content-Encoding': 'deflate'})
+
+    assert fetch(stub_server.url('/gzip'))[0].body == b'hello'
+    assert fetch(stub_server.url('/deflate'))[0].body == b'world'
+
+
+def test_compressed_body_cannot_expand_past_the_limit(stub_server, monkeypatch):
+    monkeypatch.setattr(AsyncHTTPClient, 'MAX_BODY_BYTES', 10_000)
+    bomb = gzip.compress(b'0' * 1_000_000)
+    assert len(bomb) < AsyncHTTPClient.MAX_BODY_BYTES
+    stub_server.routes['/bomb'] = lambda h: send(h, bomb, headers={'Content-Encoding': 'gzip'})
+
+    with pytest.raises(ValueError, match='too large'):
+        fetch(stub_server.url('/bomb'))
+
+
+def test_oversized_plain_body_is_rejected(stub_server, monkeypatch):
+    monkeypatch.setattr(AsyncHTTPClient, 'MAX_BODY_BYTES', 100)
+    stub_server.routes['/big'] = lambda h: send(h, b'x' * 1000)
+
+    with pytest.raises(ValueError, match='too large'):
+        fetch(stub_server.url('/big'))
+
+
+def test_redirects_are_followed(stub_server):
+    stub_server.routes['/old'] = lambda h: send(h, status=301, headers={'Location': '/new'})
+    stub_server.routes['/new'] = lambda h: send(h, b'moved')
+
+    response, _ = fetch(stub_server.url('/old'))
+
+    assert response.status == 200
+    assert response.body == b'moved'
+
+
+def test_connections_are_reused_within_the_per_host_cap(stub_server):
+    stub_server.routes['/item'] = lambda h: send(h, b'ok')
+
+    async def run():
+        async with AsyncHTTPClient(per_host=2) as client:
+            responses = await asyncio.gather(*(client.get(stub_server.url('/item')) for _ in range(20)))
+            return responses, client.stats
+
+    responses, stats = asyncio.run(run())
+
+    assert all(response.body == b'ok' for response in responses)
+    assert stats['connections_opened'] <= 2
+    assert stats['connections_reused'] >= 18
@@ -0,0 +1,102 @@
+import hashlib
+
+import pytest
+
+from github_publisher.tool_store import ToolStore
+from utils.known_tools import BloomFilter, KnownTools, content_hash
+
+
+def digests(count, salt=b''):
+    return [hashlib.blake2b(salt + str(i).encode(), digest_size=16).digest() for i in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ToolStore(tmp_path / 'tools.db')
+    yield store
+    store.close()
+
+
+def test_content_hash_ignores_fields_discovery_does_not_provide():
+    tool = {'name': 'Alpha', 'url': 'https://Alpha.ai/', 'description': 'Writes'}
+
+    assert content_hash(tool) == content_hash({**tool, 'url': 'https://alpha.ai', 'quality_score': 0.9})
+    assert content_hash(tool) != content_hash({**tool, 'description': 'Writes text'})
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(10000, error_rate=0.01)
+    for digest in digests(10000):
+        bloom.add(digest)
+
+    assert all(digest in bloom for digest in digests(10000))
+    false_positives = sum(digest in bloom for digest in digests(10000, salt=b'other'))
+    assert false_positives < 200
+
+
+def test_bloom_filter_round_trips_and_rejects_bad_files(tmp_path):
+    bloom = BloomFilter(100)
+    for digest in digests(50):
+        bloom.add(digest)
+    path = tmp_path / 'known.bloom'
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert (loaded.size, loaded.hashes, loaded.count, loaded.bits) == (bloom.size, bloom.hashes, 50, bloom.bits)
+
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match='Truncated'):
+        BloomFilter.load(path)
+
+
+def test_known_tools_confirms_bloom_hits_against_the_store(store, tmp_path):
+    known = KnownTools(store, tmp_path / 'known.bloom', capacity=100)
+    hashes = [digest.hex() for digest in digests(10)]
+
+    assert known.add_many(hashes) == 10
+    assert known.add_many(hashes[:5]) == 0
+    assert all(content in known for content in hashes)
+    assert digests(1, salt=b'new')[0].hex() not in known
+    assert known.stats['known'] == 10
+
+
+def test_known_tools_grows_and_rebuilds_a_stale_filter(store, tmp_path):
+    bloom_file = tmp_path / 'known.bloom'
+    known = KnownTools(store, bloom_file, capacity=10)
+    known.add_many(digest.hex() for digest in digests(100))
+    assert known.bloom.capacity >= 100
+    known.save()
+
+    # Hashes recorded after the filter was saved (a crash before save())
+    store.add_known(digests(5, salt=b'late'))
+    reloaded = KnownTools(store, bloom_file, capacity=10)
+
+    assert reloaded.bloom.count == 105
+    assert all(digest.hex() in reloaded for digest in digests(5, salt=b'late'))
+
+
+def test_rejections_only_hold_for_the_same_scorer_settings(store):
+    rejected = digests(3)
+    store.add_rejected(rejected, 'v1;min=0.6')
+
+    assert store.is_rejected(rejected[0], 'v1;min=0.6')
+    assert not store.is_rejected(rejected[0], 'v1;min=0.5')
+    assert store.prune_rejected('v1;min=0.5') == 3
+    assert not store.is_rejected(rejected[0], 'v1;min=0.6')
+
+
+def test_migration_drops_leaked_hashes_and_rebuilds_known_content(tmp_path):
+    db_file = tmp_path / 'tools.db'
+    store = ToolStore(db_file)
+    tool = {'name': 'Alpha', 'url': 'https://alpha.ai', 'description': 'Writes'}
+    store.upsert_many([('alpha', {**tool, 'content_hash': 'ab' * 16})])
+    store.add_known(digests(3))
+    with store.connection:
+        store.connection.execute('PRAGMA user_version = 2')
+    store.close()
+
+    store = ToolStore(db_file)
+
+    assert 'content_hash' not in store.get('alpha')
+    assert list(store.iter_known()) == [bytes.fromhex(content_hash(tool))]
+    store.close()
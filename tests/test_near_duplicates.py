@@ -0,0 +1,91 @@
+import pytest
+
+from github_publisher.tool_store import ToolStore
+from utils.near_duplicates import (
+    Fingerprint, NearDuplicateIndex, ToolDeduplicator, canonicalize_url, name_key, name_similarity, url_key
+)
+
+CLAUDE = {
+    'name': 'Claude', 'url': 'https://claude.ai/chat',
+    'description': 'Conversational assistant for writing, analysis, coding and long documents.'
+}
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('HTTPS://Example.COM:443/tool/?utm_source=x&b=2&a=1#top', 'https://example.com/tool?a=1&b=2'),
+    ('example.com//app//', 'https://example.com/app'),
+    ('http://example.com:8080/?ref=hn', 'http://example.com:8080'),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_url_key_ignores_scheme_and_www():
+    assert url_key('http://www.example.com/app/') == url_key('https://example.com/app') == 'example.com/app'
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Claude 3', 'claude'), ('GPT-4o', 'gpt'), ('Stable Diffusion v2.1', 'stable diffusion'), ('4', '4')
+])
+def test_name_key_strips_version_tokens(name, expected):
+    assert name_key(name) == expected
+
+
+def test_identical_tools_have_similarity_one():
+    assert Fingerprint.of(CLAUDE).similarity(Fingerprint.of(dict(CLAUDE))) == 1.0
+
+
+def test_renamed_version_with_same_description_matches():
+    renamed = {**CLAUDE, 'name': 'Claude 3', 'url': 'https://anthropic.com/claude'}
+
+    assert Fingerprint.of(CLAUDE).matches(Fingerprint.of(renamed), 0.5)
+
+
+def test_threshold_decides_borderline_matches():
+    reworded = {**CLAUDE, 'url': '', 'description': 'Conversational assistant for writing, research and email drafting.'}
+    first, second = Fingerprint.of(CLAUDE), Fingerprint.of(reworded)
+    similarity = first.similarity(second)
+
+    assert 0 < similarity < 1
+    assert first.matches(second, similarity)
+    assert not first.matches(second, similarity + 1 / 64)
+
+
+def test_different_names_never_match_on_description_alone():
+    other = {**CLAUDE, 'name': 'Jasper', 'url': 'https://jasper.ai'}
+
+    assert name_similarity(name_key('Claude'), name_key('Jasper')) < 0.5
+    assert not Fingerprint.of(CLAUDE).matches(Fingerprint.of(other), 0.0)
+
+
+def test_shared_bare_domain_needs_alike_names():
+    chat = {'name': 'Acme Chat', 'url': 'https://acme.ai', 'description': 'Chat'}
+    vision = {'name': 'Vision Studio', 'url': 'https://www.acme.ai/', 'description': 'Images'}
+    chat_page = {**chat, 'url': 'https://acme.ai/chat'}
+
+    assert not Fingerprint.of(chat).matches(Fingerprint.of(vision), 0.5)
+    assert Fingerprint.of(chat_page).matches(Fingerprint.of({**vision, 'url': 'https://acme.ai/chat/'}), 0.5)
+
+
+def test_index_finds_near_duplicates_through_lsh_bands():
+    index = NearDuplicateIndex(0.5)
+    index.add('claude', Fingerprint.of(CLAUDE))
+    index.add('jasper', Fingerprint.of({'name': 'Jasper', 'url': 'https://jasper.ai', 'description': 'Marketing copy'}))
+
+    assert index.find(Fingerprint.of({**CLAUDE, 'name': 'Claude 3', 'url': ''})) == 'claude'
+    assert index.find(Fingerprint.of({'name': 'Midjourney', 'url': 'https://midjourney.com'})) is None
+
+
+def test_deduplicator_merges_catalog_matches_and_drops_repeats(tmp_path):
+    store = ToolStore(tmp_path / 'tools.db')
+    store.upsert_many([('claude', CLAUDE)])
+    deduplicator = ToolDeduplicator(store, threshold=0.5)
+
+    merged = deduplicator.resolve({**CLAUDE, 'name': 'Claude 3', 'url': 'https://claude.ai/chat?utm_source=list'})
+    repeat = deduplicator.resolve({**CLAUDE, 'name': 'Claude 3.5'})
+
+    assert merged['name'] == 'Claude' and merged['aliases'] == ['Claude 3']
+    assert merged['url'] == 'https://claude.ai/chat'
+    assert repeat is None
+    assert deduplicator.stats == {'unique': 0, 'merged': 1, 'dropped': 1}
+    store.close()
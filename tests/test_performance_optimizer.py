@@ -0,0 +1,49 @@
+import atexit
+import json
+
+import pytest
+
+from utils.performance_optimizer import PerformanceOptimizer
+
+
+@pytest.fixture
+def optimizer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(PerformanceOptimizer, 'MAX_HISTORY', 5)
+    monkeypatch.setattr(PerformanceOptimizer, 'COMPACT_AT', 10)
+    monkeypatch.setattr(PerformanceOptimizer, 'FLUSH_EVERY', 1)
+    optimizer = PerformanceOptimizer({})
+    yield optimizer
+    close(optimizer)
+
+
+def close(optimizer):
+    atexit.unregister(optimizer.flush_metrics)
+    optimizer.thread_pool.shutdown()
+    optimizer.loop.close()
+
+
+def logged(optimizer):
+    return [json.loads(line)['response_time'] for line in optimizer.metrics_log.read_text().splitlines()]
+
+
+def test_metrics_log_is_compacted_once_it_holds_compact_at_records(optimizer):
+    for response_time in range(9):
+        optimizer._record_metrics(response_time)
+    assert len(logged(optimizer)) == 9
+
+    optimizer._record_metrics(9)
+
+    assert logged(optimizer) == [5, 6, 7, 8, 9]
+
+
+def test_records_already_on_disk_count_towards_compaction(optimizer):
+    for response_time in range(8):
+        optimizer._record_metrics(response_time)
+    reopened = PerformanceOptimizer({})
+
+    reopened._record_metrics(8)
+    reopened._record_metrics(9)
+
+    assert logged(reopened) == [5, 6, 7, 8, 9]
+    close(reopened)
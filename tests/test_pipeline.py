@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from utils.pipeline import run_pipeline
+
+
+async def numbers(count):
+    for i in range(count):
+        yield i
+
+
+async def double(items):
+    async for item in items:
+        yield item * 2
+
+
+async def evens(items):
+    async for item in items:
+        if item % 4 == 0:
+            yield item
+
+
+def test_items_flow_through_stages_in_order_and_are_counted():
+    stats = {}
+
+    results = asyncio.run(run_pipeline(numbers(10), [double, evens], maxsize=2, stats=stats))
+
+    assert results == [0, 4, 8, 12, 16]
+    assert stats == {'source': 10, 'double': 10, 'evens': 5}
+
+
+def test_stages_overlap():
+    async def slow(items):
+        async for item in items:
+            await asyncio.sleep(0.05)
+            yield item
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await run_pipeline(numbers(5), [slow, slow], maxsize=1)
+        return loop.time() - start
+
+    # Sequential stages would take 10 x 0.05s
+    assert asyncio.run(run()) < 0.4
+
+
+def test_stage_error_propagates_and_cancels_the_rest():
+    cancelled = []
+
+    async def endless():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            cancelled.append('source')
+
+    async def failing(items):
+        async for item in items:
+            if item == 3:
+                raise RuntimeError('bad item')
+            yield item
+
+    with pytest.raises(RuntimeError, match='bad item'):
+        asyncio.run(run_pipeline(endless(), [failing], maxsize=1))
+    assert cancelled == ['source']
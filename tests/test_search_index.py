@@ -0,0 +1,80 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from github_publisher.output_writer import OutputWriter
+from github_publisher.search_index import SearchIndexBuilder, search_tokens
+
+MAIN_JS = Path(__file__).resolve().parent.parent / 'templates' / 'static' / 'js' / 'main.js'
+
+TOOLS = [
+    {'id': 'pixel', 'name': 'Pixel Forge', 'category': 'Image Generation',
+     'features': ['Image editing'], 'description': 'AI image generator for the web.'},
+    {'id': 'scribe', 'name': 'Scribe', 'category': 'Writing',
+     'features': ['Drafting'], 'description': 'The writing tool for long documents.'},
+    {'id': 'aider', 'name': 'Aider', 'category': 'Coding', 'features': [], 'description': 'Pair programming.'},
+]
+
+# Loads main.js with just enough DOM and fetch to type a query into the search box
+HARNESS = """
+const fs = require('fs');
+const path = require('path');
+const [script, docsDir, query] = process.argv.slice(1);
+const listeners = {};
+const results = [];
+const element = () => ({appendChild() {}, set textContent(value) { this.text = value; }});
+const input = {value: query, addEventListener: (type, handler) => { listeners.input = handler; }};
+const container = {
+    set innerHTML(value) { results.length = 0; },
+    appendChild(link) { results.push(link.href); },
+};
+global.document = {
+    currentScript: {src: 'https://example.com/static/js/main.js'},
+    addEventListener: (type, handler) => { listeners[type] = handler; },
+    getElementById: id => ({toolSearch: input, searchResults: container})[id],
+    createElement: element,
+};
+global.fetch = async url => {
+    const file = path.join(docsDir, url.replace('https://example.com/', ''));
+    return {ok: fs.existsSync(file), json: async () => JSON.parse(fs.readFileSync(file, 'utf8'))};
+};
+eval(fs.readFileSync(script, 'utf8'));
+listeners.DOMContentLoaded();
+listeners.input().then(() => console.log(JSON.stringify(results)));
+"""
+
+
+@pytest.fixture
+def docs(tmp_path):
+    SearchIndexBuilder(tmp_path, OutputWriter()).build(TOOLS)
+    return tmp_path
+
+
+def search(docs, query):
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+    output = subprocess.run(
+        ['node', '-e', HARNESS, str(MAIN_JS), str(docs), query],
+        capture_output=True, text=True, check=True, timeout=30
+    ).stdout
+    return [href.rsplit('/', 1)[1].removesuffix('.html') for href in json.loads(output)]
+
+
+def test_index_lists_the_stopwords_it_leaves_out(docs):
+    index = json.loads((docs / 'search' / 'index.json').read_text())
+
+    assert 'ai' in index['stopwords'] and 'tool' in index['stopwords']
+    assert search_tokens('the AI writing tool') == ['writing']
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('ai image', ['pixel']),
+    ('the writing tool', ['scribe']),
+    ('image', ['pixel']),
+    ('ai', ['aider']),
+])
+def test_queries_with_stopwords_find_tools(docs, query, expected):
+    assert search(docs, query) == expected
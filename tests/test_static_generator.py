@@ -0,0 +1,125 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from github_publisher import static_generator
+from github_publisher.static_generator import StaticGenerator
+from github_publisher.tool_store import LazyCatalog, ToolStore
+
+TEMPLATES = Path(__file__).resolve().parent.parent / 'templates'
+
+
+class SiteConfig(dict):
+    """Dict config with the site_settings attribute the feed and sitemap read."""
+
+    site_settings = {
+        'site_title': 'AI Tools', 'site_description': 'Tools', 'base_url': 'https://example.com'
+    }
+
+
+def catalog(count, category='Writing'):
+    return {
+        f'tool-{i}': {
+            'name': f'Tool {i}', 'description': f'Tool {i} writes text', 'url': f'https://t{i}.ai',
+            'category': category, 'features': ['drafts'], 'quality_score': i / count,
+            'added_date': f'2024-01-{i % 28 + 1:02d}T00:00:00+00:00'
+        }
+        for i in range(count)
+    }
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'templates').symlink_to(TEMPLATES)
+    return tmp_path / 'docs'
+
+
+def generate(tools, **settings):
+    config = SiteConfig({'cache_dir': '.cache', 'category_page_size': 4, **settings})
+    return StaticGenerator(config).generate_site(tools)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_pages_are_rendered_in_batches(site, workers):
+    stats = generate(catalog(10), render_batch_size=3, render_workers=workers)
+
+    assert stats['errors'] == []
+    assert all((site / 'tools' / f'tool-{i}.html').exists() for i in range(10))
+    assert (site / 'index.html').exists()
+    assert (site / 'categories' / 'writing' / 'page-3.html').exists()
+
+
+def test_unchanged_build_renders_nothing(site):
+    tools = catalog(5)
+    generate(tools)
+
+    stats = generate(tools)
+
+    assert stats['rendered'] == 0
+    assert stats['files_written'] == 0
+
+
+def test_each_category_page_has_a_shard_linked_from_the_previous_page(site):
+    generate(catalog(10))
+    category_dir = site / 'categories' / 'writing'
+
+    second = json.loads((category_dir / 'page-2.json').read_text())
+    third = json.loads((category_dir / 'page-3.json').read_text())
+
+    assert [len(second['tools']), len(third['tools'])] == [4, 2]
+    assert second['next'] == 'page-3.json' and third['next'] is None
+    assert not (site / 'categories' / 'writing.json').exists()
+    assert 'data-shard="writing/page-2.json"' in (site / 'categories' / 'writing.html').read_text()
+    assert 'data-shard="page-3.json"' in (category_dir / 'page-2.html').read_text()
+    assert 'data-shard' not in (category_dir / 'page-3.html').read_text()
+
+
+def test_stale_category_pages_and_shards_are_removed(site):
+    generate(catalog(10))
+    (site / 'categories' / 'writing.json').write_text('[]')
+
+    generate(catalog(5))
+
+    category_dir = site / 'categories' / 'writing'
+    assert (category_dir / 'page-2.json').exists()
+    assert not (category_dir / 'page-3.html').exists()
+    assert not (category_dir / 'page-3.json').exists()
+    assert not (site / 'categories' / 'writing.json').exists()
+
+
+def test_first_precompressed_build_rescans_then_only_changes_are_compressed(site):
+    generate(catalog(5))
+    assert not (site / 'index.html.gz').exists()
+
+    first = generate(catalog(5), precompress=True, compress_workers=1)
+    assert (site / 'index.html.gz').exists()
+    assert (site / 'tools' / 'tool-1.html.gz').exists()
+
+    second = generate(catalog(5), precompress=True, compress_workers=1)
+    assert first['compression']['files'] > 0
+    assert second['compression']['files'] == 0
+
+
+def test_store_catalog_takes_latest_tools_from_the_added_index(site, monkeypatch):
+    store = ToolStore(site.parent / 'tools.db')
+    tools = catalog(6)
+    now = datetime.now(timezone.utc)
+    for i, slug in enumerate(['tool-2', 'tool-4']):
+        tools[slug]['added_date'] = (now - timedelta(days=i)).isoformat()
+    store.upsert_many(tools.items())
+    monkeypatch.setattr(static_generator, 'DateIndex', None)
+    pages = {}
+    render_page = StaticGenerator._render_page
+    monkeypatch.setattr(StaticGenerator, '_render_page', lambda self, name, output, **context: (
+        pages.setdefault(name, context), render_page(self, name, output, **context)
+    )[1])
+
+    generate(LazyCatalog(store))
+
+    index = pages['index.html']
+    assert [tool['name'] for tool in index['latest_tools'][:3]] == ['Tool 2', 'Tool 4', 'Tool 5']
+    assert index['stats']['this_week'] == 2
+    store.close()
@@ -0,0 +1,66 @@
+import json
+import marshal
+import struct
+
+import pytest
+
+from github_publisher.publisher import GitHubPublisher
+from utils import tool_record
+from utils.tool_record import Tool, read_snapshot, write_snapshot
+
+TOOLS = {
+    'alpha': {
+        'name': 'Alpha', 'description': 'Writes text', 'url': 'https://alpha.ai',
+        'category': 'Writing', 'pricing': 'Free', 'features': ['a', 'b'],
+        'quality_score': 7.5, 'added_date': '2024-01-02T03:04:05+00:00',
+        'last_updated': '2024-01-02T03:04:05.000Z', 'metrics': {'stars': 3}, 'source': 'https://list'
+    },
+    'beta': {'name': 'Beta', 'url': 'https://beta.ai', 'added_date': 'not a date', 'features': None},
+}
+
+
+def test_snapshot_round_trips_tools_exactly(tmp_path):
+    path = tmp_path / 'tools.snapshot'
+
+    assert write_snapshot(path, ((slug, Tool.from_dict(tool)) for slug, tool in TOOLS.items())) == 2
+    loaded = read_snapshot(path)
+
+    assert {slug: tool.to_dict() for slug, tool in loaded.items()} == TOOLS
+    assert list(loaded['alpha'].to_dict()) == list(TOOLS['alpha'])
+    assert loaded['alpha'].features == ('a', 'b')
+
+
+def test_snapshot_is_chunked_with_a_version_header(tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_record, 'SNAPSHOT_CHUNK', 1)
+    path = tmp_path / 'tools.snapshot'
+    write_snapshot(path, ((slug, Tool.from_dict(tool)) for slug, tool in TOOLS.items()))
+
+    header = path.read_bytes().split(b'\n', 1)[0]
+    assert header == f'AITOOLS 3 {marshal.version}'.encode()
+    assert list(read_snapshot(path)) == ['alpha', 'beta']
+
+
+@pytest.mark.parametrize('content, message', [
+    (b'AITOOLS\x00\x01\x00binary', 'not a tool snapshot'),
+    (b'AITOOLS 2\n["alpha", 1, 2]\n', 'Unsupported snapshot version'),
+    (f'AITOOLS 3 {marshal.version}\n'.encode() + struct.pack('<I', 100) + b'short', 'Corrupt snapshot'),
+    (f'AITOOLS 3 {marshal.version}\n'.encode(), 'Corrupt snapshot'),
+])
+def test_unreadable_snapshots_raise_value_error(tmp_path, content, message):
+    path = tmp_path / 'tools.snapshot'
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError, match=message):
+        read_snapshot(path)
+
+
+def test_store_is_seeded_from_json_when_snapshot_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = tmp_path / 'data'
+    data.mkdir()
+    (data / 'tools.json').write_text(json.dumps(TOOLS))
+    (data / 'tools.snapshot').write_bytes(b'AITOOLS 1\nold format\n')
+
+    publisher = GitHubPublisher({})
+
+    assert sorted(publisher.store.iter_slugs()) == ['alpha', 'beta']
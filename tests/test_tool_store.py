@@ -0,0 +1,66 @@
+import json
+import os
+
+from github_publisher.publisher import GitHubPublisher
+from github_publisher.tool_store import ToolStore
+from utils.near_duplicates import Fingerprint
+
+
+def tool(name, url, **fields):
+    return {'name': name, 'url': url, 'description': f'{name} does things', 'category': 'Writing', **fields}
+
+
+def test_old_store_is_migrated_on_open(tmp_path):
+    db_file = tmp_path / 'tools.db'
+    store = ToolStore(db_file)
+    naive = tool('Alpha', 'https://alpha.ai', added_date='2024-01-02T03:04:05')
+    # Rows as a version 0 store wrote them: naive dates, no fingerprints
+    with store.connection:
+        store.connection.execute(
+            'INSERT INTO tools (slug, name, category, added_date, data) VALUES (?, ?, ?, ?, ?)',
+            ('alpha', 'Alpha', 'Writing', naive['added_date'], json.dumps(naive))
+        )
+        store.connection.execute('PRAGMA user_version = 0')
+    store.close()
+
+    store = ToolStore(db_file)
+
+    assert store.connection.execute('PRAGMA user_version').fetchone()[0] == ToolStore.VERSION
+    assert store.get('alpha')['added_date'] == '2024-01-02T03:04:05+00:00'
+    assert store.find_duplicate(Fingerprint.of(tool('Alpha', 'https://alpha.ai/')), 0.5) == 'alpha'
+    store.close()
+
+
+def test_upsert_keeps_category_counts_and_fingerprints_current(tmp_path):
+    store = ToolStore(tmp_path / 'tools.db')
+    store.upsert_many([('alpha', tool('Alpha', 'https://alpha.ai')), ('beta', tool('Beta', 'https://beta.ai'))])
+    store.upsert_many([('beta', tool('Beta', 'https://beta.io', category='Video'))])
+
+    assert store.category_counts() == {'Writing': 1, 'Video': 1}
+    url_key, = store.connection.execute("SELECT url_key FROM tool_fingerprints WHERE slug = 'beta'").fetchone()
+    assert url_key == Fingerprint.of(tool('Beta', 'https://beta.io')).url_key
+    store.close()
+
+
+def test_newer_tools_json_is_merged_into_the_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data').mkdir()
+    tools_file = tmp_path / 'data' / 'tools.json'
+    tools_file.write_text(json.dumps({'alpha': tool('Alpha', 'https://alpha.ai')}))
+
+    publisher = GitHubPublisher({})
+    assert sorted(publisher.store.iter_slugs()) == ['alpha']
+    publisher.store.close()
+
+    # Unchanged file: nothing to merge
+    publisher = GitHubPublisher({})
+    publisher.store.upsert_many([('gamma', tool('Gamma', 'https://gamma.ai'))])
+    publisher.store.close()
+
+    tools_file.write_text(json.dumps({'alpha': tool('Alpha', 'https://alpha.ai'), 'beta': tool('Beta', 'https://beta.ai')}))
+    stat = tools_file.stat()
+    os.utime(tools_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    publisher = GitHubPublisher({})
+    assert sorted(publisher.store.iter_slugs()) == ['alpha', 'beta', 'gamma']
+    publisher.store.close()